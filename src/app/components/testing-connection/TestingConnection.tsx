@@ -12,6 +12,10 @@ import { DEVICE_STATE_CONFIGS } from './types';
 const API_BASE = import.meta.env.VITE_TEST_API_URL || 'http://localhost:8000';
 const ROBOT_STATE_POLL_INTERVAL_MS = 20;   // 0.02s real-time
 const GELLO_JOINT_POLL_INTERVAL_MS = 20;   // 0.02s real-time
+const TELEOP_STREAM_MAX_HZ = 30;           // SSE messages/s; each batches all loop samples
+const TELEOP_STREAM_RETRY_BASE_MS = 500;   // SSE reconnect backoff: 0.5s, 1s, 2s, ...
+const TELEOP_STREAM_RETRY_MAX_MS = 8000;
+const TELEOP_STREAM_MAX_FAILURES = 5;      // consecutive failures before staying on polling
 
 interface ConnectionStateParams {
   joint_positions: number[];
@@ -143,11 +147,68 @@ export default function TestingConnection() {
     }
   }, []);
 
+  // Teleop state is pushed over SSE. While the stream is down it is polled and the stream is
+  // retried with backoff; after repeated consecutive failures polling takes over for good.
   useEffect(() => {
     if (!teleopRunning) return;
-    const t = setInterval(fetchTeleopState, ROBOT_STATE_POLL_INTERVAL_MS);
-    fetchTeleopState(); // initial fetch
-    return () => clearInterval(t);
+    let pollTimer: ReturnType<typeof setInterval> | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    let es: EventSource | null = null;
+    let failures = 0;
+    const startPolling = () => {
+      if (pollTimer) return;
+      pollTimer = setInterval(fetchTeleopState, ROBOT_STATE_POLL_INTERVAL_MS);
+      fetchTeleopState();
+    };
+    const stopPolling = () => {
+      if (pollTimer) clearInterval(pollTimer);
+      pollTimer = null;
+    };
+    const cleanup = () => {
+      es?.close();
+      if (retryTimer) clearTimeout(retryTimer);
+      stopPolling();
+    };
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return cleanup;
+    }
+    const connect = () => {
+      retryTimer = null;
+      es = new EventSource(`${API_BASE}/api/test/teleop/stream?max_hz=${TELEOP_STREAM_MAX_HZ}`);
+      es.onopen = stopPolling;
+      es.addEventListener('state', onState);
+      es.onerror = () => {
+        es?.close();
+        es = null;
+        startPolling();
+        failures += 1;
+        if (failures >= TELEOP_STREAM_MAX_FAILURES) return;
+        const delay = Math.min(TELEOP_STREAM_RETRY_BASE_MS * 2 ** (failures - 1), TELEOP_STREAM_RETRY_MAX_MS);
+        retryTimer = setTimeout(connect, delay);
+      };
+    };
+    const onState = (ev: Event) => {
+      // A delivered message, not just an open, counts as a working stream
+      failures = 0;
+      try {
+        const data = JSON.parse((ev as MessageEvent).data);
+        const samples = Array.isArray(data.samples) ? data.samples : [];
+        const last = samples[samples.length - 1];
+        if (last) {
+          if (Array.isArray(last.leader_joints)) setTeleopLeaderJoints(last.leader_joints);
+          if (last.follower_obs && typeof last.follower_obs === 'object') {
+            setTeleopFollowerObs(last.follower_obs);
+          }
+          setTeleopError(last.error || '');
+        }
+        if (data.running === false && samples.length === 0) setTeleopRunning(false);
+      } catch {
+        // ignore malformed message
+      }
+    };
+    connect();
+    return cleanup;
   }, [teleopRunning, fetchTeleopState]);
 
   const refreshRobotState = async () => {
@@ -0,0 +1 @@
+# Benchmarks for testing-connection. Run from backend/: python -m bench.<module>
@@ -0,0 +1,177 @@
+"""
+Simulated devices for the teleop benchmarks. Everything is in memory and answers instantly,
+so the benchmarks measure the software cost of each strategy's loop, not hardware.
+
+- dynamixel_sdk: FakePortHandler / FakePacketHandler / FakeGroupSyncRead / FakeGroupSyncWrite
+  over one FakeServoBus per port (used by the shared-bus strategy, which drives the SDK directly).
+- DynamixelDriver -> FakeDynamixelDriver for GelloAgent / DynamixelRobot (dual-port, ZMQ, CAN).
+- piper_sdk -> lib.piper_sim (PIPER_SDK=sim) on the benchmark's CAN channels.
+- DeviceRegistry that lists the benchmark's fake ports.
+
+With emulated Dynamixel buses (lib.dynamixel_emulator) only the Piper SDK and the registry are swapped.
+"""
+import math
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Sequence
+from unittest import mock
+
+from lib.dynamixel_driver import FakeDynamixelDriver
+
+COMM_SUCCESS = 0
+ADDR_PRESENT_POSITION = 132
+ADDR_GOAL_POSITION = 116
+ADDR_TORQUE_ENABLE = 64
+
+
+class FakeServoBus:
+    """Register state of the servos on one port. Untorqued servos follow a slow sine (a moving leader)."""
+
+    def __init__(self):
+        self.goal: Dict[int, int] = {}
+        self.torque: Dict[int, int] = {}
+        self._t0 = time.monotonic()
+
+    def position(self, dxl_id: int) -> int:
+        if self.torque.get(dxl_id) and dxl_id in self.goal:
+            return self.goal[dxl_id]
+        t = time.monotonic() - self._t0
+        return 2048 + int(400 * math.sin(2 * math.pi * 0.5 * t + dxl_id))
+
+
+_buses: Dict[str, FakeServoBus] = {}
+
+
+def _bus(port: str) -> FakeServoBus:
+    if port not in _buses:
+        _buses[port] = FakeServoBus()
+    return _buses[port]
+
+
+class FakePortHandler:
+    def __init__(self, port_name: str):
+        self.port_name = port_name
+        self.bus = _bus(port_name)
+        self.baudrate = 57600
+        self.is_open = False
+
+    def openPort(self) -> bool:
+        self.is_open = True
+        return True
+
+    def closePort(self) -> None:
+        self.is_open = False
+
+    def setBaudRate(self, baudrate: int) -> bool:
+        self.baudrate = baudrate
+        return True
+
+    def getBaudRate(self) -> int:
+        return self.baudrate
+
+
+class FakePacketHandler:
+    def __init__(self, protocol_version: float = 2.0):
+        self.protocol_version = protocol_version
+
+    def write1ByteTxRx(self, port, dxl_id: int, address: int, data: int):
+        if address == ADDR_TORQUE_ENABLE:
+            port.bus.torque[dxl_id] = data
+        return COMM_SUCCESS, 0
+
+
+class FakeGroupSyncRead:
+    def __init__(self, port, ph, start_address: int, data_length: int):
+        self.port = port
+        self.start_address = start_address
+        self.data_length = data_length
+        self.data_dict: Dict[int, List[int]] = {}
+        self.last_result = False
+
+    def addParam(self, dxl_id: int) -> bool:
+        self.data_dict[dxl_id] = []
+        return True
+
+    def txRxPacket(self) -> int:
+        bus = self.port.bus
+        offset = ADDR_PRESENT_POSITION - self.start_address
+        for dxl_id in self.data_dict:
+            data = bytearray(self.data_length)
+            if 0 <= offset <= self.data_length - 4:
+                data[offset:offset + 4] = (bus.position(dxl_id) & 0xFFFFFFFF).to_bytes(4, "little")
+            self.data_dict[dxl_id] = list(data)
+        self.last_result = True
+        return COMM_SUCCESS
+
+
+class FakeGroupSyncWrite:
+    def __init__(self, port, ph, start_address: int, data_length: int):
+        self.port = port
+        self.start_address = start_address
+        self.data_length = data_length
+        self.data_dict: Dict[int, Sequence[int]] = {}
+
+    def addParam(self, dxl_id: int, data) -> bool:
+        if dxl_id in self.data_dict:
+            return False
+        self.data_dict[dxl_id] = data
+        return True
+
+    def changeParam(self, dxl_id: int, data) -> bool:
+        self.data_dict[dxl_id] = data
+        return True
+
+    def txPacket(self) -> int:
+        if self.start_address == ADDR_GOAL_POSITION:
+            goal = self.port.bus.goal
+            for dxl_id, data in self.data_dict.items():
+                goal[dxl_id] = int.from_bytes(bytes(data[:4]), "little", signed=True)
+        return COMM_SUCCESS
+
+
+class FakeRegistry:
+    """DeviceRegistry stand-in that knows only the given ports."""
+
+    def __init__(self, ports: Sequence[str]):
+        self._ports = list(ports)
+
+    def has(self, port: str) -> bool:
+        return port in self._ports
+
+    def devices(self) -> List[str]:
+        return list(self._ports)
+
+
+def _fake_driver(ids, port=None, baudrate=None, read_hz=None, **kwargs) -> FakeDynamixelDriver:
+    return FakeDynamixelDriver(ids)
+
+
+@contextmanager
+def simulated_devices(
+    ports: Sequence[str], can_channels: Sequence[str] = (), dynamixel: bool = True
+) -> Iterator[None]:
+    """
+    Patch the SDKs, the Dynamixel driver and the device registry for the duration of the block.
+    dynamixel=False keeps the real dynamixel_sdk and DynamixelDriver (ports are emulated buses).
+    """
+    import dynamixel_sdk
+    from core.strategies import teleop_strategies
+    from lib.piper_sim import reset_sim_arms
+
+    registry = FakeRegistry(ports)
+    env = {"PIPER_SDK": "sim", "PIPER_SIM_CHANNELS": ",".join(can_channels)}
+    reset_sim_arms()
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, env))
+        if dynamixel:
+            for name, fake in (
+                ("PortHandler", FakePortHandler),
+                ("PacketHandler", FakePacketHandler),
+                ("GroupSyncRead", FakeGroupSyncRead),
+                ("GroupSyncWrite", FakeGroupSyncWrite),
+            ):
+                stack.enter_context(mock.patch.object(dynamixel_sdk, name, fake))
+            stack.enter_context(mock.patch("lib.dynamixel_robot.DynamixelDriver", _fake_driver))
+        stack.enter_context(mock.patch.object(teleop_strategies, "get_device_registry", lambda: registry))
+        yield
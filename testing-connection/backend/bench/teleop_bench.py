@@ -0,0 +1,239 @@
+"""
+Achieved control rate of each teleop mode against simulated devices (bench/fakes.py, plus a
+lib.sim_robot_server subprocess for ZMQ). Runs each strategy's real loop for a fixed duration
+after a warmup and reports, per strategy:
+
+- loop: achieved Hz, period jitter and overruns (RateScheduler stats)
+- tick / phases: work-time percentiles per tick and per phase (ms)
+- cpu_percent: process CPU time over wall time (includes the other threads, e.g. driver I/O)
+- alloc: net allocated blocks per tick and GC collections (CPython has no allocation counter;
+  a leak or a growing buffer shows up as a positive net count)
+
+--dynamixel emulated replaces the in-memory Dynamixel fakes with lib.dynamixel_emulator
+subprocesses on ptys: the real SDK, serial layer and DynamixelDriver run against byte-timed buses
+at 57600 bps (leader IDs 1-14 on the GELLO port, follower IDs 1-7 on the follower port).
+
+    python -m bench.teleop_bench [--duration 5] [--hz 200] [--strategies zmq_sync,can] [--out result.json]
+"""
+import argparse
+import gc
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from bench.fakes import simulated_devices
+from lib.piper_sim import get_sim_arm
+from core.events import EventType, get_event_bus
+from core.strategies.teleop_strategies import (
+    BaseTeleopStrategy,
+    CANTeleopStrategy,
+    USBDualPortTeleopStrategy,
+    USBSharedBusTeleopStrategy,
+    ZMQTeleopStrategy,
+)
+
+GELLO_PORT = "/dev/bench-gello"
+FOLLOWER_PORT = "/dev/bench-follower"
+CAN_CHANNEL = "bench_can"
+
+STRATEGIES = ("zmq_sync", "zmq_async", "usb_shared", "usb_dual", "can")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_sim_server(port: int, dofs: int) -> subprocess.Popen:
+    """The server runs in its own process so it does not share the GIL with the loop under test."""
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "lib.sim_robot_server", "--port", str(port), "--dofs", str(dofs)],
+        cwd=backend,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return proc
+        time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"sim robot server did not start on port {port}")
+
+
+def _start_emulator(link: str, ids: str, wave: float) -> subprocess.Popen:
+    """Emulated Dynamixel bus exposed at link; separate process for the same GIL reason."""
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "lib.dynamixel_emulator", "--ids", ids, "--wave", str(wave), "--link", link],
+        cwd=backend,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        if os.path.exists(link):
+            return proc
+        time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"Dynamixel emulator did not start at {link}")
+
+
+def _make(name: str, event_bus) -> BaseTeleopStrategy:
+    if name == "zmq_sync":
+        return ZMQTeleopStrategy(event_bus, zmq_client="sync")
+    if name == "zmq_async":
+        return ZMQTeleopStrategy(event_bus, zmq_client="async")
+    if name == "usb_shared":
+        return USBSharedBusTeleopStrategy(event_bus)
+    if name == "usb_dual":
+        return USBDualPortTeleopStrategy(event_bus)
+    return CANTeleopStrategy(event_bus)
+
+
+def _run_args(name: str, zmq_port: int, ports: Dict[str, str]) -> Dict[str, Any]:
+    args = {"gello_port": ports["gello"], "robot_host": "127.0.0.1", "robot_port": zmq_port, "robot_usb_port": None}
+    if name == "usb_shared":
+        args["robot_usb_port"] = ports["gello"]
+    elif name == "usb_dual":
+        args["robot_usb_port"] = ports["follower"]
+    elif name == "can":
+        args["robot_can_channel"] = CAN_CHANNEL
+    return args
+
+
+def bench_strategy(
+    name: str,
+    hz: float,
+    duration_s: float,
+    warmup_s: float,
+    zmq_port: int,
+    errors: List[str],
+    ports: Dict[str, str],
+) -> Dict[str, Any]:
+    """errors: filled with the TELEOP_ERROR messages published while this strategy runs."""
+    strategy = _make(name, get_event_bus())
+    thread = threading.Thread(target=strategy.run, kwargs={**_run_args(name, zmq_port, ports), "hz": hz}, daemon=True)
+    thread.start()
+    time.sleep(warmup_s)
+    if not thread.is_alive():
+        return {"error": strategy.get_snapshot().error or "strategy exited during warmup"}
+    strategy.reset_metrics()
+    if name == "can":
+        get_sim_arm(CAN_CHANNEL).reset_stats()
+    errors.clear()
+
+    gc_before = [s["collections"] for s in gc.get_stats()]
+    blocks_before = sys.getallocatedblocks()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+    time.sleep(duration_s)
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    blocks = sys.getallocatedblocks() - blocks_before
+    gc_after = [s["collections"] for s in gc.get_stats()]
+    metrics = strategy.get_metrics()
+    can = get_sim_arm(CAN_CHANNEL).get_can_stats() if name == "can" else None
+
+    strategy.stop()
+    thread.join(timeout=5.0)
+    ticks = metrics["loop"].get("ticks", 0)
+    result = {
+        "loop": metrics["loop"],
+        "tick": metrics["tick"],
+        "phases": {k: v for k, v in metrics["phases"].items() if v.get("count")},
+        "cpu_percent": 100.0 * cpu / wall,
+        "alloc": {
+            "net_blocks": blocks,
+            "net_blocks_per_tick": blocks / ticks if ticks else None,
+            "gc_collections": [a - b for a, b in zip(gc_after, gc_before)],
+        },
+        "errors": len(errors),
+    }
+    if errors:
+        result["last_error"] = errors[-1]
+    for key in ("zmq", "bus"):
+        if key in metrics:
+            result[key] = metrics[key]
+    if can is not None:
+        result["can"] = can
+    return result
+
+
+def run(
+    strategies: List[str],
+    hz: float,
+    duration_s: float,
+    warmup_s: float,
+    dofs: int = 7,
+    dynamixel: str = "fake",
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    errors: List[str] = []
+    get_event_bus().subscribe(EventType.TELEOP_ERROR, lambda e: errors.append(e.payload.get("error")))
+    processes: List[subprocess.Popen] = []
+    ports = {"gello": GELLO_PORT, "follower": FOLLOWER_PORT}
+    zmq_port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="teleop-bench-") as tmp:
+        try:
+            if any(name.startswith("zmq") for name in strategies):
+                processes.append(_start_sim_server(zmq_port, dofs))
+            if dynamixel == "emulated":
+                ports = {"gello": os.path.join(tmp, "ttyGELLO"), "follower": os.path.join(tmp, "ttyFOLLOWER")}
+                processes.append(_start_emulator(ports["gello"], "1-14", wave=400))
+                processes.append(_start_emulator(ports["follower"], "1-7", wave=0))
+            with simulated_devices(list(ports.values()), [CAN_CHANNEL], dynamixel=dynamixel == "fake"):
+                for name in strategies:
+                    results[name] = bench_strategy(name, hz, duration_s, warmup_s, zmq_port, errors, ports)
+        finally:
+            for proc in processes:
+                proc.terminate()
+                proc.wait(timeout=5.0)
+    return {
+        "config": {
+            "hz": hz,
+            "duration_s": duration_s,
+            "warmup_s": warmup_s,
+            "dynamixel": dynamixel,
+            "python": sys.version.split()[0],
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teleop loop benchmark against simulated devices")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help=f"comma-separated subset of {STRATEGIES}")
+    parser.add_argument("--hz", type=float, default=200.0)
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per strategy")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each run")
+    parser.add_argument(
+        "--dynamixel",
+        choices=("fake", "emulated"),
+        default="fake",
+        help="in-memory Dynamixel fakes, or byte-timed pty bus emulators running the real SDK",
+    )
+    parser.add_argument("--out", default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+    names = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    unknown = [s for s in names if s not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies {unknown}; choose from {STRATEGIES}")
+    report = run(names, args.hz, args.duration, args.warmup, dynamixel=args.dynamixel)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Per-call cost of the ZMQ robot protocol: pickle vs the binary wire format.
+
+Runs an in-process REP server (inproc transport, so the numbers are serialization and
+ZMQ overhead, not network) and times ZMQClientRobot round trips for each format.
+
+    python -m bench.zmq_wire_bench [--calls 20000] [--dofs 7] [--json]
+"""
+import argparse
+import json
+import threading
+import time
+from typing import Any, Dict
+
+import numpy as np
+import zmq
+
+from lib.zmq_client_robot import ZMQClientRobot
+from lib.zmq_wire import FORMAT_PICKLE, FORMAT_WIRE, decode, encode_reply, serve_message
+
+
+class _FakeRobot:
+    def __init__(self, dofs: int):
+        self._q = np.zeros(dofs)
+
+    def dispatch(self, method: str, args: Dict[str, Any]) -> Any:
+        if method == "num_dofs":
+            return len(self._q)
+        if method == "get_joint_state":
+            return self._q
+        if method == "command_joint_state":
+            self._q = np.asarray(args["joint_state"], dtype=np.float64)
+            return None
+        if method == "get_observations":
+            return {
+                "joint_positions": self._q,
+                "joint_velocities": np.zeros_like(self._q),
+                "ee_pos_quat": np.zeros(7),
+                "gripper_position": np.array([0.0]),
+            }
+        raise NotImplementedError(method)
+
+
+def _serve(ctx: zmq.Context, endpoint: str, robot: _FakeRobot, stop: threading.Event, ready: threading.Event) -> None:
+    sock = ctx.socket(zmq.REP)
+    sock.bind(endpoint)
+    ready.set()
+    try:
+        while not stop.is_set():
+            if sock.poll(50):
+                msg = sock.recv(copy=False)
+                sock.send(serve_message(msg.buffer, robot.dispatch))
+    finally:
+        sock.close(0)
+
+
+def _time_calls(fn, calls: int) -> float:
+    for _ in range(min(1000, calls)):
+        fn()
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def _codec_only(robot: _FakeRobot, calls: int) -> Dict[str, float]:
+    """Encode+decode of a get_observations reply without ZMQ, in µs."""
+    import pickle
+
+    obs = robot.dispatch("get_observations", {})
+    as_lists = {k: v.tolist() for k, v in obs.items()}
+
+    def pickle_roundtrip():
+        out = pickle.loads(pickle.dumps(as_lists))
+        return {k: np.array(v) for k, v in out.items()}
+
+    def wire_roundtrip():
+        return decode(encode_reply("get_observations", obs))
+
+    return {FORMAT_PICKLE: _time_calls(pickle_roundtrip, calls), FORMAT_WIRE: _time_calls(wire_roundtrip, calls)}
+
+
+def run(calls: int = 20000, dofs: int = 7) -> Dict[str, Any]:
+    ctx = zmq.Context()
+    endpoint = "inproc://zmq-wire-bench"
+    robot = _FakeRobot(dofs)
+    stop, ready = threading.Event(), threading.Event()
+    server = threading.Thread(target=_serve, args=(ctx, endpoint, robot, stop, ready), daemon=True)
+    server.start()
+    ready.wait()
+    q = np.linspace(-1.0, 1.0, dofs)
+    results: Dict[str, Any] = {"calls": calls, "dofs": dofs, "round_trip_us": {}}
+    try:
+        for fmt in (FORMAT_PICKLE, FORMAT_WIRE):
+            # inproc needs the server's context
+            client = ZMQClientRobot(wire=fmt, endpoint=endpoint, context=ctx)
+            try:
+                results["round_trip_us"][fmt] = {
+                    "get_observations": _time_calls(client.get_observations, calls),
+                    "command_joint_state": _time_calls(lambda: client.command_joint_state(q), calls),
+                }
+            finally:
+                client.close()
+    finally:
+        stop.set()
+        server.join()
+        ctx.term()
+    results["codec_only_us"] = _codec_only(robot, calls)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--dofs", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    results = run(args.calls, args.dofs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.calls} calls, {args.dofs} DOF (µs per call)")
+    for fmt, per_method in results["round_trip_us"].items():
+        for method, us in per_method.items():
+            print(f"  {fmt:<7} {method:<20} {us:8.1f}")
+    for fmt, us in results["codec_only_us"].items():
+        print(f"  {fmt:<7} {'codec only (obs)':<20} {us:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
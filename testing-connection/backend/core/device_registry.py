@@ -0,0 +1,219 @@
+"""
+Device Registry: in-process cache of serial ports, refreshed on hotplug.
+Enumerates once, then a watcher thread checks a cheap fingerprint of /dev and
+/sys/class/tty (two stat calls) and re-enumerates only when it changes. Where those
+do not exist (Windows), the watcher re-enumerates on a slower interval instead.
+Also caches the GELLO-vs-robot classification per port until the port goes away.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .events import Event, EventBus, EventType, get_event_bus
+
+WATCH_DIRS = ("/dev", "/sys/class/tty")
+
+PortsListener = Callable[[List[str], List[str]], None]
+
+
+def _enumerate_comports() -> List[Dict[str, Any]]:
+    from serial.tools import list_ports
+    items = []
+    for p in list_ports.comports():
+        items.append({
+            "port": p.device,
+            "description": getattr(p, "description", "") or "",
+            "hwid": getattr(p, "hwid", "") or "",
+            "manufacturer": getattr(p, "manufacturer", "") or "",
+            "product": getattr(p, "product", "") or "",
+            "serial_number": getattr(p, "serial_number", "") or "",
+            "vid": getattr(p, "vid", None),
+            "pid": getattr(p, "pid", None),
+        })
+    return items
+
+
+def _dir_fingerprint(dirs: Tuple[str, ...] = WATCH_DIRS) -> Optional[Tuple[int, ...]]:
+    """mtime_ns of the watched directories; None if none of them exist."""
+    out = []
+    for d in dirs:
+        try:
+            out.append(os.stat(d).st_mtime_ns)
+        except OSError:
+            out.append(-1)
+    return None if all(v == -1 for v in out) else tuple(out)
+
+
+class DeviceRegistry:
+    """
+    Cached view of serial ports. Readers get the last enumeration from memory.
+    Listeners and DEVICE_ADDED / DEVICE_REMOVED events fire on every change.
+    """
+
+    def __init__(
+        self,
+        event_bus: Optional[EventBus] = None,
+        poll_interval_s: float = 0.5,
+        fallback_interval_s: float = 2.0,
+        enumerate_fn: Callable[[], List[Dict[str, Any]]] = _enumerate_comports,
+        fingerprint_fn: Callable[[], Optional[Tuple[int, ...]]] = _dir_fingerprint,
+    ):
+        self._event_bus = event_bus or get_event_bus()
+        self._poll_interval_s = poll_interval_s
+        self._fallback_interval_s = fallback_interval_s
+        self._enumerate = enumerate_fn
+        self._fingerprint_fn = fingerprint_fn
+        self._lock = threading.Lock()
+        self._ports: Dict[str, Dict[str, Any]] = {}
+        self._classification: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[PortsListener] = []
+        self._fingerprint: Optional[Tuple[int, ...]] = None
+        self._enumerated = False
+        self._last_enumerated = 0.0
+        self._enumerations = 0
+        self._error: Optional[str] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # --- reads (from memory) ---
+
+    def ports(self) -> List[Dict[str, Any]]:
+        """Port metadata: port, description, hwid, manufacturer, product, serial_number, vid, pid."""
+        self._ensure_started()
+        with self._lock:
+            return [dict(p) for p in self._ports.values()]
+
+    def devices(self) -> List[str]:
+        self._ensure_started()
+        with self._lock:
+            return list(self._ports)
+
+    def has(self, port: str) -> bool:
+        """True if port exists. A miss re-enumerates once, in case it was plugged in since the last poll."""
+        self._ensure_started()
+        with self._lock:
+            if port in self._ports:
+                return True
+        self.refresh()
+        with self._lock:
+            return port in self._ports
+
+    def get_classification(self, port: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            info = self._classification.get(port)
+            return dict(info) if info is not None else None
+
+    def set_classification(self, port: str, info: Dict[str, Any]) -> None:
+        with self._lock:
+            if port in self._ports:
+                self._classification[port] = dict(info)
+
+    def clear_classification(self, port: Optional[str] = None) -> None:
+        with self._lock:
+            if port is None:
+                self._classification.clear()
+            else:
+                self._classification.pop(port, None)
+
+    @property
+    def error(self) -> Optional[str]:
+        """Error of the last enumeration, if it failed."""
+        return self._error
+
+    def add_listener(self, listener: PortsListener) -> None:
+        """listener(added, removed) runs on the thread that detected the change."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    # --- enumeration ---
+
+    def refresh(self) -> bool:
+        """Re-enumerate now. Returns True if the port set changed."""
+        try:
+            items = self._enumerate()
+            error = None
+        except Exception as e:
+            items, error = None, str(e)
+        with self._lock:
+            self._enumerations += 1
+            self._last_enumerated = time.time()
+            self._error = error
+            if items is None:
+                return False
+            new = {p["port"]: p for p in items}
+            added = [p for p in new if p not in self._ports]
+            removed = [p for p in self._ports if p not in new]
+            first = not self._enumerated
+            self._ports = new
+            self._enumerated = True
+            for port in removed + added:
+                # A re-plugged device may be a different one
+                self._classification.pop(port, None)
+            listeners = list(self._listeners)
+        if first or not (added or removed):
+            return False
+        for listener in listeners:
+            try:
+                listener(added, removed)
+            except Exception:
+                pass
+        for port in added:
+            self._event_bus.publish(Event(EventType.DEVICE_ADDED, {"port": port}))
+        for port in removed:
+            self._event_bus.publish(Event(EventType.DEVICE_REMOVED, {"port": port}))
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            self._fingerprint = self._fingerprint_fn()
+            self.refresh()
+            self._watcher = threading.Thread(target=self._watch, name="device-registry", daemon=True)
+            self._watcher.start()
+            self._started = True
+
+    def _watch(self) -> None:
+        last_full = time.monotonic()
+        while not self._stop.wait(self._poll_interval_s):
+            fp = self._fingerprint_fn()
+            if fp is None:
+                # No /dev or sysfs to watch: periodic re-enumeration
+                if time.monotonic() - last_full >= self._fallback_interval_s:
+                    last_full = time.monotonic()
+                    self.refresh()
+                continue
+            if fp != self._fingerprint:
+                self._fingerprint = fp
+                last_full = time.monotonic()
+                self.refresh()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ports": len(self._ports),
+                "classified": sorted(self._classification),
+                "enumerations": self._enumerations,
+                "last_enumerated": self._last_enumerated,
+                "watching": self._fingerprint is not None,
+                "error": self._error,
+            }
+
+
+_default_registry: Optional[DeviceRegistry] = None
+
+
+def get_device_registry() -> DeviceRegistry:
+    """Process-wide DeviceRegistry."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = DeviceRegistry()
+    return _default_registry
@@ -0,0 +1,232 @@
+"""
+Episode storage: chunked, memory-mapped, append-only columnar file.
+
+Layout (little-endian):
+  [file header, HEADER_SIZE bytes]  magic, version, widths, chunk rows, JSON metadata
+  [chunk 0][chunk 1]...             fixed-size chunks, each aligned to the mmap granularity
+Chunk:
+  [chunk header, 16 bytes]          magic, row count, chunk index
+  t        float64[R]               seconds since episode start (monotonic clock)
+  wall     float64[R]               wall-clock timestamp
+  leader   float64[R, n_leader]     leader (GELLO) joint command
+  follower float64[R, n_follower]   follower joint positions
+  error    uint8[R]                 1 if the tick reported an error (text in errors.jsonl)
+
+The row count in a chunk header is updated after every append, so a reader sees every
+row the writer process stored. A crash loses at most the chunk being written.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+FILE_MAGIC = b"GEPI"
+CHUNK_MAGIC = b"CHNK"
+VERSION = 1
+HEADER_SIZE = max(4096, mmap.ALLOCATIONGRANULARITY)
+_FILE_HEADER = struct.Struct("<4sIIII")  # magic, version, n_leader, n_follower, chunk_rows
+_CHUNK_HEADER = struct.Struct("<4sIII")  # magic, rows, index, reserved
+DATA_FILE = "episode.bin"
+ERRORS_FILE = "errors.jsonl"
+
+
+def _align(n: int, a: int) -> int:
+    return (n + a - 1) // a * a
+
+
+class _Layout:
+    """Byte offsets of each column inside a chunk."""
+
+    def __init__(self, n_leader: int, n_follower: int, chunk_rows: int):
+        self.n_leader = n_leader
+        self.n_follower = n_follower
+        self.rows = chunk_rows
+        off = _CHUNK_HEADER.size
+        self.t = off
+        off += 8 * chunk_rows
+        self.wall = off
+        off += 8 * chunk_rows
+        self.leader = off
+        off += 8 * chunk_rows * n_leader
+        self.follower = off
+        off += 8 * chunk_rows * n_follower
+        self.error = off
+        off += chunk_rows
+        self.size = _align(off, mmap.ALLOCATIONGRANULARITY)
+
+    def views(self, buf) -> Dict[str, np.ndarray]:
+        r = self.rows
+        return {
+            "t": np.frombuffer(buf, dtype="<f8", count=r, offset=self.t),
+            "wall": np.frombuffer(buf, dtype="<f8", count=r, offset=self.wall),
+            "leader": np.frombuffer(buf, dtype="<f8", count=r * self.n_leader, offset=self.leader)
+            .reshape(r, self.n_leader),
+            "follower": np.frombuffer(buf, dtype="<f8", count=r * self.n_follower, offset=self.follower)
+            .reshape(r, self.n_follower),
+            "error": np.frombuffer(buf, dtype="u1", count=r, offset=self.error),
+        }
+
+
+class EpisodeWriter:
+    """Append rows to an episode file, one memory-mapped chunk at a time. Single-threaded use."""
+
+    def __init__(
+        self,
+        directory: str,
+        n_leader: int,
+        n_follower: int,
+        chunk_rows: int = 1024,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, DATA_FILE)
+        self._layout = _Layout(n_leader, n_follower, chunk_rows)
+        self._file = open(self.path, "w+b")
+        meta = json.dumps(metadata or {}).encode("utf-8")
+        if _FILE_HEADER.size + 4 + len(meta) > HEADER_SIZE:
+            raise ValueError("episode metadata too large")
+        header = _FILE_HEADER.pack(FILE_MAGIC, VERSION, n_leader, n_follower, chunk_rows)
+        header += struct.pack("<I", len(meta)) + meta
+        self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self._file.flush()
+        self._errors = open(os.path.join(directory, ERRORS_FILE), "a", encoding="utf-8")
+        self._chunk_index = -1
+        self._mm: Optional[mmap.mmap] = None
+        self._cols: Dict[str, np.ndarray] = {}
+        self._rows_in_chunk = 0
+        self.rows_written = 0
+        self.chunks = 0
+
+    @property
+    def bytes_on_disk(self) -> int:
+        return HEADER_SIZE + self.chunks * self._layout.size
+
+    def _open_chunk(self) -> None:
+        self._close_chunk()
+        self._chunk_index += 1
+        offset = HEADER_SIZE + self._chunk_index * self._layout.size
+        self._file.truncate(offset + self._layout.size)
+        self._mm = mmap.mmap(self._file.fileno(), self._layout.size, offset=offset)
+        self._mm[:_CHUNK_HEADER.size] = _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, self._chunk_index, 0)
+        self._cols = self._layout.views(self._mm)
+        self._rows_in_chunk = 0
+        self.chunks += 1
+
+    def _close_chunk(self) -> None:
+        if self._mm is None:
+            return
+        self._cols = {}
+        self._mm.flush()
+        self._mm.close()
+        self._mm = None
+
+    def append(
+        self,
+        t: np.ndarray,
+        wall: np.ndarray,
+        leader: np.ndarray,
+        follower: np.ndarray,
+        error: np.ndarray,
+    ) -> None:
+        """Append a block of rows (arrays share the first dimension)."""
+        n = len(t)
+        done = 0
+        while done < n:
+            if self._mm is None or self._rows_in_chunk == self._layout.rows:
+                self._open_chunk()
+            k = min(n - done, self._layout.rows - self._rows_in_chunk)
+            a, b = self._rows_in_chunk, self._rows_in_chunk + k
+            cols = self._cols
+            cols["t"][a:b] = t[done:done + k]
+            cols["wall"][a:b] = wall[done:done + k]
+            cols["leader"][a:b] = leader[done:done + k]
+            cols["follower"][a:b] = follower[done:done + k]
+            cols["error"][a:b] = error[done:done + k]
+            del cols  # the chunk mmap cannot be closed while views are alive
+            self._rows_in_chunk = b
+            # Publish the row count only after the data is in place
+            self._mm[4:8] = struct.pack("<I", b)
+            done += k
+            self.rows_written += k
+            if b == self._layout.rows:
+                self._mm.flush()
+
+    def append_error(self, row: int, t: float, message: str) -> None:
+        self._errors.write(json.dumps({"row": row, "t": t, "error": message}, ensure_ascii=False) + "\n")
+        self._errors.flush()
+
+    def close(self) -> None:
+        # A partially filled last chunk stays full-size on disk; readers honour its row count
+        self._close_chunk()
+        self._file.close()
+        self._errors.close()
+
+
+class EpisodeReader:
+    """Read-only view of an episode file; columns are zero-copy views into the mmap."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, DATA_FILE)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._mm is None or size < HEADER_SIZE:
+            raise ValueError(f"not an episode file: {self.path}")
+        magic, version, n_leader, n_follower, chunk_rows = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != FILE_MAGIC or version != VERSION:
+            raise ValueError(f"not an episode file: {self.path}")
+        (meta_len,) = struct.unpack_from("<I", self._mm, _FILE_HEADER.size)
+        meta_off = _FILE_HEADER.size + 4
+        self.metadata: Dict[str, Any] = json.loads(bytes(self._mm[meta_off:meta_off + meta_len]) or b"{}")
+        self._layout = _Layout(n_leader, n_follower, chunk_rows)
+        self.n_leader = n_leader
+        self.n_follower = n_follower
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        offset = HEADER_SIZE
+        while offset + self._layout.size <= size:
+            cmagic, rows, _, _ = _CHUNK_HEADER.unpack_from(self._mm, offset)
+            if cmagic != CHUNK_MAGIC:
+                break
+            view = memoryview(self._mm)[offset:offset + self._layout.size]
+            cols = self._layout.views(view)
+            self._chunks.append({k: v[:rows] for k, v in cols.items()})
+            offset += self._layout.size
+        self.num_rows = sum(len(c["t"]) for c in self._chunks)
+
+    def iter_chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        return iter(self._chunks)
+
+    def column(self, name: str) -> np.ndarray:
+        """Concatenate one column across chunks (copies)."""
+        parts = [c[name] for c in self._chunks]
+        if not parts:
+            width = {"leader": self.n_leader, "follower": self.n_follower}.get(name)
+            return np.zeros((0, width) if width else 0)
+        return np.concatenate(parts)
+
+    def errors(self) -> List[Dict[str, Any]]:
+        path = os.path.join(self.directory, ERRORS_FILE)
+        if not os.path.exists(path):
+            return []
+        out = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    break
+        return out
+
+    def close(self) -> None:
+        self._chunks = []
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # views still referenced by the caller
+            self._mm = None
@@ -1,12 +1,24 @@
 """
 Observer Pattern: EventBus for loose coupling between components.
 Publishers emit events; subscribers react without direct dependency.
+
+Two dispatch modes:
+- SYNC: callbacks run inline on the publisher's thread (original behaviour).
+- ASYNC: publish() only appends to one dispatch queue; a fan-out thread copies the
+  event into each subscriber's bounded queue, drained by that subscriber's worker.
+  Neither publish() nor the fan-out thread ever waits: a slow observer can no longer
+  stall the teleop control thread or the other observers.
 """
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 
+from .metrics import LatencyHistogram
+
 
 class EventType(Enum):
     """Domain event types for system-wide observation."""
@@ -18,6 +30,25 @@ class EventType(Enum):
     ROBOT_DISCONNECTED = "robot_disconnected"
     GELLO_CONNECTED = "gello_connected"
     GELLO_DISCONNECTED = "gello_disconnected"
+    RECORDING_STARTED = "recording_started"
+    RECORDING_STOPPED = "recording_stopped"
+    DEVICE_ADDED = "device_added"
+    DEVICE_REMOVED = "device_removed"
+
+
+class DispatchMode(Enum):
+    """How subscriber callbacks are invoked."""
+    SYNC = "sync"
+    ASYNC = "async"
+
+
+class OverflowPolicy(Enum):
+    """What an async subscriber queue does when full."""
+    DROP_OLDEST = "drop_oldest"
+    COALESCE_LATEST = "coalesce_latest"  # keep only the newest pending event per type
+    # Like DROP_OLDEST with an extra BACKLOG slots of headroom for bursts; nothing ever
+    # waits, so a subscriber that stays behind still loses its oldest events
+    BOUNDED_BACKLOG = "bounded_backlog"
 
 
 @dataclass
@@ -31,6 +62,127 @@ class Event:
 ObserverCallback = Callable[[Event], None]
 
 
+def _callback_name(cb: ObserverCallback) -> str:
+    owner = getattr(cb, "__self__", None)
+    name = getattr(cb, "__qualname__", None) or getattr(cb, "__name__", None) or repr(cb)
+    if owner is not None and "." not in name:
+        name = f"{type(owner).__name__}.{name}"
+    return name
+
+
+class _Subscription:
+    """One observer: inline (sync) or with its own bounded queue and worker (async)."""
+
+    BACKLOG = 4096
+
+    def __init__(
+        self,
+        callback: ObserverCallback,
+        event_type: Optional[EventType],
+        mode: DispatchMode,
+        queue_size: int,
+        overflow: OverflowPolicy,
+    ):
+        self.callback = callback
+        self.event_type = event_type
+        self.mode = mode
+        self.queue_size = max(1, queue_size)
+        self.overflow = overflow
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.callback_latency = LatencyHistogram()
+        self.queue_latency = LatencyHistogram()
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._latest: "OrderedDict[EventType, tuple]" = OrderedDict()
+        self._stopped = False
+        self._worker: Optional[threading.Thread] = None
+        if mode == DispatchMode.ASYNC:
+            self._worker = threading.Thread(
+                target=self._run, name=f"event-{_callback_name(callback)}", daemon=True
+            )
+            self._worker.start()
+
+    @property
+    def depth(self) -> int:
+        return len(self._latest) if self.overflow == OverflowPolicy.COALESCE_LATEST else len(self._queue)
+
+    def deliver(self, event: Event, enqueued_at: Optional[float] = None) -> None:
+        start = time.perf_counter()
+        if enqueued_at is not None:
+            self.queue_latency.record(start - enqueued_at)
+        try:
+            self.callback(event)
+        except Exception:
+            self.errors += 1
+        self.callback_latency.record(time.perf_counter() - start)
+        self.delivered += 1
+
+    def offer(self, event: Event, enqueued_at: float) -> None:
+        """Called from the fan-out thread; never waits."""
+        with self._cond:
+            if self._stopped:
+                return
+            if self.overflow == OverflowPolicy.COALESCE_LATEST:
+                if event.type in self._latest:
+                    self.dropped += 1
+                    del self._latest[event.type]
+                self._latest[event.type] = (event, enqueued_at)
+            else:
+                limit = self.queue_size
+                if self.overflow == OverflowPolicy.BOUNDED_BACKLOG:
+                    limit += self.BACKLOG
+                if len(self._queue) >= limit:
+                    self._queue.popleft()
+                    self.dropped += 1
+                self._queue.append((event, enqueued_at))
+            depth = self.depth
+            if depth > self.max_depth:
+                self.max_depth = depth
+            self._cond.notify_all()
+
+    def _take(self):
+        if self.overflow == OverflowPolicy.COALESCE_LATEST:
+            return self._latest.popitem(last=False)[1] if self._latest else None
+        return self._queue.popleft() if self._queue else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                item = self._take()
+                while item is None and not self._stopped:
+                    self._cond.wait()
+                    item = self._take()
+                if item is None:
+                    return
+            self.deliver(*item)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._latest.clear()
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "callback": _callback_name(self.callback),
+            "event_type": self.event_type.value if self.event_type else "*",
+            "mode": self.mode.value,
+            "overflow": self.overflow.value,
+            "queue_size": self.queue_size,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "callback_ms": self.callback_latency.percentiles(),
+            "queue_wait_ms": self.queue_latency.percentiles(),
+        }
+
+
 class EventBus:
     """
     Central event bus - Singleton for app-wide use.
@@ -39,6 +191,9 @@ class EventBus:
 
     _instance: Optional["EventBus"] = None
 
+    DEFAULT_QUEUE_SIZE = 256
+    DISPATCH_QUEUE_SIZE = 4096
+
     def __new__(cls) -> "EventBus":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -47,44 +202,164 @@ class EventBus:
     def __init__(self):
         if getattr(self, "_observers", None) is not None:
             return
-        self._observers: Dict[EventType, List[ObserverCallback]] = {
+        self._observers: Dict[EventType, List[_Subscription]] = {
             et: [] for et in EventType
         }
-        self._global_observers: List[ObserverCallback] = []
+        self._global_observers: List[_Subscription] = []
+        # Derived views used by publish(): inline callbacks and "needs fan-out" flags
+        self._sync_observers: Dict[EventType, List[_Subscription]] = {et: [] for et in EventType}
+        self._async_types: Dict[EventType, bool] = {et: False for et in EventType}
+        self._mode = DispatchMode.SYNC
+        self._default_queue_size = self.DEFAULT_QUEUE_SIZE
+        self._default_overflow = OverflowPolicy.DROP_OLDEST
+        # Async fan-out: publish() appends here, the dispatcher thread distributes
+        self._dispatch_queue: deque = deque()
+        self._dispatch_cond = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._published = 0
+        self._dispatch_dropped = 0
+        self._dispatch_max_depth = 0
 
-    def subscribe(self, event_type: EventType, callback: ObserverCallback) -> None:
+    def configure(
+        self,
+        dispatch: DispatchMode = DispatchMode.SYNC,
+        queue_size: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+    ) -> None:
+        """Set defaults for subsequent subscriptions (existing ones keep their mode)."""
+        self._mode = dispatch
+        if queue_size is not None:
+            self._default_queue_size = queue_size
+        if overflow is not None:
+            self._default_overflow = overflow
+
+    def _make_subscription(
+        self,
+        callback: ObserverCallback,
+        event_type: Optional[EventType],
+        dispatch: Optional[DispatchMode],
+        queue_size: Optional[int],
+        overflow: Optional[OverflowPolicy],
+    ) -> _Subscription:
+        mode = dispatch or self._mode
+        if mode == DispatchMode.ASYNC:
+            self._ensure_dispatcher()
+        return _Subscription(
+            callback,
+            event_type,
+            mode,
+            queue_size or self._default_queue_size,
+            overflow or self._default_overflow,
+        )
+
+    def subscribe(
+        self,
+        event_type: EventType,
+        callback: ObserverCallback,
+        dispatch: Optional[DispatchMode] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+    ) -> None:
         """Subscribe to a specific event type."""
-        if callback not in self._observers[event_type]:
-            self._observers[event_type].append(callback)
+        if not any(s.callback == callback for s in self._observers[event_type]):
+            sub = self._make_subscription(callback, event_type, dispatch, queue_size, overflow)
+            self._observers[event_type] = self._observers[event_type] + [sub]
+            self._rebuild()
 
-    def subscribe_all(self, callback: ObserverCallback) -> None:
+    def subscribe_all(
+        self,
+        callback: ObserverCallback,
+        dispatch: Optional[DispatchMode] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+    ) -> None:
         """Subscribe to all events."""
-        if callback not in self._global_observers:
-            self._global_observers.append(callback)
+        if not any(s.callback == callback for s in self._global_observers):
+            sub = self._make_subscription(callback, None, dispatch, queue_size, overflow)
+            self._global_observers = self._global_observers + [sub]
+            self._rebuild()
 
     def unsubscribe(self, event_type: EventType, callback: ObserverCallback) -> None:
         """Remove a subscription."""
-        if callback in self._observers[event_type]:
-            self._observers[event_type].remove(callback)
+        keep = []
+        for sub in self._observers[event_type]:
+            if sub.callback == callback:
+                sub.stop()
+            else:
+                keep.append(sub)
+        self._observers[event_type] = keep
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        # Lists are replaced, never mutated, so publish() can iterate without a lock
+        global_sync = [s for s in self._global_observers if s.mode == DispatchMode.SYNC]
+        global_async = any(s.mode == DispatchMode.ASYNC for s in self._global_observers)
+        sync_observers = {}
+        async_types = {}
+        for et, subs in self._observers.items():
+            sync_observers[et] = [s for s in subs if s.mode == DispatchMode.SYNC] + global_sync
+            async_types[et] = global_async or any(s.mode == DispatchMode.ASYNC for s in subs)
+        self._sync_observers = sync_observers
+        self._async_types = async_types
 
     def publish(self, event: Event) -> None:
-        """Publish event to all relevant observers."""
-        for cb in self._observers[event.type]:
-            try:
-                cb(event)
-            except Exception:
-                pass
-        for cb in self._global_observers:
-            try:
-                cb(event)
-            except Exception:
-                pass
+        """
+        Publish event to all relevant observers. Async observers cost one enqueue in total;
+        a full dispatch queue drops its oldest event (counted) instead of waiting.
+        """
+        for sub in self._sync_observers[event.type]:
+            sub.deliver(event)
+        self._published += 1
+        if self._async_types[event.type]:
+            with self._dispatch_cond:
+                if len(self._dispatch_queue) >= self.DISPATCH_QUEUE_SIZE:
+                    self._dispatch_queue.popleft()
+                    self._dispatch_dropped += 1
+                self._dispatch_queue.append((event, time.perf_counter()))
+                if len(self._dispatch_queue) > self._dispatch_max_depth:
+                    self._dispatch_max_depth = len(self._dispatch_queue)
+                self._dispatch_cond.notify()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="event-dispatch", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._dispatch_cond:
+                while not self._dispatch_queue:
+                    self._dispatch_cond.wait()
+                event, enqueued_at = self._dispatch_queue.popleft()
+            for sub in self._observers[event.type]:
+                if sub.mode == DispatchMode.ASYNC:
+                    sub.offer(event, enqueued_at)
+            for sub in self._global_observers:
+                if sub.mode == DispatchMode.ASYNC:
+                    sub.offer(event, enqueued_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Dispatch instrumentation: queue depths, drops and callback latency per subscriber."""
+        subs = [s for subs in self._observers.values() for s in subs] + list(self._global_observers)
+        return {
+            "mode": self._mode.value,
+            "published": self._published,
+            "dispatch_queue_depth": len(self._dispatch_queue),
+            "dispatch_queue_max_depth": self._dispatch_max_depth,
+            "dispatch_dropped": self._dispatch_dropped,
+            "subscribers": [s.get_stats() for s in subs],
+        }
 
     def reset(self) -> None:
         """Clear all observers (for testing)."""
         for key in self._observers:
+            for sub in self._observers[key]:
+                sub.stop()
             self._observers[key] = []
+        for sub in self._global_observers:
+            sub.stop()
         self._global_observers = []
+        self._rebuild()
 
 
 def get_event_bus() -> EventBus:
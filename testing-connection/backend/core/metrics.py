@@ -0,0 +1,171 @@
+"""
+Loop instrumentation: fixed-memory latency histograms and per-phase tick timing.
+Recording is O(1) and allocation-free so it can run inside the control loop.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+# HDR-style log-linear buckets over integer microseconds: 16 sub-buckets per
+# power of two (~6% relative precision), values below 32 us are exact.
+_SUB_BUCKETS = 16
+_MAX_SHIFT = 32
+_NUM_BUCKETS = 2 * _SUB_BUCKETS + _SUB_BUCKETS * _MAX_SHIFT
+
+
+def _bucket_index(us: int) -> int:
+    if us < 2 * _SUB_BUCKETS:
+        return us if us > 0 else 0
+    shift = us.bit_length() - 5
+    if shift > _MAX_SHIFT:
+        return _NUM_BUCKETS - 1
+    return (shift + 1) * _SUB_BUCKETS + (us >> shift) - _SUB_BUCKETS
+
+
+def _bucket_midpoints() -> np.ndarray:
+    mids = np.zeros(_NUM_BUCKETS, dtype=np.float64)
+    for idx in range(_NUM_BUCKETS):
+        if idx < 2 * _SUB_BUCKETS:
+            mids[idx] = idx
+            continue
+        shift = idx // _SUB_BUCKETS - 1
+        low = ((idx % _SUB_BUCKETS) + _SUB_BUCKETS) << shift
+        mids[idx] = low + ((1 << shift) - 1) / 2.0
+    return mids
+
+
+_MIDPOINTS_US = _bucket_midpoints()
+
+
+class LatencyHistogram:
+    """
+    Rolling latency histogram (seconds in, milliseconds out).
+    Keeps the current and previous window; percentiles cover both, so the
+    reported distribution spans between one and two windows of samples.
+    """
+
+    def __init__(self, window_s: float = 10.0, clock=time.monotonic):
+        self._window_s = window_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Plain lists: an int increment is far cheaper than numpy scalar indexing
+        self._current = [0] * _NUM_BUCKETS
+        self._previous = [0] * _NUM_BUCKETS
+        self._window_start = clock()
+        self._total_count = 0
+        self._max_us = 0
+        self._window_max_us = 0
+        self._prev_window_max_us = 0
+
+    def record(self, seconds: float) -> None:
+        us = int(seconds * 1e6)
+        idx = _bucket_index(us)
+        with self._lock:
+            now = self._clock()
+            if now - self._window_start >= self._window_s:
+                self._rotate(now)
+            self._current[idx] += 1
+            self._total_count += 1
+            if us > self._window_max_us:
+                self._window_max_us = us
+                if us > self._max_us:
+                    self._max_us = us
+
+    def _rotate(self, now: float) -> None:
+        if now - self._window_start >= 2 * self._window_s:
+            self._previous = [0] * _NUM_BUCKETS
+            self._prev_window_max_us = 0
+        else:
+            self._previous = self._current
+            self._prev_window_max_us = self._window_max_us
+        self._current = [0] * _NUM_BUCKETS
+        self._window_max_us = 0
+        self._window_start = now
+
+    def reset(self) -> None:
+        with self._lock:
+            self._current = [0] * _NUM_BUCKETS
+            self._previous = [0] * _NUM_BUCKETS
+            self._window_start = self._clock()
+            self._total_count = 0
+            self._max_us = 0
+            self._window_max_us = 0
+            self._prev_window_max_us = 0
+
+    def percentiles(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, Any]:
+        """Summary in milliseconds: count, mean, p50/p95/p99, window max and all-time max."""
+        with self._lock:
+            now = self._clock()
+            if now - self._window_start >= self._window_s:
+                self._rotate(now)
+            counts = np.add(self._current, self._previous, dtype=np.int64)
+            window_max_us = max(self._window_max_us, self._prev_window_max_us)
+            total_count = self._total_count
+            max_us = self._max_us
+        n = int(counts.sum())
+        out: Dict[str, Any] = {"count": n, "total_count": total_count}
+        if n == 0:
+            for q in quantiles:
+                out[f"p{int(round(q * 100))}"] = 0.0
+            out.update({"mean": 0.0, "max": 0.0, "max_all_time": max_us / 1000.0})
+            return out
+        cum = np.cumsum(counts)
+        for q in quantiles:
+            idx = int(np.searchsorted(cum, q * n, side="left"))
+            out[f"p{int(round(q * 100))}"] = float(min(_MIDPOINTS_US[idx], window_max_us)) / 1000.0
+        out["mean"] = float(np.dot(counts, _MIDPOINTS_US) / n) / 1000.0
+        out["max"] = window_max_us / 1000.0
+        out["max_all_time"] = max_us / 1000.0
+        return out
+
+
+class LoopMetrics:
+    """
+    Per-phase timing for a control loop.
+    Call begin_tick() at the top of each iteration and mark(phase) after each
+    stage; every mark records the time since the previous mark.
+    """
+
+    def __init__(self, phases: Iterable[str], window_s: float = 10.0):
+        self._window_s = window_s
+        self._phases: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram(window_s) for name in phases
+        }
+        self._tick = LatencyHistogram(window_s)
+        self._tick_start: Optional[float] = None
+        self._last_mark = 0.0
+
+    def begin_tick(self) -> None:
+        now = time.perf_counter()
+        self._tick_start = now
+        self._last_mark = now
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        if self._tick_start is None:
+            self._last_mark = now
+            return
+        hist = self._phases.get(phase)
+        if hist is None:
+            hist = self._phases[phase] = LatencyHistogram(self._window_s)
+        hist.record(now - self._last_mark)
+        self._last_mark = now
+
+    def end_tick(self) -> None:
+        """Record total work time of the tick (excludes scheduler sleep)."""
+        if self._tick_start is not None:
+            self._tick.record(time.perf_counter() - self._tick_start)
+            self._tick_start = None
+
+    def reset(self) -> None:
+        for hist in self._phases.values():
+            hist.reset()
+        self._tick.reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tick": self._tick.percentiles(),
+            "phases": {name: h.percentiles() for name, h in self._phases.items()},
+        }
@@ -0,0 +1,180 @@
+"""
+Full-rate episode recorder.
+The control thread copies one row into a preallocated ring buffer per tick; a background
+writer thread drains the ring into an EpisodeWriter (chunked, memory-mapped file).
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .episode_store import EpisodeWriter
+from .state_buffer import StateSnapshot
+
+
+class EpisodeRecorder:
+    """
+    Single-producer ring buffer + writer thread.
+    Only ticks with both leader and follower joints are recorded: setup snapshots and
+    error-only snapshots (no joints) are skipped and counted, so recording can start
+    before teleop. Column widths are fixed by the first recorded tick; wider samples are
+    truncated, narrower ones zero-padded. If the writer falls behind by more than the
+    ring capacity, the oldest unwritten rows are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        capacity: int = 4096,
+        chunk_rows: int = 1024,
+        flush_interval_s: float = 0.05,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.directory = directory
+        self._capacity = capacity
+        self._chunk_rows = chunk_rows
+        self._flush_interval_s = flush_interval_s
+        self._metadata = dict(metadata or {})
+        self._ring: Optional[Dict[str, np.ndarray]] = None
+        self._errors: List[Optional[str]] = [None] * capacity
+        self._head = 0  # rows pushed (written only by the producer)
+        self._tail = 0  # rows consumed (written only by the writer thread)
+        self._dropped = 0
+        self._skipped = 0
+        self._skipped_errors = 0
+        self._last_skipped_error: Optional[str] = None
+        self._t0: Optional[float] = None
+        self._writer: Optional[EpisodeWriter] = None
+        self._write_error: Optional[str] = None
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._started_at = time.time()
+        self._stopped_at: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="episode-writer", daemon=True)
+        self._thread.start()
+
+    # --- producer side (control thread) ---
+
+    def push(self, snapshot: StateSnapshot) -> None:
+        """Copy one tick into the ring. O(1), allocation-free after the first recorded tick."""
+        if not len(snapshot.leader_joints) or not len(snapshot.joint_positions):
+            self._skipped += 1
+            if snapshot.error:
+                self._skipped_errors += 1
+                self._last_skipped_error = snapshot.error
+            return
+        now = time.monotonic()
+        ring = self._ring
+        if ring is None:
+            ring = self._allocate(len(snapshot.leader_joints), len(snapshot.joint_positions))
+            self._t0 = now
+        i = self._head % self._capacity
+        ring["t"][i] = now - self._t0
+        ring["wall"][i] = snapshot.timestamp
+        leader = ring["leader"][i]
+        n = min(len(snapshot.leader_joints), leader.shape[0])
+        leader[:n] = snapshot.leader_joints[:n]
+        leader[n:] = 0.0
+        follower = ring["follower"][i]
+        n = min(len(snapshot.joint_positions), follower.shape[0])
+        follower[:n] = snapshot.joint_positions[:n]
+        follower[n:] = 0.0
+        ring["error"][i] = 1 if snapshot.error else 0
+        self._errors[i] = snapshot.error
+        self._head += 1
+
+    def _allocate(self, n_leader: int, n_follower: int) -> Dict[str, np.ndarray]:
+        c = self._capacity
+        self._ring = {
+            "t": np.zeros(c, dtype=np.float64),
+            "wall": np.zeros(c, dtype=np.float64),
+            "leader": np.zeros((c, n_leader), dtype=np.float64),
+            "follower": np.zeros((c, n_follower), dtype=np.float64),
+            "error": np.zeros(c, dtype=np.uint8),
+        }
+        return self._ring
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self._flush_interval_s)
+            self._wakeup.clear()
+            self._drain()
+        self._drain()
+        if self._writer is not None:
+            self._writer.close()
+
+    def _drain(self) -> None:
+        ring = self._ring
+        if ring is None:
+            return
+        head = self._head
+        if head - self._tail > self._capacity:
+            self._dropped += head - self._tail - self._capacity
+            self._tail = head - self._capacity
+        if head == self._tail:
+            return
+        try:
+            if self._writer is None:
+                self._metadata.setdefault("created", self._started_at)
+                self._writer = EpisodeWriter(
+                    self.directory,
+                    ring["leader"].shape[1],
+                    ring["follower"].shape[1],
+                    chunk_rows=self._chunk_rows,
+                    metadata=self._metadata,
+                )
+            # Copy out at most two contiguous slices of the ring
+            while self._tail < head:
+                start = self._tail % self._capacity
+                end = min(start + (head - self._tail), self._capacity)
+                rows = slice(start, end)
+                base_row = self._writer.rows_written
+                self._writer.append(
+                    ring["t"][rows], ring["wall"][rows], ring["leader"][rows],
+                    ring["follower"][rows], ring["error"][rows],
+                )
+                for k in np.flatnonzero(ring["error"][rows]):
+                    msg = self._errors[start + k]
+                    if msg:
+                        self._writer.append_error(base_row + int(k), float(ring["t"][start + k]), msg)
+                self._tail += end - start
+        except Exception as e:
+            self._write_error = str(e)
+            self._tail = head
+
+    # --- control ---
+
+    def close(self) -> Dict[str, Any]:
+        """Stop the writer thread after draining everything pushed so far."""
+        if self._stopped_at is None:
+            self._stopped_at = time.time()
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join(timeout=5.0)
+        return self.get_status()
+
+    @property
+    def active(self) -> bool:
+        return self._stopped_at is None
+
+    def get_status(self) -> Dict[str, Any]:
+        writer = self._writer
+        end = self._stopped_at or time.time()
+        return {
+            "active": self.active,
+            "directory": self.directory,
+            "rows_pushed": self._head,
+            "rows_written": writer.rows_written if writer else 0,
+            "pending": self._head - self._tail,
+            "dropped": self._dropped,
+            "skipped": self._skipped,
+            "skipped_errors": self._skipped_errors,
+            "last_skipped_error": self._last_skipped_error,
+            "chunks": writer.chunks if writer else 0,
+            "bytes": writer.bytes_on_disk if writer else 0,
+            "duration_s": end - self._started_at,
+            "error": self._write_error,
+        }
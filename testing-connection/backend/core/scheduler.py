@@ -0,0 +1,132 @@
+"""
+Fixed-rate loop scheduler shared by all teleop strategies.
+Keeps absolute deadlines on the monotonic clock so work time does not stretch the period.
+"""
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+# Sleep coarsely until this close to a deadline, then yield-spin.
+SPIN_THRESHOLD_S = 0.0015
+
+
+def sleep_until(deadline: float, clock=time.monotonic) -> float:
+    """Block until clock() >= deadline; returns the wake-up time."""
+    now = clock()
+    remaining = deadline - now
+    if remaining > SPIN_THRESHOLD_S:
+        time.sleep(remaining - SPIN_THRESHOLD_S)
+    while True:
+        now = clock()
+        if now >= deadline:
+            return now
+        time.sleep(0)
+
+
+class RateScheduler:
+    """
+    Deadline-based fixed-rate scheduler.
+
+    Tick k is due at ``start + k * period``. ``wait()`` sleeps until the next
+    deadline; if the loop overran one or more periods, the missed deadlines are
+    skipped (counted, not replayed) so the loop never drifts or bursts.
+    The schedule (deadlines) belongs to the thread calling ``wait()``; ``reset()`` may be
+    called from any thread and only takes effect at the loop's next ``wait()``.
+    """
+
+    def __init__(self, hz: float, clock=time.monotonic):
+        if hz <= 0:
+            raise ValueError("hz must be positive")
+        self._hz = float(hz)
+        self._period = 1.0 / self._hz
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._restart_schedule(self._clock())
+        self.reset()
+        self._restart = False
+
+    @property
+    def hz(self) -> float:
+        return self._hz
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    def _restart_schedule(self, now: float) -> None:
+        """Loop thread only: next deadline is one period from now."""
+        self._start = now
+        self._tick_index = 0
+        self._next_deadline = now + self._period
+        self._last_wake: Optional[float] = None
+
+    def reset(self) -> None:
+        """Clear the stats and restart the schedule at the loop's next wait() (any thread)."""
+        with self._lock:
+            self._restart = True
+            self._ticks = 0
+            self._overruns = 0
+            self._skipped = 0
+            # Welford running stats over the achieved period (seconds)
+            self._mean = 0.0
+            self._m2 = 0.0
+            self._max_abs_jitter = 0.0
+
+    def wait(self) -> bool:
+        """
+        Block until the next deadline. Returns False if the tick overran
+        (deadline already passed), True if it slept.
+        """
+        if self._restart:
+            with self._lock:
+                self._restart = False
+                self._restart_schedule(self._clock())
+        now = self._clock()
+        deadline = self._next_deadline
+        on_time = now < deadline
+        if on_time:
+            sleep_until(deadline, self._clock)
+            missed = 0
+        else:
+            # Skip every deadline that has already passed
+            missed = int(math.floor((now - deadline) / self._period)) + 1
+        self._record(self._clock(), on_time, missed)
+        return on_time
+
+    def _record(self, wake: float, on_time: bool, missed: int) -> None:
+        with self._lock:
+            # Next deadline is the first one still in the future
+            self._tick_index += missed if missed else 1
+            self._next_deadline = self._start + (self._tick_index + 1) * self._period
+            if not on_time:
+                self._overruns += 1
+                self._skipped += missed - 1
+            if self._last_wake is not None:
+                dt = wake - self._last_wake
+                self._ticks += 1
+                delta = dt - self._mean
+                self._mean += delta / self._ticks
+                self._m2 += delta * (dt - self._mean)
+                jitter = abs(dt - self._period)
+                if jitter > self._max_abs_jitter:
+                    self._max_abs_jitter = jitter
+            self._last_wake = wake
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Target vs achieved rate, period jitter (ms) and overrun counts."""
+        with self._lock:
+            n = self._ticks
+            mean = self._mean
+            std = math.sqrt(self._m2 / (n - 1)) if n > 1 else 0.0
+            return {
+                "target_hz": self._hz,
+                "achieved_hz": (1.0 / mean) if n and mean > 0 else 0.0,
+                "period_mean_ms": mean * 1000.0,
+                "jitter_std_ms": std * 1000.0,
+                "jitter_max_ms": self._max_abs_jitter * 1000.0,
+                "ticks": n,
+                "overruns": self._overruns,
+                "skipped_ticks": self._skipped,
+            }
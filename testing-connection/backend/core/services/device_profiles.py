@@ -0,0 +1,123 @@
+"""
+Device Profile Cache: remember how each port's servos were last read successfully.
+A profile holds the baud rate, responding IDs and read method, so steady-state polls
+skip autodetection. Failed discoveries are cached briefly so a dead port does not
+cost a full baud/ID sweep of timeouts on every poll.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+READ_SYNC = "sync"
+READ_SINGLE = "single"
+
+
+@dataclass
+class DeviceProfile:
+    port: str
+    baudrate: int
+    ids: Tuple[int, ...]
+    method: str  # READ_SYNC or READ_SINGLE
+    requested_ids: Optional[Tuple[int, ...]]
+    detected_at: float
+    hits: int = 0
+
+    def matches(self, baudrate: int, ids: Optional[Tuple[int, ...]]) -> bool:
+        """baudrate 0 / ids None mean 'auto' and accept whatever was detected."""
+        if baudrate and baudrate != self.baudrate:
+            return False
+        return ids is None or ids == self.ids or ids == self.requested_ids
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "port": self.port,
+            "baudrate": self.baudrate,
+            "ids": list(self.ids),
+            "method": self.method,
+            "detected_at": self.detected_at,
+            "hits": self.hits,
+        }
+
+
+class DeviceProfileCache:
+    """Per-port profiles plus a short-lived negative cache of failed discoveries."""
+
+    def __init__(self, failure_ttl_s: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        self._failure_ttl_s = failure_ttl_s
+        self._clock = clock
+        self._profiles: Dict[str, DeviceProfile] = {}
+        # (port, baudrate, ids) -> (expires_at, error)
+        self._failures: Dict[Tuple[str, int, Optional[Tuple[int, ...]]], Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def lookup(self, port: str, baudrate: int = 0, ids: Optional[Tuple[int, ...]] = None) -> Optional[DeviceProfile]:
+        with self._lock:
+            profile = self._profiles.get(port)
+            if profile is not None and profile.matches(baudrate, ids):
+                profile.hits += 1
+                self._hits += 1
+                return profile
+            self._misses += 1
+            return None
+
+    def store(self, profile: DeviceProfile) -> None:
+        with self._lock:
+            self._profiles[profile.port] = profile
+            for key in [k for k in self._failures if k[0] == profile.port]:
+                del self._failures[key]
+
+    def invalidate(self, port: str) -> bool:
+        """Drop the port's profile and failure entries (read error, unplug, reconfiguration)."""
+        with self._lock:
+            removed = self._profiles.pop(port, None) is not None
+            for key in [k for k in self._failures if k[0] == port]:
+                del self._failures[key]
+            if removed:
+                self._invalidations += 1
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self._failures.clear()
+
+    def record_failure(self, port: str, baudrate: int, ids: Optional[Tuple[int, ...]], error: str) -> None:
+        with self._lock:
+            self._failures[(port, baudrate, ids)] = (self._clock() + self._failure_ttl_s, error)
+
+    def recent_failure(self, port: str, baudrate: int, ids: Optional[Tuple[int, ...]]) -> Optional[str]:
+        """Error of a discovery with the same parameters that failed within failure_ttl_s."""
+        key = (port, baudrate, ids)
+        with self._lock:
+            entry = self._failures.get(key)
+            if entry is None:
+                return None
+            if self._clock() >= entry[0]:
+                del self._failures[key]
+                return None
+            return entry[1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "profiles": [p.to_dict() for p in self._profiles.values()],
+                "failing_ports": sorted({k[0] for k in self._failures}),
+            }
+
+
+_default_profiles: Optional[DeviceProfileCache] = None
+
+
+def get_device_profiles() -> DeviceProfileCache:
+    """Process-wide DeviceProfileCache."""
+    global _default_profiles
+    if _default_profiles is None:
+        _default_profiles = DeviceProfileCache()
+    return _default_profiles
@@ -2,9 +2,13 @@
 Gello Service: encapsulates GELLO (Dynamixel) testing logic.
 Decoupled from API; uses event bus for notifications.
 """
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from ..device_registry import DeviceRegistry, get_device_registry
 from ..events import Event, EventBus, EventType, get_event_bus
+from .device_profiles import DeviceProfileCache, get_device_profiles
+from .gello_state_service import AUTO_BAUDRATES, scan_ports
+from .port_sessions import PortSessionManager, get_port_sessions
 
 
 class GelloService:
@@ -13,81 +17,98 @@ class GelloService:
     Hardware-dependent logic isolated; service delegates to adapters.
     """
 
-    def __init__(self, event_bus: Optional[EventBus] = None):
+    def __init__(
+        self,
+        event_bus: Optional[EventBus] = None,
+        port_sessions: Optional[PortSessionManager] = None,
+        device_registry: Optional[DeviceRegistry] = None,
+        device_profiles: Optional[DeviceProfileCache] = None,
+    ):
         self._event_bus = event_bus or get_event_bus()
+        self._port_sessions = port_sessions or get_port_sessions()
+        self._registry = device_registry or get_device_registry()
+        self._profiles = device_profiles or get_device_profiles()
+        self._registry.add_listener(self._on_ports_changed)
+
+    def _on_ports_changed(self, added: List[str], removed: List[str]) -> None:
+        """Hotplug: anything cached about a port that came or went is stale."""
+        for port in added + removed:
+            self._port_sessions.release(port)
+            self._profiles.invalidate(port)
+        for port in removed:
+            self._event_bus.publish(Event(EventType.GELLO_DISCONNECTED, {"port": port}))
 
     def list_ports(self) -> Dict[str, Any]:
-        """List available serial ports."""
-        try:
-            from serial.tools import list_ports
-            ports = [p.device for p in list_ports.comports()]
-            return {"ok": True, "ports": ports}
-        except Exception as e:
-            return {"ok": False, "ports": [], "error": str(e)}
+        """List available serial ports (from the device registry)."""
+        ports = self._registry.devices()
+        if not ports and self._registry.error:
+            return {"ok": False, "ports": [], "error": self._registry.error}
+        return {"ok": True, "ports": ports}
 
     def list_ports_detail(self) -> Dict[str, Any]:
-        """List COM ports with description/hwid."""
-        try:
-            from serial.tools import list_ports
-            items = []
-            for p in list(list_ports.comports()):
-                items.append({
-                    "port": p.device,
-                    "description": getattr(p, "description", "") or "",
-                    "hwid": getattr(p, "hwid", "") or "",
-                    "manufacturer": getattr(p, "manufacturer", "") or "",
-                    "product": getattr(p, "product", "") or "",
-                })
-            return {"ok": True, "devices": items}
-        except Exception as e:
-            return {"ok": False, "devices": [], "error": str(e)}
+        """List COM ports with description/hwid (from the device registry)."""
+        items = self._registry.ports()
+        if not items and self._registry.error:
+            return {"ok": False, "devices": [], "error": self._registry.error}
+        return {"ok": True, "devices": items}
 
     def is_gello_port(self, port: str, baudrate: int = 57600) -> bool:
         """Check if port responds to Dynamixel ping (ID 1)."""
         try:
-            from dynamixel_sdk.port_handler import PortHandler
-            from dynamixel_sdk.packet_handler import PacketHandler
             from dynamixel_sdk.robotis_def import COMM_SUCCESS
         except ImportError:
             return False
-        ph = PortHandler(port)
-        pk = PacketHandler(2.0)
         try:
-            if not ph.openPort():
-                return False
-            if not ph.setBaudRate(baudrate):
-                ph.closePort()
-                return False
-            _, result, _ = pk.ping(ph, 1)
-            ph.closePort()
+            with self._port_sessions.session(port, baudrate) as sess:
+                _, result, _ = sess.packet_handler.ping(sess.port_handler, 1)
             return result == COMM_SUCCESS
         except Exception:
-            try:
-                ph.closePort()
-            except Exception:
-                pass
             return False
 
-    def identify_ports(self) -> Dict[str, Any]:
-        """Identify which ports are GELLO vs robot."""
-        try:
-            from serial.tools import list_ports
-            comports = list(list_ports.comports())
-        except Exception as e:
-            return {"ok": False, "devices": [], "error": str(e)}
+    def identify_ports(
+        self,
+        baudrates: Sequence[int] = AUTO_BAUDRATES,
+        timeout_s: float = 3.0,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Identify which ports are GELLO vs robot. Classifications are cached in the device
+        registry until the port is unplugged; only new ports (or all, with refresh) are
+        scanned, concurrently (broadcast ping per baud rate). Servo ID 1 means GELLO.
+        """
+        ports = self._registry.ports()
+        if not ports and self._registry.error:
+            return {"ok": False, "devices": [], "error": self._registry.error}
+        if refresh:
+            self._registry.clear_classification()
+        pending = [p["port"] for p in ports if self._registry.get_classification(p["port"]) is None]
+        if pending:
+            scans = scan_ports(pending, baudrates, timeout_s=timeout_s, sessions=self._port_sessions)
+            for port, scan in scans.items():
+                if scan.get("error"):
+                    continue  # do not cache failures; retry on the next call
+                is_gello = 1 in scan.get("ids", [])
+                self._registry.set_classification(port, {
+                    "is_gello": is_gello,
+                    "label": "GELLO 控制器" if is_gello else "机械臂 (USB)",
+                    "ids": scan.get("ids", []),
+                    "baudrate": scan.get("baudrate"),
+                })
+        else:
+            scans = {}
         devices = []
-        for p in comports:
-            is_gello = self.is_gello_port(p.device)
-            devices.append({
-                "port": p.device,
-                "description": getattr(p, "description", "") or "",
-                "is_gello": is_gello,
-                "label": "GELLO 控制器" if is_gello else "机械臂 (USB)",
-            })
+        for p in ports:
+            info = self._registry.get_classification(p["port"])
+            if info is None:
+                error = scans.get(p["port"], {}).get("error")
+                info = {"is_gello": False, "label": "机械臂 (USB)", "ids": [], "baudrate": None, "error": error}
+            devices.append({"port": p["port"], "description": p["description"], **info})
         return {"ok": True, "devices": devices}
 
     def test_gello(self, port: str) -> Dict[str, Any]:
         """Test GELLO USB connection."""
+        # A pooled session would hold the port open; this test needs its own handle
+        self._port_sessions.release(port)
         try:
             import serial
             s = serial.Serial(port=port, baudrate=57600, timeout=0.5)
@@ -2,119 +2,250 @@
 Gello State Service: read joint positions from GELLO (Dynamixel).
 Decoupled from API; used for /api/test/gello/state and /api/test/gello/scan.
 """
-from typing import Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Optional, Sequence, Tuple
+
+from .device_profiles import READ_SINGLE, READ_SYNC, DeviceProfile, DeviceProfileCache, get_device_profiles
+from .port_sessions import PortSessionError, PortSessionManager, get_port_sessions
 
 
 def _read_single_servo_p2(port_handler, packet_handler, dxl_id: int, addr: int = 132):
     from dynamixel_sdk.robotis_def import COMM_SUCCESS
+    from lib.dynamixel_codec import raw_to_rad
     dxl_present_pos, dxl_comm_result, _ = packet_handler.read4ByteTxRx(
         port_handler, dxl_id, addr
     )
     if dxl_comm_result != COMM_SUCCESS:
         err_str = getattr(packet_handler, "getTxRxResult", lambda _: str(_))(dxl_comm_result)
         return None, f"ID {dxl_id}: {err_str}"
-    raw = dxl_present_pos
-    if raw > 0x7FFFFFFF:
-        raw -= 0x100000000
-    return raw / 2048.0 * 3.141592653589793, None
+    return raw_to_rad(dxl_present_pos), None
+
+
+ADDR_PRESENT_POSITION = 132
+LEN_PRESENT_POSITION = 4
+DEFAULT_JOINT_IDS = (1, 2, 3, 4, 5, 6, 7)
+FALLBACK_JOINT_IDS = (1, 2, 3, 4, 5, 6)
+AUTO_BAUDRATES = (57600, 1000000)
+
+
+def _pad_joints(joints: list) -> list:
+    while len(joints) < 7:
+        joints.append(0.0)
+    return joints
+
+
+def _sync_reader(sess, ids: tuple) -> tuple:
+    """(GroupSyncRead, SyncReadDecoder, rad buffer) for ids, built once per open port."""
+    key = ("sync_read", ids)
+    reader = sess.cache.get(key)
+    if reader is None:
+        import numpy as np
+        from dynamixel_sdk.group_sync_read import GroupSyncRead
+        from lib.dynamixel_codec import SyncReadDecoder
+        group_read = GroupSyncRead(sess.port_handler, sess.packet_handler, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION)
+        for did in ids:
+            if not group_read.addParam(did):
+                raise ValueError(f"ID {did}: addParam failed")
+        codec = SyncReadDecoder(group_read, ids, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION)
+        reader = sess.cache[key] = (group_read, codec, np.zeros(len(ids)))
+    return reader
+
+
+def _sync_read(sess, ids: tuple) -> tuple:
+    """One GroupSyncRead of present position. Returns (joints, error)."""
+    from dynamixel_sdk.robotis_def import COMM_SUCCESS
+    try:
+        group_read, codec, rad = _sync_reader(sess, ids)
+    except ValueError as e:
+        return None, str(e)
+    result = group_read.txRxPacket()
+    if result != COMM_SUCCESS:
+        pk = sess.packet_handler
+        if hasattr(pk, "getTxRxResult"):
+            return None, pk.getTxRxResult(result)
+        return None, "txRxPacket failed"
+    codec.decode()
+    codec.to_rad(ADDR_PRESENT_POSITION, rad)
+    return _pad_joints(rad.tolist()), None
+
+
+def _single_read(sess, ids: tuple) -> tuple:
+    """Per-servo reads (for adapters/firmware without Sync Read). Returns (joints, error)."""
+    joints = []
+    for did in ids:
+        val, err = _read_single_servo_p2(sess.port_handler, sess.packet_handler, did, ADDR_PRESENT_POSITION)
+        if err:
+            return None, err
+        joints.append(val)
+    if not joints:
+        return None, "no IDs"
+    return _pad_joints(joints), None
+
+
+def _discover(sess, joint_ids: tuple) -> tuple:
+    """Try sync then per-servo reads on joint_ids and the 6-ID fallback. Returns (joints, ids, method, error)."""
+    last_err = ""
+    for method, read in ((READ_SYNC, _sync_read), (READ_SINGLE, _single_read)):
+        for try_ids in (joint_ids, FALLBACK_JOINT_IDS):
+            joints, err = read(sess, tuple(try_ids))
+            if err is None:
+                return joints, tuple(try_ids), method, None
+            last_err = err
+    return None, None, None, f"读取失败（{last_err}）"
 
 
 def read_gello_joints(
     port: str,
     baudrate: int = 57600,
-    joint_ids: tuple = (1, 2, 3, 4, 5, 6, 7),
+    joint_ids: tuple = DEFAULT_JOINT_IDS,
+    sessions: Optional[PortSessionManager] = None,
 ) -> tuple:
     """Read present position (rad) for given Dynamixel IDs. Returns (joints, error)."""
     try:
-        from dynamixel_sdk.port_handler import PortHandler
-        from dynamixel_sdk.packet_handler import PacketHandler
-        from dynamixel_sdk.group_sync_read import GroupSyncRead
-        from dynamixel_sdk.robotis_def import COMM_SUCCESS
+        import dynamixel_sdk  # noqa: F401
     except ImportError as e:
         return [], f"dynamixel-sdk 未安装: {e}"
-    ADDR_PRESENT_POSITION = 132
-    LEN_PRESENT_POSITION = 4
-    ph = PortHandler(port)
-    pk = PacketHandler(2.0)
-    last_err = ""
+    sessions = sessions or get_port_sessions()
     try:
-        if not ph.openPort():
-            return [], f"无法打开串口 {port}"
-        if not ph.setBaudRate(baudrate):
-            ph.closePort()
-            return [], "设置波特率失败"
-        for try_ids in (joint_ids, (1, 2, 3, 4, 5, 6)):
-            group_read = GroupSyncRead(ph, pk, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION)
-            for did in try_ids:
-                if not group_read.addParam(did):
-                    break
-            else:
-                result = group_read.txRxPacket()
-                if result == COMM_SUCCESS:
-                    joints = []
-                    for did in try_ids:
-                        if group_read.isAvailable(did, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION):
-                            raw = group_read.getData(did, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION)
-                            if raw > 0x7FFFFFFF:
-                                raw -= 0x100000000
-                            joints.append(raw / 2048.0 * 3.141592653589793)
-                        else:
-                            joints.append(0.0)
-                    while len(joints) < 7:
-                        joints.append(0.0)
-                    ph.closePort()
-                    return joints, None
-                last_err = getattr(pk, "getTxRxResult", lambda _: str(_))(result) if hasattr(pk, "getTxRxResult") else "txRxPacket failed"
-        for try_ids in (joint_ids, (1, 2, 3, 4, 5, 6)):
-            joints = []
-            ok = True
-            for did in try_ids:
-                val, err = _read_single_servo_p2(ph, pk, did, ADDR_PRESENT_POSITION)
-                if err:
-                    last_err = err
-                    ok = False
-                    break
-                joints.append(val)
-            if ok and joints:
-                while len(joints) < 7:
-                    joints.append(0.0)
-                ph.closePort()
-                return joints, None
-        ph.closePort()
-        return [], f"读取失败（{last_err}）"
+        with sessions.session(port, baudrate) as sess:
+            joints, _, _, err = _discover(sess, tuple(joint_ids))
+        return (joints, None) if err is None else ([], err)
     except Exception as e:
-        try:
-            ph.closePort()
-        except Exception:
-            pass
         return [], str(e)
 
 
-def scan_gello_ids(port: str, baudrate: int = 57600) -> dict:
-    """Ping IDs 1-12 to find responding servos."""
+def read_gello_state(
+    port: str,
+    baudrate: int = 0,
+    joint_ids: Optional[tuple] = None,
+    sessions: Optional[PortSessionManager] = None,
+    profiles: Optional[DeviceProfileCache] = None,
+) -> dict:
+    """
+    Read GELLO joints using the port's cached DeviceProfile when one matches.
+    baudrate 0 sweeps AUTO_BAUDRATES, joint_ids None autodetects; a successful
+    discovery is cached, a read error invalidates it and rediscovers once.
+    """
+    try:
+        import dynamixel_sdk  # noqa: F401
+    except ImportError as e:
+        return {"ok": False, "joints": [], "error": f"dynamixel-sdk 未安装: {e}"}
+    sessions = sessions or get_port_sessions()
+    profiles = profiles or get_device_profiles()
+    ids_key = tuple(joint_ids) if joint_ids else None
+    profile = profiles.lookup(port, baudrate, ids_key)
+    if profile is not None:
+        read = _sync_read if profile.method == READ_SYNC else _single_read
+        try:
+            with sessions.session(port, profile.baudrate) as sess:
+                joints, err = read(sess, tuple(profile.ids))
+        except Exception as e:
+            joints, err = None, str(e)
+        if err is None:
+            return {"ok": True, "joints": joints}
+        profiles.invalidate(port)
+    cached_err = profiles.recent_failure(port, baudrate, ids_key)
+    if cached_err is not None:
+        return {"ok": False, "joints": [], "error": cached_err}
+    err = "读取失败"
+    for b in (baudrate,) if baudrate else AUTO_BAUDRATES:
+        try:
+            with sessions.session(port, b) as sess:
+                joints, ids, method, err = _discover(sess, ids_key or DEFAULT_JOINT_IDS)
+        except PortSessionError as e:
+            # Port itself is unusable; other baud rates will not help
+            err = str(e)
+            break
+        except Exception as e:
+            err = str(e)
+            continue
+        if err is None:
+            profiles.store(DeviceProfile(port, b, ids, method, ids_key, time.time()))
+            return {"ok": True, "joints": joints}
+    profiles.record_failure(port, baudrate, ids_key, err)
+    return {"ok": False, "joints": [], "error": err}
+
+
+def scan_gello_ids(
+    port: str,
+    baudrate: int = 57600,
+    sessions: Optional[PortSessionManager] = None,
+    baudrates: Optional[Sequence[int]] = None,
+    max_id: int = 12,
+    deadline: Optional[float] = None,
+) -> dict:
+    """
+    Find responding servos (IDs 1..max_id) with one broadcast ping per baud rate.
+    baudrates (default: just baudrate) are tried in order until one answers;
+    deadline is a time.monotonic() value after which no further baud rate is tried.
+    """
     try:
-        from dynamixel_sdk.port_handler import PortHandler
-        from dynamixel_sdk.packet_handler import PacketHandler
-        from dynamixel_sdk.robotis_def import COMM_SUCCESS
+        from lib.dynamixel_discovery import broadcast_ping
     except ImportError:
         return {"ok": False, "ids": [], "error": "dynamixel-sdk 未安装"}
-    ph = PortHandler(port)
-    pk = PacketHandler(2.0)
-    try:
-        if not ph.openPort():
-            return {"ok": False, "ids": [], "error": f"无法打开串口 {port}"}
-        if not ph.setBaudRate(baudrate):
-            ph.closePort()
-            return {"ok": False, "ids": [], "error": "设置波特率失败"}
-        found = [i for i in range(1, 13) if pk.ping(ph, i)[1] == COMM_SUCCESS]
-        ph.closePort()
-        return {"ok": True, "ids": found}
-    except Exception as e:
+    sessions = sessions or get_port_sessions()
+    last_err = None
+    for b in baudrates or (baudrate,):
+        if deadline is not None and time.monotonic() >= deadline:
+            last_err = last_err or "扫描超时"
+            break
         try:
-            ph.closePort()
-        except Exception:
-            pass
-        return {"ok": False, "ids": [], "error": str(e)}
+            with sessions.session(port, b) as sess:
+                found, _ = broadcast_ping(sess.port_handler, sess.packet_handler, max_id)
+        except PortSessionError as e:
+            return {"ok": False, "ids": [], "error": str(e)}
+        except Exception as e:
+            last_err = str(e)
+            continue
+        ids = sorted(i for i in found if i <= max_id)
+        if ids:
+            return {
+                "ok": True,
+                "ids": ids,
+                "baudrate": b,
+                "models": {i: found[i][0] for i in ids},
+            }
+    if last_err:
+        return {"ok": False, "ids": [], "error": last_err}
+    return {"ok": True, "ids": [], "baudrate": None}
+
+
+def scan_ports(
+    ports: Sequence[str],
+    baudrates: Sequence[int] = AUTO_BAUDRATES,
+    max_id: int = 12,
+    timeout_s: float = 3.0,
+    sessions: Optional[PortSessionManager] = None,
+) -> Dict[str, dict]:
+    """
+    Scan several ports concurrently, one worker per port, all sharing one deadline.
+    Total time is that of the slowest port (bounded by timeout_s), not the sum.
+    Ports still running at the deadline report a timeout error.
+    """
+    sessions = sessions or get_port_sessions()
+    ports = list(dict.fromkeys(ports))
+    if not ports:
+        return {}
+    deadline = time.monotonic() + timeout_s
+    pool = ThreadPoolExecutor(max_workers=len(ports), thread_name_prefix="port-scan")
+    futures = {
+        pool.submit(scan_gello_ids, port, baudrates[0], sessions, baudrates, max_id, deadline): port
+        for port in ports
+    }
+    done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    # Do not block on stragglers; they finish in the background and release their port
+    pool.shutdown(wait=False)
+    results: Dict[str, dict] = {}
+    for fut, port in futures.items():
+        if fut in done:
+            try:
+                results[port] = fut.result()
+            except Exception as e:
+                results[port] = {"ok": False, "ids": [], "error": str(e)}
+        else:
+            results[port] = {"ok": False, "ids": [], "error": "扫描超时"}
+    return results
 
 
 def parse_ids_param(ids: str) -> Optional[Tuple[int, ...]]:
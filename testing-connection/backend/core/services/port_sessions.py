@@ -0,0 +1,221 @@
+"""
+Port Session Manager: keep Dynamixel serial ports open between API requests.
+Each port has one PortHandler/PacketHandler pair, a lock that serializes bus access,
+and an idle timer; a reaper thread closes sessions nobody has used for idle_timeout_s.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class PortSessionError(RuntimeError):
+    """Port could not be opened or configured; message is user-facing."""
+
+
+class PortSession:
+    """An open port. Only use port_handler/packet_handler inside PortSessionManager.session()."""
+
+    def __init__(self, port: str, port_handler: Any, packet_handler: Any, baudrate: int, now: float):
+        self.port = port
+        self.port_handler = port_handler
+        self.packet_handler = packet_handler
+        self.baudrate = baudrate
+        self.lock = threading.Lock()
+        self.opened_at = now
+        self.last_used = now
+        self.uses = 0
+        # Per-port helpers built once and reused while the port stays open (e.g. sync-read groups)
+        self.cache: Dict[Any, Any] = {}
+
+    def close(self) -> None:
+        try:
+            self.port_handler.closePort()
+        except Exception:
+            pass
+
+
+class PortSessionManager:
+    """
+    Pool of open serial ports keyed by device path.
+    session() opens the port on first use (or re-sets the baud rate), holds the port's
+    lock for the duration of the block and refreshes its idle timer. An exception inside
+    the block closes the session so the next request starts from a clean open.
+    """
+
+    def __init__(self, idle_timeout_s: float = 10.0, clock: Callable[[], float] = time.monotonic):
+        self._idle_timeout_s = idle_timeout_s
+        self._clock = clock
+        self._sessions: Dict[str, PortSession] = {}
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._reused = 0
+        self._evicted = 0
+        self._reaper: Optional[threading.Thread] = None
+
+    @contextmanager
+    def session(self, port: str, baudrate: int = 57600) -> Iterator[PortSession]:
+        sess = self._acquire(port, baudrate)
+        try:
+            yield sess
+        except Exception:
+            self._discard(sess)
+            raise
+        finally:
+            sess.last_used = self._clock()
+            sess.lock.release()
+
+    def _acquire(self, port: str, baudrate: int) -> PortSession:
+        """Return the port's session with its lock held, opening the port if needed."""
+        while True:
+            with self._lock:
+                sess = self._sessions.get(port)
+            if sess is None:
+                sess = self._open(port, baudrate)
+                with self._lock:
+                    if port in self._sessions:
+                        # Lost a race with another opener; use theirs
+                        sess.close()
+                        continue
+                    self._sessions[port] = sess
+                    self._opened += 1
+                self._ensure_reaper()
+            else:
+                with self._lock:
+                    self._reused += 1
+            sess.lock.acquire()
+            with self._lock:
+                current = self._sessions.get(port)
+            if current is not sess:
+                # Evicted or released while we waited for the lock
+                sess.lock.release()
+                continue
+            if sess.baudrate != baudrate:
+                if not sess.port_handler.setBaudRate(baudrate):
+                    sess.lock.release()
+                    self._discard(sess)
+                    raise PortSessionError("设置波特率失败")
+                sess.baudrate = baudrate
+            sess.uses += 1
+            return sess
+
+    def _open(self, port: str, baudrate: int) -> PortSession:
+        try:
+            from dynamixel_sdk.port_handler import PortHandler
+            from dynamixel_sdk.packet_handler import PacketHandler
+        except ImportError as e:
+            raise PortSessionError(f"dynamixel-sdk 未安装: {e}")
+        ph = PortHandler(port)
+        pk = PacketHandler(2.0)
+        try:
+            if not ph.openPort():
+                raise PortSessionError(f"无法打开串口 {port}")
+            if not ph.setBaudRate(baudrate):
+                ph.closePort()
+                raise PortSessionError("设置波特率失败")
+        except PortSessionError:
+            raise
+        except Exception as e:
+            try:
+                ph.closePort()
+            except Exception:
+                pass
+            raise PortSessionError(str(e))
+        return PortSession(port, ph, pk, baudrate, self._clock())
+
+    def _discard(self, sess: PortSession) -> None:
+        with self._lock:
+            if self._sessions.get(sess.port) is sess:
+                del self._sessions[sess.port]
+        sess.close()
+
+    def release(self, port: Optional[str]) -> bool:
+        """Close the port's session (waits for an in-flight request). True if one was open."""
+        if not port:
+            return False
+        with self._lock:
+            sess = self._sessions.pop(port, None)
+        if sess is None:
+            return False
+        with sess.lock:
+            sess.close()
+        return True
+
+    def release_all(self) -> None:
+        with self._lock:
+            ports = list(self._sessions)
+        for port in ports:
+            self.release(port)
+
+    def evict_idle(self) -> int:
+        """Close sessions idle for longer than idle_timeout_s. Returns how many were closed."""
+        now = self._clock()
+        with self._lock:
+            idle = [s for s in self._sessions.values() if now - s.last_used >= self._idle_timeout_s]
+        closed = 0
+        for sess in idle:
+            # Skip sessions that are in use right now; they are not idle
+            if not sess.lock.acquire(blocking=False):
+                continue
+            try:
+                if self._clock() - sess.last_used < self._idle_timeout_s:
+                    continue
+                with self._lock:
+                    if self._sessions.get(sess.port) is not sess:
+                        continue
+                    del self._sessions[sess.port]
+                    self._evicted += 1
+                sess.close()
+                closed += 1
+            finally:
+                sess.lock.release()
+        return closed
+
+    def _ensure_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap, name="port-session-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        interval = max(0.05, self._idle_timeout_s / 2.0)
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+            with self._lock:
+                if not self._sessions:
+                    self._reaper = None
+                    return
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            sessions = [
+                {
+                    "port": s.port,
+                    "baudrate": s.baudrate,
+                    "uses": s.uses,
+                    "idle_s": now - s.last_used,
+                    "age_s": now - s.opened_at,
+                }
+                for s in self._sessions.values()
+            ]
+            return {
+                "idle_timeout_s": self._idle_timeout_s,
+                "opened": self._opened,
+                "reused": self._reused,
+                "evicted": self._evicted,
+                "sessions": sessions,
+            }
+
+
+_default_sessions: Optional[PortSessionManager] = None
+
+
+def get_port_sessions() -> PortSessionManager:
+    """Process-wide PortSessionManager."""
+    global _default_sessions
+    if _default_sessions is None:
+        _default_sessions = PortSessionManager()
+    return _default_sessions
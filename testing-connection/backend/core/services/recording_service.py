@@ -0,0 +1,99 @@
+"""
+Recording Service: start/stop full-rate episode recording of the running teleop.
+Recorder is attached to the teleop strategy; files go under base_dir/<episode name>/.
+"""
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..episode_store import DATA_FILE, EpisodeReader
+from ..events import Event, EventBus, EventType, get_event_bus
+from ..recorder import EpisodeRecorder
+from .teleop_service import TeleopService
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+class RecordingService:
+    """Owns the active EpisodeRecorder and hands it to TeleopService."""
+
+    def __init__(
+        self,
+        teleop_service: TeleopService,
+        base_dir: str = "recordings",
+        event_bus: Optional[EventBus] = None,
+    ):
+        self._teleop_service = teleop_service
+        self._base_dir = base_dir
+        self._event_bus = event_bus or get_event_bus()
+        self._recorder: Optional[EpisodeRecorder] = None
+        self._last_status: Optional[Dict[str, Any]] = None
+
+    @property
+    def base_dir(self) -> str:
+        return self._base_dir
+
+    def episode_dir(self, name: str) -> Optional[str]:
+        """Directory of a named episode, or None if the name is invalid."""
+        if not _NAME_RE.match(name or "") or name.startswith("."):
+            return None
+        return os.path.join(self._base_dir, name)
+
+    def start(self, name: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """Start recording. Returns (ok, error_message)."""
+        if self._recorder is not None and self._recorder.active:
+            return False, "录制已在进行"
+        name = name or time.strftime("episode_%Y%m%d_%H%M%S")
+        directory = self.episode_dir(name)
+        if directory is None:
+            return False, f"无效的录制名称: {name}"
+        if os.path.exists(directory):
+            return False, f"录制 '{name}' 已存在"
+        self._recorder = EpisodeRecorder(directory, metadata={"name": name})
+        self._teleop_service.set_recorder(self._recorder)
+        self._event_bus.publish(Event(EventType.RECORDING_STARTED, {"name": name}))
+        return True, None
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop recording; returns the final status."""
+        recorder = self._recorder
+        if recorder is None:
+            return self.get_status()
+        self._teleop_service.set_recorder(None)
+        self._last_status = recorder.close()
+        self._recorder = None
+        self._event_bus.publish(Event(EventType.RECORDING_STOPPED, dict(self._last_status)))
+        return self._last_status
+
+    def get_status(self) -> Dict[str, Any]:
+        if self._recorder is not None:
+            return self._recorder.get_status()
+        if self._last_status is not None:
+            return self._last_status
+        return {"active": False}
+
+    def list_episodes(self) -> List[Dict[str, Any]]:
+        """Recorded episodes with row count and duration."""
+        if not os.path.isdir(self._base_dir):
+            return []
+        out = []
+        for name in sorted(os.listdir(self._base_dir)):
+            directory = os.path.join(self._base_dir, name)
+            if not os.path.exists(os.path.join(directory, DATA_FILE)):
+                continue
+            try:
+                reader = EpisodeReader(directory)
+                t = reader.column("t")
+                out.append({
+                    "name": name,
+                    "rows": reader.num_rows,
+                    "duration_s": float(t[-1] - t[0]) if len(t) else 0.0,
+                    "n_leader": reader.n_leader,
+                    "n_follower": reader.n_follower,
+                })
+                del t
+                reader.close()
+            except Exception as e:
+                out.append({"name": name, "error": str(e)})
+        return out
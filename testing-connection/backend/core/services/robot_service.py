@@ -3,11 +3,13 @@ Robot Service: encapsulates robot testing logic.
 Uses dependency injection; no direct ZMQ/serial coupling in service.
 """
 import pickle
-from typing import Any, Callable, Dict, Optional
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import zmq
 
 from ..events import Event, EventBus, EventType, get_event_bus
+from .zmq_pool import ZmqSocketPool
 
 
 class RobotService:
@@ -16,8 +18,20 @@ class RobotService:
     Depends on injected request function (Strategy) - can be ZMQ or mock.
     """
 
-    def __init__(self, event_bus: Optional[EventBus] = None):
+    def __init__(self, event_bus: Optional[EventBus] = None, zmq_pool: Optional[ZmqSocketPool] = None):
         self._event_bus = event_bus or get_event_bus()
+        self._zmq_pool = zmq_pool or ZmqSocketPool()
+        # (host, port) -> negotiated wire format ("wire" / "pickle")
+        self._formats: Dict[Tuple[str, int], str] = {}
+        self._formats_lock = threading.Lock()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """ZMQ socket pool: hits/misses, timeouts, recreated sockets, RTT and wire format per endpoint."""
+        stats = self._zmq_pool.get_stats()
+        with self._formats_lock:
+            for ep in stats["endpoints"]:
+                ep["wire_format"] = self._formats.get((ep["host"], ep["port"]))
+        return stats
 
     def test_zmq_connection(self, host: str, port: int) -> Dict[str, Any]:
         """Test ZMQ connection to robot server."""
@@ -48,17 +62,26 @@ class RobotService:
                 out[k] = v
         return out
 
-    @staticmethod
-    def _zmq_request(host: str, port: int, method: str, args: Optional[dict] = None) -> Any:
-        ctx = zmq.Context()
-        sock = ctx.socket(zmq.REQ)
-        sock.setsockopt(zmq.RCVTIMEO, 3000)
-        sock.setsockopt(zmq.LINGER, 0)
+    def _zmq_request(self, host: str, port: int, method: str, args: Optional[dict] = None) -> Any:
+        from lib.zmq_wire import FORMAT_PICKLE, FORMAT_WIRE, decode_reply, encode_request, negotiation_request
+
+        key = (host, int(port))
+        with self._formats_lock:
+            fmt = self._formats.get(key)
+        if fmt == FORMAT_WIRE:
+            payload = encode_request(method, args)
+        elif fmt == FORMAT_PICKLE:
+            payload = pickle.dumps({"method": method, "args": args or {}})
+        else:
+            payload = negotiation_request(method, args)
         try:
-            sock.connect(f"tcp://{host}:{port}")
-            req = {"method": method, "args": args or {}}
-            sock.send(pickle.dumps(req))
-            return pickle.loads(sock.recv())
-        finally:
-            sock.close()
-            ctx.term()
+            frame = self._zmq_pool.request(host, port, payload, copy=False)
+        except zmq.Again:
+            # The server may have been restarted as a different version; renegotiate next time
+            with self._formats_lock:
+                self._formats.pop(key, None)
+            raise
+        result, detected = decode_reply(frame.buffer, allow_pickle=fmt != FORMAT_WIRE)
+        with self._formats_lock:
+            self._formats[key] = detected
+        return result
@@ -0,0 +1,151 @@
+"""
+Teleop Stream Service: push teleop state to dashboards over Server-Sent Events.
+Observer on TELEOP_STATE_UPDATED; each client gets a drop-oldest backlog and a rate cap.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from ..events import Event, EventBus, EventType, OverflowPolicy, get_event_bus
+from ..interfaces import StateProvider
+
+
+class _StreamClient:
+    """Per-connection backlog. push() runs on the publisher thread, drain() on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_hz: float, backlog: int):
+        self.loop = loop
+        self.min_interval = 1.0 / max_hz if max_hz > 0 else 0.0
+        self.buffer: deque = deque(maxlen=max(1, backlog))
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        self.sent_messages = 0
+        self.sent_samples = 0
+        self._signaled = False
+
+    def push(self, item: Dict[str, Any]) -> None:
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(item)
+        # Wake the consumer at most once per drain, not once per sample
+        if not self._signaled:
+            self._signaled = True
+            try:
+                self.loop.call_soon_threadsafe(self.wakeup.set)
+            except RuntimeError:
+                pass
+
+    def drain(self) -> list:
+        self.wakeup.clear()
+        self._signaled = False
+        items = []
+        while self.buffer:
+            items.append(self.buffer.popleft())
+        return items
+
+
+class TeleopStreamService:
+    """
+    Fan-out of teleop state events to streaming clients.
+    Samples are batched: every message carries all samples since the previous one,
+    so a client capped at max_hz still sees the full loop rate.
+    """
+
+    HEARTBEAT_S = 15.0
+
+    def __init__(self, state_provider: StateProvider, event_bus: Optional[EventBus] = None):
+        self._state_provider = state_provider
+        self._event_bus = event_bus or get_event_bus()
+        self._clients: Set[_StreamClient] = set()
+        self._lock = threading.Lock()
+        # One subscription keeps state and start/stop events in order
+        self._event_bus.subscribe_all(self._on_event, queue_size=1024, overflow=OverflowPolicy.DROP_OLDEST)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _broadcast(self, item: Dict[str, Any]) -> None:
+        # Copy under lock so clients can (dis)connect while events are being delivered
+        with self._lock:
+            clients = tuple(self._clients)
+        for client in clients:
+            client.push(item)
+
+    def _on_event(self, event: Event) -> None:
+        if event.type == EventType.TELEOP_STATE_UPDATED:
+            self._on_state(event)
+        elif event.type in (EventType.TELEOP_STARTED, EventType.TELEOP_STOPPED):
+            self._on_status(event)
+
+    def _on_state(self, event: Event) -> None:
+        snapshot = event.payload.get("snapshot")
+        if snapshot is None or not self._clients:
+            return
+        # JSON-ready conversion happens here, once per event, off the control thread
+        self._broadcast(snapshot.to_dict())
+
+    def _on_status(self, event: Event) -> None:
+        self._broadcast({"timestamp": time.time(), "running": event.type == EventType.TELEOP_STARTED})
+
+    async def stream(
+        self,
+        max_hz: float = 30.0,
+        backlog: int = 256,
+        is_disconnected: Optional[Callable[[], Any]] = None,
+    ) -> AsyncIterator[str]:
+        """SSE generator. Yields 'state' messages of the form {running, samples, dropped}."""
+        client = _StreamClient(asyncio.get_running_loop(), max_hz, backlog)
+        with self._lock:
+            self._clients.add(client)
+        try:
+            initial = self._state_provider.get_state()
+            yield self._format("state", {
+                "running": initial.get("running", False),
+                "samples": [{
+                    "seq": initial.get("seq", 0),
+                    "timestamp": initial.get("timestamp", 0.0),
+                    "leader_joints": initial.get("leader_joints", []),
+                    "follower_obs": initial.get("follower_obs", {}),
+                    "error": initial.get("error"),
+                }],
+                "dropped": 0,
+            })
+            running = bool(initial.get("running", False))
+            next_send = 0.0
+            while True:
+                try:
+                    await asyncio.wait_for(client.wakeup.wait(), timeout=self.HEARTBEAT_S)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                delay = next_send - client.loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                items = client.drain()
+                next_send = client.loop.time() + client.min_interval
+                samples = []
+                for item in items:
+                    if "running" in item:
+                        running = item["running"]
+                    else:
+                        samples.append(item)
+                client.sent_messages += 1
+                client.sent_samples += len(samples)
+                yield self._format("state", {
+                    "running": running,
+                    "samples": samples,
+                    "dropped": client.dropped,
+                })
+        finally:
+            with self._lock:
+                self._clients.discard(client)
+
+    @staticmethod
+    def _format(event: str, data: Dict[str, Any]) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
@@ -5,8 +5,16 @@ Uses EventBus for observer notifications; StateProvider for polling.
 import threading
 from typing import Any, Dict, Optional, Tuple
 
+from ..device_registry import DeviceRegistry, get_device_registry
 from ..events import EventBus, get_event_bus
-from ..strategies.teleop_strategies import BaseTeleopStrategy, TeleopStrategyFactory
+from ..recorder import EpisodeRecorder
+from ..strategies.teleop_strategies import (
+    ZMQ_CLIENTS,
+    BaseTeleopStrategy,
+    ReplayTeleopStrategy,
+    TeleopStrategyFactory,
+)
+from .port_sessions import PortSessionManager, get_port_sessions
 
 
 class StartTeleopCommand:
@@ -20,6 +28,7 @@ class StartTeleopCommand:
         robot_usb_port: Optional[str] = None,
         robot_can_channel: Optional[str] = None,
         event_bus: Optional[EventBus] = None,
+        device_registry: Optional[DeviceRegistry] = None,
     ):
         self._gello_port = gello_port
         self._robot_host = robot_host
@@ -27,17 +36,16 @@ class StartTeleopCommand:
         self._robot_usb_port = robot_usb_port
         self._robot_can_channel = robot_can_channel
         self._event_bus = event_bus or get_event_bus()
+        self._registry = device_registry or get_device_registry()
 
     def execute(self) -> Tuple[bool, Optional[str]]:
         # Validation
-        try:
-            from serial.tools import list_ports
-            avail = [p.device for p in list_ports.comports()]
-        except Exception:
-            avail = []
-        if self._gello_port not in avail:
+        registry = self._registry
+        if not registry.has(self._gello_port):
+            avail = registry.devices()
             return False, f"GELLO 串口 '{self._gello_port}' 不存在。当前可用: {', '.join(avail) or '无'}。"
-        if self._robot_usb_port and self._robot_usb_port.upper() != "SAME" and self._robot_usb_port not in avail:
+        if self._robot_usb_port and self._robot_usb_port.upper() != "SAME" and not registry.has(self._robot_usb_port):
+            avail = registry.devices()
             return False, (
                 f"机械臂串口 '{self._robot_usb_port}' 不存在。当前可用: {', '.join(avail) or '无'}。"
                 "若 GELLO 与机械臂在同一总线，请将机械臂串口选为与 GELLO 相同以使用单口模式。"
@@ -60,10 +68,26 @@ class TeleopService:
     Observer: publishes events; API polls state via get_state().
     """
 
-    def __init__(self, event_bus: Optional[EventBus] = None):
+    def __init__(
+        self,
+        event_bus: Optional[EventBus] = None,
+        port_sessions: Optional[PortSessionManager] = None,
+        device_registry: Optional[DeviceRegistry] = None,
+    ):
         self._event_bus = event_bus or get_event_bus()
+        self._port_sessions = port_sessions or get_port_sessions()
+        self._registry = device_registry or get_device_registry()
         self._strategy: Optional[BaseTeleopStrategy] = None
+        # Kept after stop() so the final loop/replay numbers stay readable
+        self._last_strategy: Optional[BaseTeleopStrategy] = None
         self._thread: Optional[threading.Thread] = None
+        self._recorder: Optional[EpisodeRecorder] = None
+
+    def set_recorder(self, recorder: Optional[EpisodeRecorder]) -> None:
+        """Attach a recorder to the running strategy and to strategies started later."""
+        self._recorder = recorder
+        if self._strategy:
+            self._strategy.attach_recorder(recorder)
 
     @property
     def is_running(self) -> bool:
@@ -76,15 +100,37 @@ class TeleopService:
         robot_port: int = 6001,
         robot_usb_port: Optional[str] = None,
         robot_can_channel: Optional[str] = None,
+        follower_read_every: int = 1,
+        zmq_client: str = "sync",
     ) -> Tuple[bool, Optional[str]]:
-        """Start teleop. Returns (ok, error_message)."""
+        """
+        Start teleop. Returns (ok, error_message).
+        follower_read_every: shared-bus only, read follower feedback every N ticks.
+        zmq_client: ZMQ only, "sync" (REQ) or "async" (pipelined DEALER with per-request deadlines).
+        """
         if self.is_running:
             return False, "遥操作已在运行"
-        cmd = StartTeleopCommand(gello_port, robot_host, robot_port, robot_usb_port, robot_can_channel, self._event_bus)
+        cmd = StartTeleopCommand(
+            gello_port, robot_host, robot_port, robot_usb_port, robot_can_channel, self._event_bus, self._registry
+        )
         ok, err = cmd.execute()
         if not ok:
             return False, err
-        strategy = TeleopStrategyFactory.create(gello_port, robot_usb_port, robot_can_channel)
+        if follower_read_every < 1:
+            return False, "follower_read_every 必须 >= 1"
+        if zmq_client not in ZMQ_CLIENTS:
+            return False, f"zmq_client 必须是 {' / '.join(ZMQ_CLIENTS)}"
+        strategy = TeleopStrategyFactory.create(
+            gello_port,
+            robot_usb_port,
+            robot_can_channel,
+            follower_read_every=follower_read_every,
+            zmq_client=zmq_client,
+        )
+        strategy.attach_recorder(self._recorder)
+        # Teleop opens the ports itself; close pooled API sessions first
+        self._port_sessions.release(gello_port)
+        self._port_sessions.release(robot_usb_port)
         self._strategy = strategy
         self._thread = threading.Thread(
             target=strategy.run,
@@ -95,10 +141,36 @@ class TeleopService:
         self._thread.start()
         return True, None
 
+    def start_replay(
+        self,
+        episode_dir: str,
+        speed: float = 1.0,
+        robot_host: str = "127.0.0.1",
+        robot_port: int = 6001,
+        robot_usb_port: Optional[str] = None,
+        robot_can_channel: Optional[str] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """Replay a recorded episode on the follower. Returns (ok, error_message)."""
+        if self.is_running:
+            return False, "遥操作已在运行"
+        if speed < 0:
+            return False, "speed 不能为负"
+        strategy = ReplayTeleopStrategy(episode_dir, speed=speed, event_bus=self._event_bus)
+        self._port_sessions.release(robot_usb_port)
+        self._strategy = strategy
+        self._thread = threading.Thread(
+            target=strategy.run,
+            args=("", robot_host, robot_port, robot_usb_port, robot_can_channel),
+            daemon=True,
+        )
+        self._thread.start()
+        return True, None
+
     def stop(self) -> None:
         """Stop teleop."""
         if self._strategy:
             self._strategy.stop()
+            self._last_strategy = self._strategy
             self._strategy = None
         self._thread = None
 
@@ -108,7 +180,26 @@ class TeleopService:
             return self._strategy.get_state()
         return {
             "running": False,
+            "seq": 0,
+            "timestamp": 0.0,
             "leader_joints": [],
             "follower_obs": {},
             "error": None,
+            "loop": {},
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get per-phase loop latency metrics of the running strategy. When stopped,
+        last_run holds the final metrics of the previous run (including replay stats).
+        """
+        if self._strategy:
+            return self._strategy.get_metrics()
+        last = self._last_strategy
+        return {
+            "running": False,
+            "loop": {},
+            "tick": {},
+            "phases": {},
+            "last_run": last.get_metrics() if last is not None else None,
         }
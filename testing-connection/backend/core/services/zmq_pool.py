@@ -0,0 +1,158 @@
+"""
+ZMQ Socket Pool: reuse REQ sockets per (host, port) on one shared context.
+Lazy Pirate recovery: a request that times out closes its socket (a REQ socket that
+missed a reply cannot send again) and is retried on a fresh one; the broken socket
+never goes back to the pool.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import zmq
+
+from ..metrics import LatencyHistogram
+
+Endpoint = Tuple[str, int]
+
+
+class _EndpointStats:
+    __slots__ = ("hits", "misses", "timeouts", "errors", "recreated", "rtt")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.recreated = 0
+        self.rtt = LatencyHistogram()
+
+
+class ZmqSocketPool:
+    """
+    Idle REQ sockets per endpoint. request() checks one out (exclusive to the caller),
+    sends, polls for the reply and checks it back in. Sockets idle for longer than
+    idle_timeout_s are closed on the next checkout/checkin of that endpoint.
+    """
+
+    def __init__(
+        self,
+        context: Optional[zmq.Context] = None,
+        timeout_ms: int = 1500,
+        retries: int = 1,
+        max_idle_per_endpoint: int = 4,
+        idle_timeout_s: float = 60.0,
+    ):
+        self._context = context or zmq.Context.instance()
+        self._timeout_ms = timeout_ms
+        self._retries = retries
+        self._max_idle = max_idle_per_endpoint
+        self._idle_timeout_s = idle_timeout_s
+        self._idle: Dict[Endpoint, Deque[Tuple[zmq.Socket, float]]] = {}
+        self._stats: Dict[Endpoint, _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint_stats(self, key: Endpoint) -> _EndpointStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _EndpointStats()
+        return stats
+
+    def _new_socket(self, key: Endpoint) -> zmq.Socket:
+        sock = self._context.socket(zmq.REQ)
+        sock.setsockopt(zmq.LINGER, 0)
+        sock.connect(f"tcp://{key[0]}:{key[1]}")
+        return sock
+
+    def _checkout(self, key: Endpoint) -> zmq.Socket:
+        now = time.monotonic()
+        stale = []
+        sock = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used > self._idle_timeout_s:
+                    stale.append(candidate)
+                    continue
+                sock = candidate
+                break
+            stats = self._endpoint_stats(key)
+            if sock is not None:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+        for s in stale:
+            s.close()
+        return sock if sock is not None else self._new_socket(key)
+
+    def _checkin(self, key: Endpoint, sock: zmq.Socket) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self._max_idle:
+                idle.append((sock, time.monotonic()))
+                return
+        sock.close()
+
+    def request(
+        self, host: str, port: int, payload: bytes, timeout_ms: Optional[int] = None, copy: bool = True
+    ) -> Any:
+        """
+        Send payload, return the reply (bytes, or a zmq.Frame when copy=False).
+        Raises zmq.Again after retries+1 timed-out attempts.
+        """
+        key = (host, int(port))
+        timeout = self._timeout_ms if timeout_ms is None else timeout_ms
+        sock = self._checkout(key)
+        attempt = 0
+        while True:
+            t0 = time.perf_counter()
+            try:
+                sock.send(payload)
+                if sock.poll(timeout, zmq.POLLIN):
+                    reply = sock.recv(copy=copy)
+                    rtt = time.perf_counter() - t0
+                    with self._lock:
+                        self._endpoint_stats(key).rtt.record(rtt)
+                    self._checkin(key, sock)
+                    return reply
+            except zmq.ZMQError:
+                sock.close()
+                with self._lock:
+                    self._endpoint_stats(key).errors += 1
+                raise
+            # Timed out: this REQ socket is stuck waiting for a reply, replace it
+            sock.close()
+            with self._lock:
+                stats = self._endpoint_stats(key)
+                stats.timeouts += 1
+                if attempt < self._retries:
+                    stats.recreated += 1
+            if attempt >= self._retries:
+                raise zmq.Again(f"no reply from tcp://{host}:{port} within {timeout} ms")
+            attempt += 1
+            sock = self._new_socket(key)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for sockets in idle.values():
+            for sock, _ in sockets:
+                sock.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = []
+            for (host, port), s in self._stats.items():
+                endpoints.append({
+                    "host": host,
+                    "port": port,
+                    "idle_sockets": len(self._idle.get((host, port), ())),
+                    "hits": s.hits,
+                    "misses": s.misses,
+                    "timeouts": s.timeouts,
+                    "recreated": s.recreated,
+                    "errors": s.errors,
+                    "rtt_ms": s.rtt.percentiles(),
+                })
+        return {"timeout_ms": self._timeout_ms, "retries": self._retries, "endpoints": endpoints}
@@ -0,0 +1,170 @@
+"""
+Tear-free teleop state storage: preallocated numeric buffers guarded by a sequence counter.
+One writer (the control thread) and any number of readers; readers never block the writer.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+from lib.state_estimator import JointStateEstimator
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Consistent copy of one tick. JSON conversion happens only in to_dict()."""
+    seq: int
+    timestamp: float
+    leader_joints: np.ndarray
+    joint_positions: np.ndarray
+    joint_velocities: np.ndarray
+    ee_pos_quat: np.ndarray
+    gripper_position: float
+    has_follower: bool
+    error: Optional[str]
+
+    def follower_obs(self) -> Dict[str, Any]:
+        if not self.has_follower:
+            return {}
+        return {
+            "joint_positions": self.joint_positions.tolist(),
+            "joint_velocities": self.joint_velocities.tolist(),
+            "ee_pos_quat": self.ee_pos_quat.tolist(),
+            "gripper_position": float(self.gripper_position),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "timestamp": self.timestamp,
+            "leader_joints": self.leader_joints.tolist(),
+            "follower_obs": self.follower_obs(),
+            "error": self.error,
+        }
+
+
+def _copy_into(dst: np.ndarray, src: Any) -> int:
+    """Copy src (list or array) into the head of dst; returns the number of values written."""
+    if src is None:
+        return 0
+    try:
+        n = min(len(src), dst.shape[0])
+    except TypeError:
+        dst[0] = float(src)
+        return 1
+    if n:
+        dst[:n] = src[:n]
+    return n
+
+
+def _scalar(v: Any) -> float:
+    if v is None:
+        return 0.0
+    try:
+        return float(v)
+    except TypeError:
+        return float(v[0]) if len(v) else 0.0
+
+
+class TeleopStateBuffer:
+    """
+    Seqlock-style state store.
+    The writer makes seq odd, updates the buffers in place, then makes it even again.
+    A reader copies the buffers and retries if seq was odd or changed meanwhile, so
+    leader joints and follower obs in a snapshot always come from the same tick.
+    """
+
+    MAX_JOINTS = 16
+    EE_LEN = 7
+
+    def __init__(self, max_joints: int = MAX_JOINTS):
+        self._leader = np.zeros(max_joints, dtype=np.float64)
+        self._positions = np.zeros(max_joints, dtype=np.float64)
+        self._velocities = np.zeros(max_joints, dtype=np.float64)
+        self._ee = np.zeros(self.EE_LEN, dtype=np.float64)
+        self._n_leader = 0
+        self._n_positions = 0
+        self._n_velocities = 0
+        self._n_ee = 0
+        # Velocities for bare joint-state writes, estimated from successive positions
+        self._velocity_estimator = JointStateEstimator()
+        self._gripper = 0.0
+        self._has_follower = False
+        self._error: Optional[str] = None
+        self._timestamp = 0.0
+        self._seq = 0
+
+    @property
+    def seq(self) -> int:
+        return self._seq // 2
+
+    def write(
+        self, leader: Any, follower: Any, error: Optional[str] = None, sample_time: Optional[float] = None
+    ) -> int:
+        """
+        Store one tick. follower is an observation mapping (joint_positions, ...)
+        or a joint-position array; an empty mapping/None clears the follower.
+        For an array, velocities are estimated from the previous arrays; sample_time is
+        when it was read (monotonic, default now; an unchanged time means a repeated sample).
+        Returns the new snapshot seq.
+        """
+        bare = follower is not None and not isinstance(follower, Mapping)
+        if bare:
+            velocities = self._velocity_estimator.update(follower, t=sample_time)
+        else:
+            self._velocity_estimator.reset()
+        self._seq += 1
+        self._n_leader = _copy_into(self._leader, leader)
+        if follower is None or (isinstance(follower, Mapping) and not follower):
+            self._has_follower = False
+            self._n_positions = self._n_velocities = self._n_ee = 0
+            self._gripper = 0.0
+        elif isinstance(follower, Mapping):
+            self._has_follower = True
+            self._n_positions = _copy_into(self._positions, follower.get("joint_positions"))
+            self._n_velocities = _copy_into(self._velocities, follower.get("joint_velocities"))
+            self._n_ee = _copy_into(self._ee, follower.get("ee_pos_quat"))
+            self._gripper = _scalar(follower.get("gripper_position"))
+        else:
+            # Bare joint state: positions plus estimated velocities, gripper is the last joint
+            self._has_follower = True
+            n = _copy_into(self._positions, follower)
+            self._n_positions = n
+            self._n_velocities = _copy_into(self._velocities, velocities)
+            self._ee[:] = 0.0
+            self._n_ee = self.EE_LEN
+            self._gripper = float(self._positions[n - 1]) if n else 0.0
+        self._error = error
+        self._timestamp = time.time()
+        self._seq += 1
+        return self._seq // 2
+
+    def write_error(self, error: Optional[str]) -> int:
+        """Update only the error; joints keep their last values."""
+        self._seq += 1
+        self._error = error
+        self._timestamp = time.time()
+        self._seq += 1
+        return self._seq // 2
+
+    def read(self) -> StateSnapshot:
+        """Consistent snapshot with a monotonically increasing seq."""
+        while True:
+            seq = self._seq
+            if seq & 1:
+                time.sleep(0)
+                continue
+            snap = StateSnapshot(
+                seq=seq // 2,
+                timestamp=self._timestamp,
+                leader_joints=self._leader[:self._n_leader].copy(),
+                joint_positions=self._positions[:self._n_positions].copy(),
+                joint_velocities=self._velocities[:self._n_velocities].copy(),
+                ee_pos_quat=self._ee[:self._n_ee].copy(),
+                gripper_position=self._gripper,
+                has_follower=self._has_follower,
+                error=self._error,
+            )
+            if self._seq == seq:
+                return snap
@@ -4,35 +4,21 @@ Each strategy encapsulates its own loop and resource management.
 """
 import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
+import numpy as np
+
+from ..device_registry import get_device_registry
 from ..events import Event, EventBus, EventType, get_event_bus
 from ..interfaces import StateProvider
+from ..metrics import LatencyHistogram, LoopMetrics
+from ..recorder import EpisodeRecorder
+from ..scheduler import RateScheduler, sleep_until
+from ..state_buffer import StateSnapshot, TeleopStateBuffer
 
 
-def _to_json_serializable(obj: Any) -> Any:
-    if hasattr(obj, "tolist"):
-        return obj.tolist()
-    if hasattr(obj, "item"):
-        return obj.item()
-    if isinstance(obj, dict):
-        return {k: _to_json_serializable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_to_json_serializable(x) for x in obj]
-    return obj
-
-
-def _obs_from_joint_state(joint_state) -> Dict[str, Any]:
-    arr = joint_state.tolist() if hasattr(joint_state, "tolist") else list(joint_state)
-    n = len(arr)
-    jp = arr
-    gp = arr[-1] if n > 0 else 0.0
-    return {
-        "joint_positions": jp,
-        "joint_velocities": [0.0] * n,
-        "ee_pos_quat": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
-        "gripper_position": gp,
-    }
+# Timed stages of one teleop tick, in loop order
+TELEOP_PHASES = ("leader_read", "follower_command", "follower_read", "snapshot", "record", "publish")
 
 
 class BaseTeleopStrategy(StateProvider):
@@ -41,32 +27,103 @@ class BaseTeleopStrategy(StateProvider):
     def __init__(self, event_bus: Optional[EventBus] = None):
         self._event_bus = event_bus or get_event_bus()
         self._running = False
-        self._leader_joints: List[float] = []
-        self._follower_obs: Dict[str, Any] = {}
-        self._error: Optional[str] = None
-
-    def _update_state(self, leader: List[float], follower: Dict[str, Any], err: Optional[str] = None):
-        self._leader_joints = leader
-        self._follower_obs = _to_json_serializable(follower)
-        self._error = err
+        self._state = TeleopStateBuffer()
+        self._scheduler: Optional[RateScheduler] = None
+        self._metrics = LoopMetrics(TELEOP_PHASES)
+        self._recorder: Optional[EpisodeRecorder] = None
+
+    def _start_scheduler(self, hz: float) -> RateScheduler:
+        """Create the loop scheduler; the first deadline is one period from now."""
+        self._scheduler = RateScheduler(hz)
+        return self._scheduler
+
+    def attach_recorder(self, recorder: Optional[EpisodeRecorder]) -> None:
+        """Record every tick into recorder (None detaches)."""
+        self._recorder = recorder
+
+    def get_loop_stats(self) -> Dict[str, Any]:
+        """Achieved loop rate and jitter (empty before the loop starts)."""
+        return self._scheduler.get_stats() if self._scheduler else {}
+
+    def reset_metrics(self) -> None:
+        """Restart loop stats and phase histograms (e.g. after a warmup)."""
+        if self._scheduler is not None:
+            self._scheduler.reset()
+        self._metrics.reset()
+
+    def _update_state(
+        self, leader: Any, follower: Any, err: Optional[str] = None, sample_time: Optional[float] = None
+    ):
+        """
+        Store one tick: leader joints plus follower obs mapping or bare joint-state array
+        (read at sample_time, monotonic; default now). Values are copied into preallocated
+        buffers; nothing is converted to JSON here.
+        """
+        self._state.write(leader, follower, err, sample_time)
+        self._publish_snapshot(err)
+
+    def _update_error(self, err: str):
+        """Record a loop error while keeping the last leader/follower values."""
+        self._state.write_error(err)
+        self._publish_snapshot(err)
+
+    def _publish_snapshot(self, err: Optional[str]):
+        snapshot = self._state.read()
+        self._metrics.mark("snapshot")
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.push(snapshot)
+            self._metrics.mark("record")
         self._event_bus.publish(Event(
             EventType.TELEOP_STATE_UPDATED,
-            {"leader_joints": self._leader_joints, "follower_obs": self._follower_obs, "error": err},
+            {"seq": snapshot.seq, "timestamp": snapshot.timestamp, "error": err, "snapshot": snapshot},
         ))
         if err:
             self._event_bus.publish(Event(EventType.TELEOP_ERROR, {"error": err}))
+        self._metrics.mark("publish")
+
+    def get_snapshot(self) -> StateSnapshot:
+        """Latest consistent state (numpy copies, no JSON conversion)."""
+        return self._state.read()
 
     def get_state(self) -> Dict[str, Any]:
+        state = self._state.read().to_dict()
+        state["running"] = self._running
+        state["loop"] = self.get_loop_stats()
+        return state
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-phase latency percentiles (ms), tick work time and loop overruns."""
         return {
             "running": self._running,
-            "leader_joints": self._leader_joints,
-            "follower_obs": self._follower_obs,
-            "error": self._error,
+            "loop": self.get_loop_stats(),
+            **self._metrics.get_stats(),
         }
 
 
+ZMQ_CLIENTS = ("sync", "async")
+
+
 class ZMQTeleopStrategy(BaseTeleopStrategy):
-    """Teleop via ZMQ: GELLO reads -> RobotEnv (ZMQ robot)."""
+    """
+    Teleop via ZMQ: GELLO reads -> RobotEnv (ZMQ robot).
+    zmq_client "sync" uses the REQ client; "async" the pipelined DEALER client, whose
+    requests have short deadlines so a slow reply costs one tick instead of stalling the loop.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None, zmq_client: str = "sync"):
+        super().__init__(event_bus)
+        if zmq_client not in ZMQ_CLIENTS:
+            raise ValueError(f"zmq_client must be one of {ZMQ_CLIENTS}")
+        self._zmq_client = zmq_client
+        self._client = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        client = self._client
+        if client is not None and hasattr(client, "get_stats"):
+            metrics["zmq"] = {"client": self._zmq_client, **client.get_stats()}
+        return metrics
 
     def run(
         self,
@@ -80,7 +137,10 @@ class ZMQTeleopStrategy(BaseTeleopStrategy):
         try:
             from lib.gello_agent import GelloAgent
             from lib.robot_env import RobotEnv
-            from lib.zmq_client_robot import ZMQClientRobot
+            if self._zmq_client == "async":
+                from lib.zmq_async_client import AsyncZMQClientRobot as ClientClass
+            else:
+                from lib.zmq_client_robot import ZMQClientRobot as ClientClass
         except ImportError as e:
             self._update_state([], {}, f"lib 导入失败: {e}")
             return
@@ -89,30 +149,46 @@ class ZMQTeleopStrategy(BaseTeleopStrategy):
         try:
             from lib.gello_agent import GENERIC_GELLO_CONFIG
             agent = GelloAgent(port=gello_port, dynamixel_config=GENERIC_GELLO_CONFIG)
-            client = ZMQClientRobot(port=robot_port, host=robot_host)
-            env = RobotEnv(client, control_rate_hz=hz)
+            client = ClientClass(port=robot_port, host=robot_host)
+            self._client = client
+            # Pacing is done by the strategy's scheduler, not by RobotEnv
+            env = RobotEnv(client, control_rate_hz=None)
             self._update_state([], {}, None)
         except Exception as e:
             self._update_state([], {}, str(e))
             return
         self._running = True
         self._event_bus.publish(Event(EventType.TELEOP_STARTED, {"mode": "zmq"}))
-        dt = 1.0 / hz
+        scheduler = self._start_scheduler(hz)
+        obs = None
         try:
             while self._running and agent and env:
+                self._metrics.begin_tick()
                 try:
-                    obs = env.get_obs()
+                    if obs is None:
+                        obs = env.get_obs()
+                        self._metrics.mark("follower_read")
                     action = agent.act(obs)
-                    env.step(action)
+                    self._metrics.mark("leader_read")
+                    # One round trip: command this tick's goal, get the observation for the next tick.
+                    # Timed as follower_command; follower_read only covers the initial get_obs.
+                    obs = env.step(action)
+                    self._metrics.mark("follower_command")
                     self._update_state(
-                        action.tolist() if hasattr(action, "tolist") else list(action),
+                        action,
                         obs,
                         None,
                     )
                 except Exception as e:
-                    self._update_state(self._leader_joints, self._follower_obs, str(e))
-                time.sleep(dt)
+                    obs = None
+                    self._update_error(str(e))
+                self._metrics.end_tick()
+                scheduler.wait()
         finally:
+            try:
+                client.close()
+            except Exception:
+                pass
             self._event_bus.publish(Event(EventType.TELEOP_STOPPED, {}))
 
     def stop(self) -> None:
@@ -120,10 +196,26 @@ class ZMQTeleopStrategy(BaseTeleopStrategy):
 
 
 class USBSharedBusTeleopStrategy(BaseTeleopStrategy):
-    """Single port: GELLO (1-7) and robot (8-14) on same Dynamixel bus."""
+    """
+    Single port: GELLO (1-7) and robot (8-14) on same Dynamixel bus.
+    Each tick reads only the leader IDs, writes the follower goals, and reads the
+    follower IDs every `follower_read_every` ticks (feedback decimation).
+    """
 
     LEADER_IDS = (1, 2, 3, 4, 5, 6, 7)
     FOLLOWER_IDS = (8, 9, 10, 11, 12, 13, 14)
+    BAUDRATE = 57600
+
+    def __init__(self, event_bus: Optional[EventBus] = None, follower_read_every: int = 1):
+        super().__init__(event_bus)
+        self._follower_read_every = max(1, int(follower_read_every))
+        self._bus_usage = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        if self._bus_usage is not None:
+            metrics["bus"] = {**self._bus_usage.get_stats(), "follower_read_every": self._follower_read_every}
+        return metrics
 
     def run(
         self,
@@ -136,12 +228,13 @@ class USBSharedBusTeleopStrategy(BaseTeleopStrategy):
     ) -> None:
         try:
             from dynamixel_sdk import PortHandler, PacketHandler, GroupSyncRead, GroupSyncWrite
-            import numpy as np
+            from lib.dynamixel_codec import SyncReadDecoder, SyncWriteEncoder
+            from lib.dynamixel_timing import BusUsage, sync_read_bytes, sync_write_bytes
         except ImportError as e:
             self._update_state([], {}, f"dynamixel_sdk 未安装: {e}")
             return
         ADDR_PRESENT, ADDR_GOAL, ADDR_TORQUE, LEN_POS = 132, 116, 64, 4
-        BAUDRATE = 57600
+        BAUDRATE = self.BAUDRATE
         ph = PortHandler(gello_port)
         pk = PacketHandler(2.0)
         try:
@@ -157,10 +250,16 @@ class USBSharedBusTeleopStrategy(BaseTeleopStrategy):
                     pk.write1ByteTxRx(ph, dxl_id, ADDR_TORQUE, 1)
                 except Exception:
                     pass
-            group_read = GroupSyncRead(ph, pk, ADDR_PRESENT, LEN_POS)
+            leader_read = GroupSyncRead(ph, pk, ADDR_PRESENT, LEN_POS)
+            follower_read = GroupSyncRead(ph, pk, ADDR_PRESENT, LEN_POS)
             group_write = GroupSyncWrite(ph, pk, ADDR_GOAL, LEN_POS)
-            for dxl_id in list(self.LEADER_IDS) + list(self.FOLLOWER_IDS):
-                group_read.addParam(dxl_id)
+            for dxl_id in self.LEADER_IDS:
+                leader_read.addParam(dxl_id)
+            for dxl_id in self.FOLLOWER_IDS:
+                follower_read.addParam(dxl_id)
+            leader_codec = SyncReadDecoder(leader_read, self.LEADER_IDS, ADDR_PRESENT, LEN_POS)
+            follower_codec = SyncReadDecoder(follower_read, self.FOLLOWER_IDS, ADDR_PRESENT, LEN_POS)
+            goal_codec = SyncWriteEncoder(group_write, self.FOLLOWER_IDS)
             self._update_state([], {}, None)
         except Exception as e:
             self._update_state([], {}, str(e))
@@ -169,56 +268,55 @@ class USBSharedBusTeleopStrategy(BaseTeleopStrategy):
             except Exception:
                 pass
             return
+        leader_bytes = sync_read_bytes(len(self.LEADER_IDS), LEN_POS)
+        follower_bytes = sync_read_bytes(len(self.FOLLOWER_IDS), LEN_POS)
+        write_bytes = sync_write_bytes(len(self.FOLLOWER_IDS), LEN_POS)
+        bus = self._bus_usage = BusUsage(BAUDRATE)
         self._running = True
         self._event_bus.publish(Event(EventType.TELEOP_STARTED, {"mode": "usb_shared"}))
-        dt = 1.0 / hz
-
-        def _raw_to_rad(raw: int) -> float:
-            if raw > 0x7FFFFFFF:
-                raw -= 0x100000000
-            return raw / 2048.0 * 3.141592653589793
-
-        def _rad_to_param(rad: float) -> list:
-            v = int(rad * 2048 / 3.141592653589793)
-            return [v & 0xFF, (v >> 8) & 0xFF, (v >> 16) & 0xFF, (v >> 24) & 0xFF]
+        scheduler = self._start_scheduler(hz)
 
+        leader_rad = np.zeros(len(self.LEADER_IDS))
+        follower_buf = np.zeros(len(self.FOLLOWER_IDS))
+        follower_rad = None
+        follower_t = None
+        tick = 0
         try:
             while self._running:
+                self._metrics.begin_tick()
                 try:
-                    group_read.txRxPacket()
-                    leader_rad = []
-                    for dxl_id in self.LEADER_IDS:
-                        if group_read.isAvailable(dxl_id, ADDR_PRESENT, LEN_POS):
-                            raw = group_read.getData(dxl_id, ADDR_PRESENT, LEN_POS)
-                            leader_rad.append(_raw_to_rad(raw))
-                        else:
-                            leader_rad.append(0.0)
-                    while len(leader_rad) < 7:
-                        leader_rad.append(0.0)
-                    group_write.clearParam()
-                    for i, dxl_id in enumerate(self.FOLLOWER_IDS):
-                        r = leader_rad[i] if i < len(leader_rad) else 0.0
-                        group_write.addParam(dxl_id, _rad_to_param(r))
+                    t0 = time.perf_counter()
+                    leader_read.txRxPacket()
+                    bus.add(time.perf_counter() - t0, leader_bytes)
+                    leader_codec.decode()
+                    leader_codec.to_rad(ADDR_PRESENT, leader_rad)
+                    self._metrics.mark("leader_read")
+                    goal_codec.encode(leader_rad)
+                    t0 = time.perf_counter()
                     group_write.txPacket()
-                    group_read.txRxPacket()
-                    follower_rad = []
-                    for dxl_id in self.FOLLOWER_IDS:
-                        if group_read.isAvailable(dxl_id, ADDR_PRESENT, LEN_POS):
-                            raw = group_read.getData(dxl_id, ADDR_PRESENT, LEN_POS)
-                            follower_rad.append(_raw_to_rad(raw))
-                        else:
-                            follower_rad.append(0.0)
-                    while len(follower_rad) < 7:
-                        follower_rad.append(0.0)
-                    import numpy as np
+                    bus.add(time.perf_counter() - t0, write_bytes)
+                    self._metrics.mark("follower_command")
+                    if tick % self._follower_read_every == 0:
+                        t0 = time.perf_counter()
+                        follower_read.txRxPacket()
+                        bus.add(time.perf_counter() - t0, follower_bytes)
+                        follower_codec.decode()
+                        follower_rad = follower_codec.to_rad(ADDR_PRESENT, follower_buf)
+                        follower_t = time.monotonic()
+                        self._metrics.mark("follower_read")
+                    bus.tick()
+                    tick += 1
+                    # Decimated ticks repeat the last read: same sample_time, velocity held
                     self._update_state(
-                        leader_rad[:7],
-                        _obs_from_joint_state(np.array(follower_rad)),
+                        leader_rad,
+                        follower_rad,
                         None,
+                        follower_t,
                     )
                 except Exception as e:
-                    self._update_state(self._leader_joints, self._follower_obs, str(e))
-                time.sleep(dt)
+                    self._update_error(str(e))
+                self._metrics.end_tick()
+                scheduler.wait()
         finally:
             try:
                 for dxl_id in self.FOLLOWER_IDS:
@@ -236,7 +334,20 @@ class USBSharedBusTeleopStrategy(BaseTeleopStrategy):
 
 
 class USBDualPortTeleopStrategy(BaseTeleopStrategy):
-    """Two ports: GELLO and robot on separate USB ports."""
+    """
+    Two ports: GELLO and robot on separate USB ports.
+    Each DynamixelDriver owns its port from one I/O thread; bus stats per port under `bus`.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None):
+        super().__init__(event_bus)
+        self._bus_sources: Dict[str, Any] = {}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        if self._bus_sources:
+            metrics["bus"] = {name: src.get_bus_stats() for name, src in self._bus_sources.items()}
+        return metrics
 
     def run(
         self,
@@ -254,15 +365,12 @@ class USBDualPortTeleopStrategy(BaseTeleopStrategy):
         except ImportError as e:
             self._update_state([], {}, f"lib 导入失败: {e}")
             return
-        try:
-            from serial.tools import list_ports
-            available = [p.device for p in list_ports.comports()]
-        except Exception:
-            available = []
-        if robot_usb_port and robot_usb_port not in available:
+        registry = get_device_registry()
+        if robot_usb_port and not registry.has(robot_usb_port):
+            available = registry.devices()
             self._update_state([], {}, f"机械臂串口 '{robot_usb_port}' 不存在。可用: {available or '无'}")
             return
-        if gello_port not in available:
+        if not registry.has(gello_port):
             self._update_state([], {}, f"GELLO 串口 '{gello_port}' 不存在")
             return
         agent = None
@@ -279,29 +387,36 @@ class USBDualPortTeleopStrategy(BaseTeleopStrategy):
             )
             agent = GelloAgent(port=gello_port, dynamixel_config=GENERIC_GELLO_CONFIG)
             robot_follower.set_torque_mode(True)
+            self._bus_sources = {"leader": agent, "follower": robot_follower}
             self._update_state([], {}, None)
         except Exception as e:
             self._update_state([], {}, str(e))
             return
         self._running = True
         self._event_bus.publish(Event(EventType.TELEOP_STARTED, {"mode": "usb_dual"}))
-        dt = 1.0 / hz
+        scheduler = self._start_scheduler(hz)
         try:
             while self._running and agent and robot_follower:
+                self._metrics.begin_tick()
                 try:
                     action = agent.act({})
                     if hasattr(action, "tolist"):
                         action = np.array(action)
+                    self._metrics.mark("leader_read")
                     robot_follower.command_joint_state(action)
-                    follower_state = robot_follower.get_joint_state()
+                    self._metrics.mark("follower_command")
+                    # Observations carry the servos' Present Velocity
+                    follower_obs = robot_follower.get_observations()
+                    self._metrics.mark("follower_read")
                     self._update_state(
-                        action.tolist() if hasattr(action, "tolist") else list(action),
-                        _obs_from_joint_state(follower_state),
+                        action,
+                        follower_obs,
                         None,
                     )
                 except Exception as e:
-                    self._update_state(self._leader_joints, self._follower_obs, str(e))
-                time.sleep(dt)
+                    self._update_error(str(e))
+                self._metrics.end_tick()
+                scheduler.wait()
         finally:
             try:
                 if robot_follower:
@@ -322,7 +437,21 @@ class USBDualPortTeleopStrategy(BaseTeleopStrategy):
 
 
 class CANTeleopStrategy(BaseTeleopStrategy):
-    """Teleop via CAN: GELLO (USB) controls Piper robot (CAN bus)."""
+    """
+    Teleop via CAN: GELLO (USB) controls Piper robot (CAN bus).
+    Command frames go through the channel's CAN frame budget; its stats are under `can`.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None):
+        super().__init__(event_bus)
+        self._robot = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        robot = self._robot
+        if robot is not None and hasattr(robot, "get_can_stats"):
+            metrics["can"] = robot.get_can_stats()
+        return metrics
 
     def run(
         self,
@@ -348,6 +477,7 @@ class CANTeleopStrategy(BaseTeleopStrategy):
         try:
             agent = GelloAgent(port=gello_port, dynamixel_config=GENERIC_GELLO_CONFIG)
             robot = PiperRobot(channel=channel)
+            self._robot = robot
             self._update_state([], {}, None)
         except Exception as e:
             self._update_state([], {}, str(e))
@@ -355,24 +485,29 @@ class CANTeleopStrategy(BaseTeleopStrategy):
 
         self._running = True
         self._event_bus.publish(Event(EventType.TELEOP_STARTED, {"mode": "can"}))
-        dt = 1.0 / hz
+        scheduler = self._start_scheduler(hz)
 
         try:
             while self._running and agent and robot:
+                self._metrics.begin_tick()
                 try:
                     action = agent.act({})
                     if hasattr(action, "tolist"):
                         action = np.array(action)
+                    self._metrics.mark("leader_read")
                     robot.command_joint_state(action)
+                    self._metrics.mark("follower_command")
                     obs = robot.get_observations()
+                    self._metrics.mark("follower_read")
                     self._update_state(
-                        action.tolist() if hasattr(action, "tolist") else list(action),
+                        action,
                         obs,
                         None,
                     )
                 except Exception as e:
-                    self._update_state(self._leader_joints, self._follower_obs, str(e))
-                time.sleep(dt)
+                    self._update_error(str(e))
+                self._metrics.end_tick()
+                scheduler.wait()
         finally:
             try:
                 if robot:
@@ -390,6 +525,183 @@ class CANTeleopStrategy(BaseTeleopStrategy):
         self._running = False
 
 
+class ReplayTeleopStrategy(BaseTeleopStrategy):
+    """
+    Replay a recorded episode on the follower (no GELLO needed).
+    Recorded leader commands go through the follower's command_joint_state path.
+    speed > 0: row i is sent at start + (t_i - t_0) / speed (1.0 = real time);
+    rows whose deadline already passed are skipped to stay on the recorded timeline.
+    speed == 0: send every row back-to-back, as fast as the bus allows.
+    """
+
+    def __init__(
+        self,
+        episode_dir: str,
+        speed: float = 1.0,
+        read_follower: bool = True,
+        event_bus: Optional[EventBus] = None,
+    ):
+        super().__init__(event_bus)
+        self._episode_dir = episode_dir
+        self._speed = max(0.0, float(speed))
+        self._read_follower = read_follower
+        self._lateness = LatencyHistogram(window_s=3600.0)
+        # Progress counters, summarized on demand by get_metrics()
+        self._t_rec: Optional[np.ndarray] = None
+        self._start = 0.0
+        self._end: Optional[float] = None
+        self._next_row = 0
+        self._rows_sent = 0
+        self._rows_skipped = 0
+        self._tracking_err_max = 0.0
+        self._tracking_err_sum = 0.0
+
+    def _open_follower(self, robot_host, robot_port, robot_usb_port, robot_can_channel):
+        if robot_can_channel:
+            from lib.piper_robot import PiperRobot
+            return PiperRobot(channel=robot_can_channel), "can"
+        if robot_usb_port:
+            from lib.dynamixel_robot import DynamixelRobot
+            robot = DynamixelRobot(
+                joint_ids=(1, 2, 3, 4, 5, 6),
+                joint_offsets=(0.0,) * 6,
+                joint_signs=(1,) * 6,
+                real=True,
+                port=robot_usb_port,
+                baudrate=57600,
+                gripper_config=(7, 0, 90),
+            )
+            robot.set_torque_mode(True)
+            return robot, "usb"
+        from lib.zmq_client_robot import ZMQClientRobot
+        return ZMQClientRobot(port=robot_port, host=robot_host), "zmq"
+
+    @staticmethod
+    def _close_follower(robot, kind: str) -> None:
+        try:
+            if kind == "usb":
+                robot.set_torque_mode(False)
+                robot._driver.close()
+            else:
+                robot.close()
+        except Exception:
+            pass
+
+    def run(
+        self,
+        gello_port: str,
+        robot_host: str,
+        robot_port: int,
+        robot_usb_port: Optional[str],
+        robot_can_channel: Optional[str] = None,
+        hz: float = 50,
+    ) -> None:
+        try:
+            from ..episode_store import EpisodeReader
+            reader = EpisodeReader(self._episode_dir)
+            t_rec = reader.column("t")
+            commands = reader.column("leader")
+            recorded_follower = reader.column("follower")
+            reader.close()
+        except Exception as e:
+            self._update_state([], {}, f"无法读取录制: {e}")
+            return
+        if len(t_rec) == 0:
+            self._update_state([], {}, "录制为空")
+            return
+        try:
+            robot, kind = self._open_follower(robot_host, robot_port, robot_usb_port, robot_can_channel)
+            self._update_state([], {}, None)
+        except Exception as e:
+            self._update_state([], {}, str(e))
+            return
+        self._running = True
+        self._event_bus.publish(Event(EventType.TELEOP_STARTED, {"mode": f"replay_{kind}"}))
+        n = len(t_rec)
+        speed = self._speed
+        self._lateness.reset()
+        self._t_rec = t_rec
+        start = self._start = time.monotonic()
+        t0 = float(t_rec[0])
+        i = 0
+        try:
+            while self._running and i < n:
+                if speed > 0:
+                    deadline = start + (float(t_rec[i]) - t0) / speed
+                    now = time.monotonic()
+                    if now < deadline:
+                        now = sleep_until(deadline)
+                    else:
+                        # Late: jump to the newest row that is already due
+                        j = int(np.searchsorted(t_rec, t0 + (now - start) * speed, side="right")) - 1
+                        if j > i:
+                            self._rows_skipped += j - i
+                            i = j
+                            deadline = start + (float(t_rec[i]) - t0) / speed
+                    self._lateness.record(max(0.0, now - deadline))
+                self._metrics.begin_tick()
+                try:
+                    cmd = commands[i]
+                    self._metrics.mark("leader_read")
+                    robot.command_joint_state(cmd)
+                    self._metrics.mark("follower_command")
+                    follower = None
+                    if self._read_follower:
+                        follower = robot.get_joint_state()
+                        self._metrics.mark("follower_read")
+                        m = min(len(follower), recorded_follower.shape[1])
+                        err = float(np.max(np.abs(follower[:m] - recorded_follower[i, :m]))) if m else 0.0
+                        self._tracking_err_sum += err
+                        if err > self._tracking_err_max:
+                            self._tracking_err_max = err
+                    self._update_state(cmd, follower, None)
+                except Exception as e:
+                    self._update_error(str(e))
+                self._metrics.end_tick()
+                self._rows_sent += 1
+                i += 1
+                self._next_row = i
+        finally:
+            self._end = time.monotonic()
+            self._running = False
+            self._close_follower(robot, kind)
+            self._event_bus.publish(Event(EventType.TELEOP_STOPPED, {}))
+
+    def get_replay_stats(self) -> Dict[str, Any]:
+        """Playback progress and how far achieved timing deviated from the recording."""
+        t_rec = self._t_rec
+        stats: Dict[str, Any] = {"episode": self._episode_dir, "speed": self._speed}
+        if t_rec is None:
+            return stats
+        i = self._next_row
+        sent = self._rows_sent
+        elapsed = (self._end or time.monotonic()) - self._start
+        recorded = float(t_rec[i - 1] - t_rec[0]) if i else 0.0
+        expected = recorded / self._speed if self._speed > 0 else None
+        stats.update({
+            "rows_total": len(t_rec),
+            "rows_sent": sent,
+            "rows_skipped": self._rows_skipped,
+            "progress": i / len(t_rec),
+            "recorded_elapsed_s": recorded,
+            "actual_elapsed_s": elapsed,
+            # Positive: playback is behind the (scaled) recording
+            "timeline_drift_ms": (elapsed - expected) * 1000.0 if expected is not None else None,
+            "lateness_ms": self._lateness.percentiles(),
+            "tracking_error_max_rad": self._tracking_err_max,
+            "tracking_error_mean_rad": self._tracking_err_sum / sent if sent and self._read_follower else 0.0,
+        })
+        return stats
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        metrics["replay"] = self.get_replay_stats()
+        return metrics
+
+    def stop(self) -> None:
+        self._running = False
+
+
 class TeleopStrategyFactory:
     """Factory Pattern: create appropriate strategy from config."""
 
@@ -398,13 +710,15 @@ class TeleopStrategyFactory:
         gello_port: str,
         robot_usb_port: Optional[str],
         robot_can_channel: Optional[str] = None,
+        follower_read_every: int = 1,
+        zmq_client: str = "sync",
     ) -> BaseTeleopStrategy:
         # Priority: CAN > USB > ZMQ
         if robot_can_channel:
             return CANTeleopStrategy()
         if not robot_usb_port:
-            return ZMQTeleopStrategy()
+            return ZMQTeleopStrategy(zmq_client=zmq_client)
         use_shared = robot_usb_port == gello_port or str(robot_usb_port).upper() == "SAME"
         if use_shared:
-            return USBSharedBusTeleopStrategy()
+            return USBSharedBusTeleopStrategy(follower_read_every=follower_read_every)
         return USBDualPortTeleopStrategy()
@@ -0,0 +1,179 @@
+"""
+CAN frame budget for Piper command traffic.
+
+PiperRobot used to send ModeCtrl + JointCtrl + GripperCtrl (5 frames) every tick. A
+CanCommandBudget per channel remembers what was last sent on that channel:
+- ModeCtrl is sent only when the mode changes, after an enable, or every mode_refresh_s
+  (so an arm that dropped out of CAN control mode is put back within that time)
+- GripperCtrl is sent only when the target moved more than gripper_deadband (0.001 mm units)
+  and at most gripper_max_hz times per second
+- JointCtrl always goes out (it is the control stream)
+It counts frames sent and suppressed, frames per second and estimated bus load.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Frames per SDK call (standard 11-bit ID, 8 data bytes)
+FRAMES_PER_CALL = {
+    "EnablePiper": 1,   # 0x471 motor enable
+    "ModeCtrl": 1,      # 0x151
+    "JointCtrl": 3,     # 0x155-0x157, two joints per frame
+    "GripperCtrl": 1,   # 0x159
+}
+# Arm -> host feedback per report cycle: status, end pose (3), joints (3), gripper, motor info (6 + 6)
+FEEDBACK_FRAMES_PER_CYCLE = 20
+FEEDBACK_HZ = 200.0
+FEEDBACK_FPS = FEEDBACK_FRAMES_PER_CYCLE * FEEDBACK_HZ
+CAN_BITRATE = 1_000_000
+# 8-byte standard data frame: 111 bits + ~10% stuff bits + 3-bit interframe space
+BITS_PER_FRAME = 125
+
+DEFAULT_GRIPPER_DEADBAND = 500  # 0.5 mm
+DEFAULT_GRIPPER_MAX_HZ = 20.0
+DEFAULT_MODE_REFRESH_S = 1.0
+_RATE_WINDOW_S = 1.0
+
+
+class CanCommandBudget:
+    """Decides which Piper command frames are worth sending on one channel, and counts them."""
+
+    def __init__(
+        self,
+        channel: str,
+        gripper_deadband: float = DEFAULT_GRIPPER_DEADBAND,
+        gripper_max_hz: float = DEFAULT_GRIPPER_MAX_HZ,
+        mode_refresh_s: float = DEFAULT_MODE_REFRESH_S,
+        bitrate: int = CAN_BITRATE,
+        clock=time.monotonic,
+    ):
+        self.channel = channel
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bitrate = bitrate
+        self.configure(gripper_deadband, gripper_max_hz, mode_refresh_s)
+        self._mode: Optional[Tuple[int, ...]] = None
+        self._mode_sent_at = 0.0
+        self._gripper: Optional[float] = None
+        self._gripper_sent_at = 0.0
+        self.reset_stats()
+
+    def configure(
+        self,
+        gripper_deadband: Optional[float] = None,
+        gripper_max_hz: Optional[float] = None,
+        mode_refresh_s: Optional[float] = None,
+    ) -> None:
+        if gripper_deadband is not None:
+            if gripper_deadband < 0:
+                raise ValueError("gripper_deadband must be >= 0")
+            self._gripper_deadband = gripper_deadband
+        if gripper_max_hz is not None:
+            if gripper_max_hz < 0:
+                raise ValueError("gripper_max_hz must be >= 0 (0: no limit)")
+            self._gripper_min_interval = 1.0 / gripper_max_hz if gripper_max_hz else 0.0
+        if mode_refresh_s is not None:
+            if mode_refresh_s <= 0:
+                raise ValueError("mode_refresh_s must be > 0")
+            self._mode_refresh_s = mode_refresh_s
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._since = now
+            self._sent: Dict[str, int] = {name: 0 for name in FRAMES_PER_CALL}
+            self._suppressed: Dict[str, int] = {"ModeCtrl": 0, "GripperCtrl": 0}
+            self._window_start = now
+            self._window_frames = 0
+            self._fps: Optional[float] = None
+
+    # --- decisions (call sent() after actually sending) ---
+
+    def want_mode(self, mode: Tuple[int, ...]) -> bool:
+        with self._lock:
+            if self._mode == mode and self._clock() - self._mode_sent_at < self._mode_refresh_s:
+                self._suppressed["ModeCtrl"] += 1
+                return False
+            return True
+
+    def want_gripper(self, angle: float) -> bool:
+        with self._lock:
+            if self._gripper is not None:
+                if abs(angle - self._gripper) <= self._gripper_deadband:
+                    self._suppressed["GripperCtrl"] += 1
+                    return False
+                if self._clock() - self._gripper_sent_at < self._gripper_min_interval:
+                    self._suppressed["GripperCtrl"] += 1
+                    return False
+            return True
+
+    def sent(self, call: str, value: Any = None) -> None:
+        """Record a command that went out (value: the mode tuple or gripper angle)."""
+        with self._lock:
+            now = self._clock()
+            if call == "ModeCtrl":
+                self._mode, self._mode_sent_at = value, now
+            elif call == "GripperCtrl":
+                self._gripper, self._gripper_sent_at = value, now
+            elif call == "EnablePiper":
+                # The arm may come back in standby: resend the mode with the next command
+                self._mode = None
+            frames = FRAMES_PER_CALL.get(call, 1)
+            self._sent[call] = self._sent.get(call, 0) + frames
+            elapsed = now - self._window_start
+            if elapsed >= _RATE_WINDOW_S:
+                self._fps = self._window_frames / elapsed
+                self._window_start = now
+                self._window_frames = 0
+            self._window_frames += frames
+
+    def invalidate(self) -> None:
+        """Forget what was sent (another process or a power cycle may have changed the arm)."""
+        with self._lock:
+            self._mode = None
+            self._gripper = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._since
+            total = sum(self._sent.values())
+            if self._fps is None or now - self._window_start > 2 * _RATE_WINDOW_S:
+                # No full window yet (or traffic stopped): average since reset / over the open window
+                span = now - self._window_start
+                fps = self._window_frames / span if span > 0 else 0.0
+            else:
+                fps = self._fps
+            tx_load = fps * BITS_PER_FRAME / self._bitrate
+            return {
+                "channel": self.channel,
+                "tx_frames": total,
+                "tx_frames_by_call": dict(self._sent),
+                "suppressed": dict(self._suppressed),
+                "tx_fps": fps,
+                "tx_fps_avg": total / elapsed if elapsed > 0 else 0.0,
+                "tx_bus_load": tx_load,
+                # Including the arm's nominal feedback stream
+                "bus_load": tx_load + FEEDBACK_FPS * BITS_PER_FRAME / self._bitrate,
+                "gripper_deadband": self._gripper_deadband,
+                "gripper_max_hz": 1.0 / self._gripper_min_interval if self._gripper_min_interval else 0.0,
+                "mode_refresh_s": self._mode_refresh_s,
+            }
+
+
+_budgets: Dict[str, CanCommandBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_can_budget(channel: str) -> CanCommandBudget:
+    """The budget of channel, shared by every PiperRobot on it."""
+    with _budgets_lock:
+        budget = _budgets.get(channel)
+        if budget is None:
+            budget = _budgets[channel] = CanCommandBudget(channel)
+        return budget
+
+
+def all_can_budgets() -> Dict[str, CanCommandBudget]:
+    with _budgets_lock:
+        return dict(_budgets)
@@ -0,0 +1,117 @@
+"""
+CAN interface discovery and counters from sysfs (Linux), without spawning `ip link`.
+
+An interface is CAN when /sys/class/net/<if>/type is 280 (ARPHRD_CAN; also vcan/slcan).
+The interface list is cached and rescanned when the mtime of /sys/class/net changes or the
+cache is older than ttl_s (sysfs does not always bump the directory mtime on rename/hotplug).
+Counters come from /sys/class/net/<if>/statistics. The CAN error counters (bus errors,
+error-passive, bus-off) are netlink-only in mainline kernels; the carrier down count stands in
+for bus-off, since the CAN core drops the carrier on bus-off. A can_stats directory is read
+where a driver exposes one.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SYS_CLASS_NET = "/sys/class/net"
+ARPHRD_CAN = 280
+DEFAULT_TTL_S = 2.0
+
+STATISTICS = (
+    "tx_packets", "rx_packets", "tx_bytes", "rx_bytes",
+    "tx_errors", "rx_errors", "tx_dropped", "rx_dropped",
+    "rx_over_errors", "rx_fifo_errors", "rx_crc_errors", "rx_frame_errors",
+)
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    try:
+        return int(value, 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CanInterfaceCache:
+    """CAN interfaces under root, rescanned only when the directory changes or the TTL expires."""
+
+    def __init__(self, root: str = SYS_CLASS_NET, ttl_s: float = DEFAULT_TTL_S, clock=time.monotonic):
+        self._root = root
+        self._ttl_s = ttl_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._channels: List[str] = []
+        self._key: Optional[Tuple[int, float]] = None
+        self._scans = 0
+
+    def _scan(self) -> List[str]:
+        try:
+            names = os.listdir(self._root)
+        except OSError:
+            return []
+        return sorted(n for n in names if _read_int(os.path.join(self._root, n, "type")) == ARPHRD_CAN)
+
+    def channels(self) -> List[str]:
+        try:
+            mtime = os.stat(self._root).st_mtime_ns
+        except OSError:
+            mtime = -1
+        now = self._clock()
+        with self._lock:
+            if self._key is None or self._key[0] != mtime or now - self._key[1] >= self._ttl_s:
+                self._channels = self._scan()
+                self._key = (mtime, now)
+                self._scans += 1
+            return list(self._channels)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._key = None
+
+    def stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """Counters of one interface; None if it does not exist."""
+        base = os.path.join(self._root, name)
+        if not os.path.isdir(base):
+            return None
+        out: Dict[str, Any] = {
+            "channel": name,
+            "is_can": _read_int(os.path.join(base, "type")) == ARPHRD_CAN,
+            "operstate": _read(os.path.join(base, "operstate")),
+            "carrier_changes": _read_int(os.path.join(base, "carrier_changes")),
+            # Carrier goes down on bus-off (and on ifdown)
+            "bus_off": _read_int(os.path.join(base, "carrier_down_count")),
+        }
+        stats_dir = os.path.join(base, "statistics")
+        for key in STATISTICS:
+            out[key] = _read_int(os.path.join(stats_dir, key))
+        can_stats_dir = os.path.join(base, "can_stats")
+        if os.path.isdir(can_stats_dir):
+            out["can_stats"] = {
+                key: _read_int(os.path.join(can_stats_dir, key)) for key in sorted(os.listdir(can_stats_dir))
+            }
+        return out
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"channels": list(self._channels), "scans": self._scans, "ttl_s": self._ttl_s}
+
+
+_cache: Optional[CanInterfaceCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_can_interface_cache() -> CanInterfaceCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CanInterfaceCache()
+        return _cache
@@ -0,0 +1,97 @@
+"""
+Vectorized Dynamixel (Protocol 2.0) position codec.
+Decodes a whole GroupSyncRead response into preallocated int32/float64 arrays and encodes
+a goal vector into GroupSyncWrite params, without per-ID getData calls or per-read allocation.
+"""
+from typing import Sequence
+
+import numpy as np
+
+RAD_PER_TICK = np.pi / 2048.0
+TICKS_PER_RAD = 2048.0 / np.pi
+# Present Velocity unit (X-series): 0.229 rev/min
+RAD_S_PER_VELOCITY_UNIT = 0.229 * 2.0 * np.pi / 60.0
+
+
+def raw_to_rad(raw: int) -> float:
+    """Single unsigned 32-bit register value -> radians."""
+    if raw > 0x7FFFFFFF:
+        raw -= 0x100000000
+    return raw * RAD_PER_TICK
+
+
+class SyncReadDecoder:
+    """
+    Decoder bound to one GroupSyncRead.
+    Every ID's response bytes are copied into one bytearray viewed as little-endian int32
+    words, shape (n_ids, data_length // 4). IDs without a valid response decode as 0.
+    """
+
+    def __init__(self, group_read, ids: Sequence[int], start_address: int, data_length: int):
+        if data_length % 4:
+            raise ValueError("data_length must be a multiple of 4")
+        self._group_read = group_read
+        self.ids = tuple(ids)
+        self._start_address = start_address
+        self._data_length = data_length
+        self._buf = bytearray(len(self.ids) * data_length)
+        self._spans = [
+            (dxl_id, slice(i * data_length, (i + 1) * data_length)) for i, dxl_id in enumerate(self.ids)
+        ]
+        self.raw = np.frombuffer(self._buf, dtype="<i4").reshape(len(self.ids), data_length // 4)
+        self.valid = np.zeros(len(self.ids), dtype=bool)
+
+    def decode(self) -> bool:
+        """Copy the last txRxPacket() response into self.raw. True if every ID answered."""
+        data_dict = self._group_read.data_dict
+        ok = bool(self._group_read.last_result)
+        n = self._data_length
+        buf = self._buf
+        valid = self.valid
+        for i, (dxl_id, span) in enumerate(self._spans):
+            data = data_dict.get(dxl_id) if ok else None
+            if data is not None and len(data) == n:
+                buf[span] = data
+                valid[i] = True
+            else:
+                buf[span] = bytes(n)
+                valid[i] = False
+        return ok
+
+    def ticks(self, address: int) -> np.ndarray:
+        """int32 view of the register at address for every ID (no copy)."""
+        return self.raw[:, (address - self._start_address) // 4]
+
+    def to_rad(self, address: int, out: np.ndarray) -> np.ndarray:
+        """Position register at address -> radians, written into out."""
+        return np.multiply(self.ticks(address), RAD_PER_TICK, out=out)
+
+
+class SyncWriteEncoder:
+    """
+    Encoder bound to one GroupSyncWrite of 4-byte goal positions.
+    Each ID's param is a memoryview into one preallocated int32 buffer, so encoding is
+    a single vectorized multiply + cast; changeParam() only marks the packet dirty.
+    """
+
+    def __init__(self, group_write, ids: Sequence[int]):
+        self._group_write = group_write
+        self.ids = tuple(ids)
+        n = len(self.ids)
+        self.ticks = np.zeros(n, dtype="<i4")
+        self._scratch = np.zeros(n, dtype=np.float64)
+        rows = self.ticks.view(np.uint8).reshape(n, 4)
+        self._params = [(dxl_id, memoryview(rows[i])) for i, dxl_id in enumerate(self.ids)]
+        for dxl_id, param in self._params:
+            if not group_write.addParam(dxl_id, param):
+                group_write.changeParam(dxl_id, param)
+
+    def encode(self, rad: Sequence[float]) -> None:
+        """Goal positions (rad) -> sync-write params. Missing trailing joints encode as 0."""
+        n = min(len(rad), len(self.ids))
+        np.multiply(np.asarray(rad[:n], dtype=np.float64), TICKS_PER_RAD, out=self._scratch[:n])
+        self._scratch[n:] = 0.0
+        # Truncate toward zero like int()
+        np.copyto(self.ticks, self._scratch, casting="unsafe")
+        for dxl_id, param in self._params:
+            self._group_write.changeParam(dxl_id, param)
@@ -0,0 +1,85 @@
+"""
+Dynamixel Protocol 2.0 discovery: broadcast ping with a response window sized to the ID range.
+PacketHandler.broadcastPing() always waits for all 252 IDs (about 0.8-1.4 s); GELLO uses
+low IDs, so waiting only for IDs up to max_id finds every servo in one short transaction.
+"""
+import time
+from typing import Dict, List, Tuple
+
+try:
+    from dynamixel_sdk.port_handler import LATENCY_TIMER
+    from dynamixel_sdk.robotis_def import (
+        BROADCAST_ID,
+        COMM_RX_TIMEOUT,
+        COMM_SUCCESS,
+        INST_PING,
+        PKT_ID,
+        PKT_INSTRUCTION,
+        PKT_LENGTH_H,
+        PKT_LENGTH_L,
+    )
+except ImportError:
+    LATENCY_TIMER = 16
+    BROADCAST_ID, INST_PING = 0xFE, 1
+    PKT_ID, PKT_LENGTH_L, PKT_LENGTH_H, PKT_INSTRUCTION = 4, 5, 6, 7
+    COMM_SUCCESS, COMM_RX_TIMEOUT = 0, -3001
+
+STATUS_LENGTH = 14  # ping status: header(4) id len(2) inst err model(2) fw crc(2)
+# Servos answer a broadcast ping in ID order, one ~3 ms slot per ID
+SLOT_MS = 3.0
+DEFAULT_MAX_ID = 12
+_POLL_S = 0.0005
+
+
+def _parse_ping_status(rx: List[int], packet_handler) -> Dict[int, Tuple[int, int]]:
+    """Extract {id: (model_number, firmware)} from a stream of ping status packets."""
+    found: Dict[int, Tuple[int, int]] = {}
+    i = 0
+    n = len(rx)
+    while i + STATUS_LENGTH <= n:
+        if rx[i] != 0xFF or rx[i + 1] != 0xFF or rx[i + 2] != 0xFD:
+            i += 1
+            continue
+        pkt = rx[i:i + STATUS_LENGTH]
+        crc = pkt[STATUS_LENGTH - 2] | (pkt[STATUS_LENGTH - 1] << 8)
+        if packet_handler.updateCRC(0, pkt, STATUS_LENGTH - 2) == crc:
+            found[pkt[PKT_ID]] = (pkt[9] | (pkt[10] << 8), pkt[11])
+            i += STATUS_LENGTH
+        else:
+            i += 1
+    return found
+
+
+def broadcast_ping(port_handler, packet_handler, max_id: int = DEFAULT_MAX_ID) -> Tuple[Dict[int, Tuple[int, int]], int]:
+    """
+    One broadcast ping; waits only for the response slots of IDs 1..max_id.
+    Returns ({id: (model_number, firmware)}, comm_result).
+    """
+    txpacket = [0] * 10
+    txpacket[PKT_ID] = BROADCAST_ID
+    txpacket[PKT_LENGTH_L] = 3
+    txpacket[PKT_LENGTH_H] = 0
+    txpacket[PKT_INSTRUCTION] = INST_PING
+    result = packet_handler.txPacket(port_handler, txpacket)
+    if result != COMM_SUCCESS:
+        port_handler.is_using = False
+        return {}, result
+    wait_length = STATUS_LENGTH * max_id
+    tx_ms_per_byte = 1000.0 / port_handler.getBaudRate() * 10.0
+    port_handler.setPacketTimeoutMillis(wait_length * tx_ms_per_byte + SLOT_MS * max_id + LATENCY_TIMER)
+    rx: List[int] = []
+    try:
+        while len(rx) < wait_length:
+            chunk = port_handler.readPort(wait_length - len(rx))
+            if chunk:
+                rx.extend(chunk)
+            elif port_handler.isPacketTimeout():
+                break
+            else:
+                # Sleep instead of spinning so concurrent port scans share the GIL
+                time.sleep(_POLL_S)
+    finally:
+        port_handler.is_using = False
+    if not rx:
+        return {}, COMM_RX_TIMEOUT
+    return _parse_ping_status(rx, packet_handler), COMM_SUCCESS
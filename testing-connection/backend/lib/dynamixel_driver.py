@@ -2,11 +2,16 @@
 Minimal DynamixelDriver for testing-connection. Windows-compatible, no lsof/fuser.
 Standalone replacement for gello.dynamixel.driver, uses dynamixel-sdk from pip.
 """
+import queue
+import time
 from threading import Event, Lock, Thread
-from typing import Optional, Protocol, Sequence, Tuple
+from typing import Any, Dict, Optional, Protocol, Sequence, Tuple
 
 import numpy as np
 
+from .dynamixel_codec import RAD_S_PER_VELOCITY_UNIT, SyncReadDecoder, SyncWriteEncoder
+from .dynamixel_timing import BusUsage, single_write_bytes, sync_read_bytes, sync_write_bytes, wire_time_s
+
 try:
     from dynamixel_sdk.port_handler import PortHandler
     from dynamixel_sdk.packet_handler import PacketHandler
@@ -63,8 +68,31 @@ class FakeDynamixelDriver(DynamixelDriverProtocol):
         pass
 
 
+class _TorqueCommand:
+    """Torque write handed to the I/O thread; the caller waits on done."""
+
+    __slots__ = ("value", "done", "error")
+
+    def __init__(self, value: int):
+        self.value = value
+        self.done = Event()
+        self.error: Optional[Exception] = None
+
+
 class DynamixelDriver(DynamixelDriverProtocol):
-    """Dynamixel driver using dynamixel-sdk. Windows-compatible (no lsof/fuser)."""
+    """
+    Dynamixel driver using dynamixel-sdk. Windows-compatible (no lsof/fuser).
+    One I/O thread owns the port. Each cycle it runs pending torque commands, then the
+    latest goal (if a new one arrived), then a sync read when the read slot is due.
+    Callers never touch the port: set_joints() only replaces the goal in a mailbox.
+    The read period is at least the modeled wire time of one sync read plus one goal
+    write, so reads never run back to back and a new goal waits at most one read.
+    """
+
+    TORQUE_TIMEOUT_S = 2.0
+    # get_joints() waits this long (or FIRST_STATE_READS read periods, if longer) for the first read
+    FIRST_STATE_TIMEOUT_S = 1.0
+    FIRST_STATE_READS = 10
 
     def __init__(
         self,
@@ -73,11 +101,26 @@ class DynamixelDriver(DynamixelDriverProtocol):
         baudrate: int = 57600,
         max_retries: int = 3,
         use_fake_fallback: bool = True,
+        read_hz: float = 500.0,
     ):
+        if read_hz <= 0:
+            raise ValueError("read_hz must be positive")
         self._ids = list(ids)
-        self._joint_angles = None
-        self._velocities = None
-        self._lock = Lock()
+        # Latest decoded state, updated in place under _state_lock
+        self._joint_angles = np.zeros(len(self._ids), dtype=np.float64)
+        self._velocities = np.zeros(len(self._ids), dtype=np.int32)
+        self._has_state = Event()
+        self._state_lock = Lock()
+        # Latest-value goal mailbox: one (seq, goal) tuple, replaced by a single assignment
+        self._goal_slot: Tuple[int, Optional[np.ndarray]] = (0, None)
+        self._commands: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._wakeup = Event()
+        self._requested_read_hz = read_hz
+        self._read_period = max(1.0 / read_hz, self.min_read_period_s(len(self._ids), baudrate))
+        self._bus_usage = BusUsage(baudrate)
+        self._read_errors = 0
+        self._last_read_error: Optional[str] = None
+        self._write_errors = 0
         self._port = port
         self._baudrate = baudrate
         self._max_retries = max_retries
@@ -98,6 +141,13 @@ class DynamixelDriver(DynamixelDriverProtocol):
             else:
                 raise RuntimeError("Failed to initialize Dynamixel driver after all retries")
 
+    @staticmethod
+    def min_read_period_s(n_ids: int, baudrate: int) -> float:
+        """Wire time of one position+velocity sync read plus one goal sync write slot."""
+        read_s = wire_time_s(sync_read_bytes(n_ids, LEN_PRESENT_VELOCITY + LEN_PRESENT_POSITION), baudrate, n_ids)
+        write_s = wire_time_s(sync_write_bytes(n_ids, LEN_GOAL_POSITION), baudrate)
+        return read_s + write_s
+
     def _initialize_fake_driver(self):
         self._is_fake = True
         self._fake_joint_angles = np.zeros(len(self._ids), dtype=float)
@@ -141,45 +191,103 @@ class DynamixelDriver(DynamixelDriverProtocol):
             if not self._groupSyncRead.addParam(dxl_id):
                 self._portHandler.closePort()
                 raise RuntimeError(f"Failed to add param for ID {dxl_id}")
+        self._read_codec = SyncReadDecoder(
+            self._groupSyncRead,
+            self._ids,
+            ADDR_PRESENT_VELOCITY,
+            LEN_PRESENT_VELOCITY + LEN_PRESENT_POSITION,
+        )
+        self._goal_codec = SyncWriteEncoder(self._groupSyncWrite, self._ids)
+        self._rad_scratch = np.zeros(len(self._ids), dtype=np.float64)
+
+        self._stop_thread = Event()
+        self._io_thread = Thread(
+            target=self._io_loop, args=(self._stop_thread,), name=f"dxl-io-{self._port}", daemon=True
+        )
+        self._io_thread.start()
+        try:
+            self.set_torque_mode(self._torque_enabled)
+        except Exception:
+            self._stop_thread.set()
+            self._wakeup.set()
+            self._io_thread.join(timeout=2.0)
+            self._portHandler.closePort()
+            raise
 
-        self.set_torque_mode(self._torque_enabled)
-        self._reading_thread = Thread(target=self._read_joint_states, daemon=True)
-        self._reading_thread.start()
+    # --- I/O thread (sole owner of the port) ---
 
-    def _read_joint_states(self):
-        import time
-        while not self._stop_thread.is_set():
-            time.sleep(0.001)
-            with self._lock:
+    def _io_loop(self, stop: Event):
+        n = len(self._ids)
+        read_bytes = sync_read_bytes(n, LEN_PRESENT_VELOCITY + LEN_PRESENT_POSITION)
+        write_bytes = sync_write_bytes(n, LEN_GOAL_POSITION)
+        torque_bytes = n * single_write_bytes(1)
+        sent_seq = 0
+        next_read = time.monotonic()
+        bus = self._bus_usage
+        while not stop.is_set():
+            # Clear before polling so a goal posted during this cycle wakes the next wait
+            self._wakeup.clear()
+            # Slot 1: torque commands (rare, caller waits for completion)
+            while True:
+                try:
+                    cmd = self._commands.get_nowait()
+                except queue.Empty:
+                    break
+                t0 = time.perf_counter()
+                try:
+                    for dxl_id in self._ids:
+                        self._packetHandler.write1ByteTxRx(
+                            self._portHandler, dxl_id, ADDR_TORQUE_ENABLE, cmd.value
+                        )
+                except Exception as e:
+                    cmd.error = e
+                bus.add(time.perf_counter() - t0, torque_bytes)
+                cmd.done.set()
+            # Slot 2: newest goal, written as soon as it arrives
+            seq, goal = self._goal_slot
+            if seq != sent_seq:
+                sent_seq = seq
+                t0 = time.perf_counter()
                 try:
-                    result = self._groupSyncRead.txRxPacket()
-                    if result != COMM_SUCCESS:
-                        continue
-                    _joint_angles = np.zeros(len(self._ids), dtype=int)
-                    _velocities = np.zeros(len(self._ids), dtype=int)
-                    for i, dxl_id in enumerate(self._ids):
-                        if self._groupSyncRead.isAvailable(
-                            dxl_id, ADDR_PRESENT_VELOCITY, LEN_PRESENT_VELOCITY
-                        ):
-                            v = self._groupSyncRead.getData(
-                                dxl_id, ADDR_PRESENT_VELOCITY, LEN_PRESENT_VELOCITY
-                            )
-                            if v > 0x7FFFFFFF:
-                                v -= 0x100000000
-                            _velocities[i] = v
-                        if self._groupSyncRead.isAvailable(
-                            dxl_id, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION
-                        ):
-                            a = self._groupSyncRead.getData(
-                                dxl_id, ADDR_PRESENT_POSITION, LEN_PRESENT_POSITION
-                            )
-                            if a > 0x7FFFFFFF:
-                                a -= 0x100000000
-                            _joint_angles[i] = a
-                    self._joint_angles = _joint_angles
-                    self._velocities = _velocities
+                    self._goal_codec.encode(goal)
+                    if self._groupSyncWrite.txPacket() != COMM_SUCCESS:
+                        self._write_errors += 1
                 except Exception:
-                    pass
+                    self._write_errors += 1
+                bus.add(time.perf_counter() - t0, write_bytes)
+            # Slot 3: state read at read_hz
+            now = time.monotonic()
+            if now >= next_read:
+                t0 = time.perf_counter()
+                self._read_once()
+                bus.add(time.perf_counter() - t0, read_bytes)
+                bus.tick()
+                next_read += self._read_period
+                if next_read <= now:
+                    # Overrun: skip missed slots instead of bursting reads
+                    next_read = now + self._read_period
+            timeout = next_read - time.monotonic()
+            if timeout > 0:
+                self._wakeup.wait(timeout)
+
+    def _read_once(self):
+        try:
+            result = self._groupSyncRead.txRxPacket()
+            if result != COMM_SUCCESS:
+                self._read_errors += 1
+                describe = getattr(self._packetHandler, "getTxRxResult", None)
+                self._last_read_error = describe(result) if describe else f"result {result}"
+                return
+            codec = self._read_codec
+            codec.decode()
+            codec.to_rad(ADDR_PRESENT_POSITION, self._rad_scratch)
+            with self._state_lock:
+                np.copyto(self._joint_angles, self._rad_scratch)
+                np.copyto(self._velocities, codec.ticks(ADDR_PRESENT_VELOCITY))
+            self._has_state.set()
+        except Exception as e:
+            self._read_errors += 1
+            self._last_read_error = f"{type(e).__name__}: {e}"
 
     def set_joints(self, joint_angles: Sequence[float]):
         if len(joint_angles) != len(self._ids):
@@ -191,28 +299,22 @@ class DynamixelDriver(DynamixelDriverProtocol):
             self._fake_joint_angles = np.array(joint_angles)
             return
 
-        for dxl_id, angle in zip(self._ids, joint_angles):
-            position_value = int(angle * 2048 / np.pi)
-            param = [
-                position_value & 0xFF,
-                (position_value >> 8) & 0xFF,
-                (position_value >> 16) & 0xFF,
-                (position_value >> 24) & 0xFF,
-            ]
-            self._groupSyncWrite.addParam(dxl_id, param)
-        self._groupSyncWrite.txPacket()
-        self._groupSyncWrite.clearParam()
+        goal = np.array(joint_angles, dtype=np.float64)
+        self._goal_slot = (self._goal_slot[0] + 1, goal)
+        self._wakeup.set()
 
     def set_torque_mode(self, enable: bool):
         if self._is_fake:
             self._torque_enabled = enable
             return
         torque_value = TORQUE_ENABLE if enable else TORQUE_DISABLE
-        with self._lock:
-            for dxl_id in self._ids:
-                self._packetHandler.write1ByteTxRx(
-                    self._portHandler, dxl_id, ADDR_TORQUE_ENABLE, torque_value
-                )
+        cmd = _TorqueCommand(torque_value)
+        self._commands.put(cmd)
+        self._wakeup.set()
+        if not cmd.done.wait(self.TORQUE_TIMEOUT_S):
+            raise RuntimeError(f"Torque command timed out on {self._port}")
+        if cmd.error is not None:
+            raise cmd.error
         self._torque_enabled = enable
 
     def torque_enabled(self) -> bool:
@@ -221,15 +323,46 @@ class DynamixelDriver(DynamixelDriverProtocol):
     def get_joints(self) -> np.ndarray:
         if self._is_fake:
             return self._fake_joint_angles.copy()
-        while self._joint_angles is None:
-            import time
-            time.sleep(0.1)
-        return self._joint_angles.copy() / 2048.0 * np.pi
+        if not self._has_state.is_set():
+            timeout = max(self.FIRST_STATE_TIMEOUT_S, self.FIRST_STATE_READS * self._read_period)
+            if not self._has_state.wait(timeout):
+                reason = self._last_read_error or (
+                    "I/O thread not running" if not self._io_thread.is_alive() else "no reply"
+                )
+                raise RuntimeError(
+                    f"No state read from {self._port} within {timeout:.1f} s "
+                    f"({self._read_errors} read errors, last: {reason})"
+                )
+        with self._state_lock:
+            return self._joint_angles.copy()
+
+    def get_velocities(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Present Velocity of the last read in rad/s (into out if given); None without hardware."""
+        if self._is_fake:
+            return None
+        if out is None:
+            out = np.empty(len(self._ids), dtype=np.float64)
+        with self._state_lock:
+            return np.multiply(self._velocities, RAD_S_PER_VELOCITY_UNIT, out=out)
+
+    def get_bus_stats(self) -> Dict[str, Any]:
+        """Bus occupancy of the I/O thread plus read/write error counts."""
+        if self._is_fake:
+            return {}
+        return {
+            **self._bus_usage.get_stats(),
+            "read_hz": 1.0 / self._read_period,
+            "requested_read_hz": self._requested_read_hz,
+            "read_errors": self._read_errors,
+            "last_read_error": self._last_read_error,
+            "write_errors": self._write_errors,
+        }
 
     def close(self):
         if self._is_fake:
             return
         self._stop_thread.set()
-        if hasattr(self, "_reading_thread"):
-            self._reading_thread.join(timeout=2.0)
+        self._wakeup.set()
+        if hasattr(self, "_io_thread"):
+            self._io_thread.join(timeout=2.0)
         self._portHandler.closePort()
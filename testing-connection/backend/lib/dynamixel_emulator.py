@@ -0,0 +1,581 @@
+"""
+Dynamixel Protocol 2.0 bus emulator on a pseudo-terminal (Linux/macOS), for running the real
+SDK / serial code paths without servos.
+
+The emulator opens a pty and answers ping, read, write, sync read, sync write, bulk read and
+bulk write for a set of emulated X-series servos. Replies are timed like a real half-duplex bus:
+the instruction's own wire time at the host's baud rate, then per status packet the servo's
+Return Delay Time (register 9) plus its wire time. A servo only answers when the host's baud
+rate (read from the pty's termios) matches its Baud Rate register, so baud detection behaves
+as on hardware. latency_timer_s optionally models a USB-serial adapter that hands bytes to the
+host per 62-byte USB packet or when its latency timer expires.
+
+Torqued servos move to Goal Position with first-order dynamics; untorqued servos hold their
+position, or oscillate with wave_amplitude (a GELLO being moved by hand).
+
+    python -m lib.dynamixel_emulator --ids 1-14 --model XL330-M288 --baud 57600 --link /tmp/ttyDXL
+"""
+import argparse
+import errno
+import math
+import os
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+HEADER = b"\xff\xff\xfd\x00"
+BROADCAST_ID = 0xFE
+# Instruction / status packet overhead: header(4) id(1) length(2) ... crc(2)
+_PREFIX = 7
+
+INST_PING = 0x01
+INST_READ = 0x02
+INST_WRITE = 0x03
+INST_STATUS = 0x55
+INST_SYNC_READ = 0x82
+INST_SYNC_WRITE = 0x83
+INST_BULK_READ = 0x92
+INST_BULK_WRITE = 0x93
+
+ERR_INSTRUCTION = 0x02
+ERR_CRC = 0x03
+ERR_DATA_LENGTH = 0x05
+ERR_ACCESS = 0x07
+
+# Control table (X-series)
+ADDR_MODEL_NUMBER = 0
+ADDR_FIRMWARE = 6
+ADDR_ID = 7
+ADDR_BAUD_RATE = 8
+ADDR_RETURN_DELAY = 9
+ADDR_OPERATING_MODE = 11
+ADDR_TORQUE_ENABLE = 64
+ADDR_GOAL_POSITION = 116
+ADDR_PRESENT_VELOCITY = 128
+ADDR_PRESENT_POSITION = 132
+EEPROM_END = 64  # EEPROM area is read-only while torque is on
+TABLE_SIZE = 256
+
+MODELS = {
+    "XL330-M077": 1190,
+    "XL330-M288": 1200,
+    "XC330-T288": 1240,
+    "XL430-W250": 1060,
+    "XM430-W350": 1020,
+    "XM540-W270": 1120,
+}
+# Baud Rate register value -> bps
+BAUD_RATES = {0: 9600, 1: 57600, 2: 115200, 3: 1000000, 4: 2000000, 5: 3000000, 6: 4000000, 7: 4500000}
+_BAUD_CODES = {bps: code for code, bps in BAUD_RATES.items()}
+_TERMIOS_BAUDS = {
+    getattr(termios, f"B{bps}"): bps for bps in (9600, 57600, 115200, 1000000, 2000000, 3000000, 4000000)
+    if hasattr(termios, f"B{bps}")
+}
+
+BITS_PER_BYTE = 10  # 8N1
+USB_PACKET_PAYLOAD = 62  # FTDI: 64-byte USB packet minus 2 status bytes
+TICKS_PER_REV = 4096
+VELOCITY_UNIT_RPM = 0.229
+
+
+def _crc_table() -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data: Iterable[int], crc: int = 0) -> int:
+    """Protocol 2.0 CRC-16 (polynomial 0x8005), same as PacketHandler.updateCRC."""
+    table = _CRC_TABLE
+    for b in data:
+        crc = ((crc << 8) ^ table[((crc >> 8) ^ b) & 0xFF]) & 0xFFFF
+    return crc
+
+
+def _stuff(body: bytes) -> bytes:
+    """Insert 0xFD after every FF FF FD in the instruction/parameter region."""
+    out = bytearray()
+    for b in body:
+        out.append(b)
+        if b == 0xFD and len(out) >= 3 and out[-3] == 0xFF and out[-2] == 0xFF:
+            out.append(0xFD)
+    return bytes(out)
+
+
+def _unstuff(body: bytes) -> bytes:
+    out = bytearray()
+    i = 0
+    n = len(body)
+    while i < n:
+        b = body[i]
+        out.append(b)
+        if b == 0xFD and i + 1 < n and body[i + 1] == 0xFD and len(out) >= 3 and out[-3] == 0xFF and out[-2] == 0xFF:
+            i += 1
+        i += 1
+    return bytes(out)
+
+
+def build_packet(dxl_id: int, instruction: int, params: bytes = b"") -> bytes:
+    """Complete Protocol 2.0 packet (stuffed, with CRC). For a status packet, params start with the error byte."""
+    body = _stuff(bytes([instruction]) + params)
+    head = HEADER + struct.pack("<BH", dxl_id, len(body) + 2)
+    packet = head + body
+    return packet + struct.pack("<H", crc16(packet))
+
+
+class EmulatedServo:
+    """Control table and motion of one servo; positions and velocities are updated lazily on read."""
+
+    def __init__(
+        self,
+        dxl_id: int,
+        model: str = "XL330-M288",
+        baudrate: int = 57600,
+        return_delay_us: int = 500,
+        position: int = 2048,
+        tau_s: float = 0.05,
+        wave_amplitude: float = 0.0,
+        wave_hz: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if model not in MODELS:
+            raise ValueError(f"unknown model {model}; known: {sorted(MODELS)}")
+        if baudrate not in _BAUD_CODES:
+            raise ValueError(f"unsupported baudrate {baudrate}; supported: {sorted(_BAUD_CODES)}")
+        self.model = model
+        self.table = bytearray(TABLE_SIZE)
+        struct.pack_into("<H", self.table, ADDR_MODEL_NUMBER, MODELS[model])
+        self.table[ADDR_FIRMWARE] = 52
+        self.table[ADDR_ID] = dxl_id
+        self.table[ADDR_BAUD_RATE] = _BAUD_CODES[baudrate]
+        self.table[ADDR_RETURN_DELAY] = min(254, return_delay_us // 2)
+        self.table[ADDR_OPERATING_MODE] = 3  # position control
+        struct.pack_into("<i", self.table, ADDR_GOAL_POSITION, position)
+        self._tau_s = tau_s
+        self._wave_amplitude = wave_amplitude
+        self._wave_hz = wave_hz
+        self._clock = clock
+        self._position = float(position)
+        self._rest = float(position)
+        self._velocity = 0.0
+        self._t0 = self._t = clock()
+
+    @property
+    def id(self) -> int:
+        return self.table[ADDR_ID]
+
+    @property
+    def baudrate(self) -> int:
+        return BAUD_RATES.get(self.table[ADDR_BAUD_RATE], 0)
+
+    @property
+    def return_delay_s(self) -> float:
+        return self.table[ADDR_RETURN_DELAY] * 2e-6
+
+    @property
+    def torque_enabled(self) -> bool:
+        return bool(self.table[ADDR_TORQUE_ENABLE])
+
+    def model_number(self) -> int:
+        return struct.unpack_from("<H", self.table, ADDR_MODEL_NUMBER)[0]
+
+    def _advance(self) -> None:
+        now = self._clock()
+        dt = now - self._t
+        self._t = now
+        if self.torque_enabled:
+            goal = struct.unpack_from("<i", self.table, ADDR_GOAL_POSITION)[0]
+            if dt > 0:
+                prev = self._position
+                self._position = goal + (prev - goal) * math.exp(-dt / self._tau_s)
+                self._velocity = (self._position - prev) / dt
+            self._rest = self._position
+        elif self._wave_amplitude:
+            w = 2 * math.pi * self._wave_hz
+            phase = w * (now - self._t0) + self.id
+            self._position = self._rest + self._wave_amplitude * math.sin(phase)
+            self._velocity = self._wave_amplitude * w * math.cos(phase)
+        else:
+            self._velocity = 0.0
+        rpm = self._velocity * 60.0 / TICKS_PER_REV
+        struct.pack_into("<i", self.table, ADDR_PRESENT_VELOCITY, int(round(rpm / VELOCITY_UNIT_RPM)))
+        struct.pack_into("<i", self.table, ADDR_PRESENT_POSITION, int(round(self._position)))
+
+    def set_position(self, ticks: float) -> None:
+        """Move the servo by hand (only visible while torque is off)."""
+        self._advance()
+        self._position = self._rest = float(ticks)
+
+    def read(self, address: int, length: int) -> Tuple[int, bytes]:
+        """(error, data) for a read of length bytes at address."""
+        if address + length > TABLE_SIZE or length == 0:
+            return ERR_ACCESS, b""
+        if address < ADDR_PRESENT_POSITION + 4 and address + length > ADDR_PRESENT_VELOCITY:
+            self._advance()
+        return 0, bytes(self.table[address:address + length])
+
+    def write(self, address: int, data: bytes) -> int:
+        """Write data at address; returns the status error byte."""
+        if address + len(data) > TABLE_SIZE or not data:
+            return ERR_ACCESS
+        if address < EEPROM_END and self.torque_enabled:
+            return ERR_ACCESS
+        if address <= ADDR_TORQUE_ENABLE < address + len(data):
+            # Torque switch: integrate up to now under the old mode
+            self._advance()
+            if data[ADDR_TORQUE_ENABLE - address] and not self.torque_enabled:
+                struct.pack_into("<i", self.table, ADDR_GOAL_POSITION, int(round(self._position)))
+        self.table[address:address + len(data)] = data
+        return 0
+
+
+class DynamixelBusEmulator:
+    """
+    Emulated Dynamixel bus behind a pty. Point PortHandler (or any serial code) at .port.
+    Runs in a background thread (start/stop) or in the caller's thread (serve_forever).
+    """
+
+    def __init__(
+        self,
+        servos: Sequence[EmulatedServo],
+        latency_timer_s: float = 0.0,
+        link: Optional[str] = None,
+    ):
+        self._servos: Dict[int, EmulatedServo] = {}
+        for servo in servos:
+            if servo.id in self._servos:
+                raise ValueError(f"duplicate servo ID {servo.id}")
+            self._servos[servo.id] = servo
+        self._latency_timer_s = latency_timer_s
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self._port = os.ttyname(self._slave)
+        self._link = link
+        if link:
+            if os.path.islink(link):
+                os.unlink(link)
+            os.symlink(self._port, link)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._rx = bytearray()
+        self._rx_start = 0.0
+        self._busy_until = 0.0
+        self._stats: Dict[str, int] = {
+            "packets": 0,
+            "replies": 0,
+            "crc_errors": 0,
+            "baud_mismatch": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+        }
+        self._by_instruction: Dict[int, int] = {}
+        self._wire_s = 0.0
+        self._t0 = time.monotonic()
+
+    @property
+    def port(self) -> str:
+        """Path to open (the symlink when one was requested)."""
+        return self._link or self._port
+
+    @property
+    def servos(self) -> Dict[int, EmulatedServo]:
+        return self._servos
+
+    def host_baudrate(self) -> Optional[int]:
+        """Baud rate the host configured on the pty; None if it is not a standard rate."""
+        try:
+            return _TERMIOS_BAUDS.get(termios.tcgetattr(self._slave)[5])
+        except termios.error:
+            return None
+
+    # --- packet handling ---
+
+    def _take_packet(self) -> Optional[Tuple[bytes, bool]]:
+        """Next complete packet from the rx buffer as (unstuffed packet, crc_ok); drops leading noise."""
+        buf = self._rx
+        start = buf.find(HEADER)
+        if start < 0:
+            # Keep a possible partial header
+            del buf[:max(0, len(buf) - 3)]
+            return None
+        if start:
+            del buf[:start]
+        if len(buf) < _PREFIX:
+            return None
+        length = buf[5] | (buf[6] << 8)
+        total = _PREFIX + length
+        if len(buf) < total:
+            return None
+        raw = bytes(buf[:total])
+        del buf[:total]
+        ok = crc16(raw[:-2]) == (raw[-2] | (raw[-1] << 8))
+        body = _unstuff(raw[_PREFIX:-2])
+        return raw[:_PREFIX] + body, ok
+
+    def _status(self, servo: EmulatedServo, error: int, data: bytes = b"") -> Tuple[EmulatedServo, bytes]:
+        return servo, build_packet(servo.id, INST_STATUS, bytes([error]) + data)
+
+    def _dispatch(self, dxl_id: int, inst: int, params: bytes, baud: Optional[int]) -> List[Tuple[EmulatedServo, bytes]]:
+        """Status packets to send, in bus order, from servos that can hear the host."""
+        def listening(sid: int) -> Optional[EmulatedServo]:
+            servo = self._servos.get(sid)
+            if servo is None:
+                return None
+            if baud is not None and servo.baudrate != baud:
+                self._stats["baud_mismatch"] += 1
+                return None
+            return servo
+
+        out: List[Tuple[EmulatedServo, bytes]] = []
+        if inst == INST_PING:
+            ids = sorted(self._servos) if dxl_id == BROADCAST_ID else [dxl_id]
+            for sid in ids:
+                servo = listening(sid)
+                if servo is not None:
+                    out.append(self._status(servo, 0, struct.pack("<HB", servo.model_number(), servo.table[ADDR_FIRMWARE])))
+        elif inst == INST_READ:
+            servo = listening(dxl_id)
+            if servo is not None:
+                if len(params) != 4:
+                    return [self._status(servo, ERR_DATA_LENGTH)]
+                address, length = struct.unpack("<HH", params)
+                out.append(self._status(servo, *servo.read(address, length)))
+        elif inst == INST_WRITE:
+            if len(params) < 3:
+                servo = listening(dxl_id)
+                return [self._status(servo, ERR_DATA_LENGTH)] if servo is not None else []
+            address = params[0] | (params[1] << 8)
+            targets = sorted(self._servos) if dxl_id == BROADCAST_ID else [dxl_id]
+            for sid in targets:
+                servo = listening(sid)
+                if servo is None:
+                    continue
+                error = servo.write(address, params[2:])
+                if dxl_id != BROADCAST_ID:
+                    out.append(self._status(servo, error))
+            self._rekey()
+        elif inst == INST_SYNC_READ and len(params) >= 4:
+            address, length = struct.unpack_from("<HH", params)
+            for sid in params[4:]:
+                servo = listening(sid)
+                if servo is not None:
+                    out.append(self._status(servo, *servo.read(address, length)))
+        elif inst == INST_SYNC_WRITE and len(params) >= 4:
+            address, length = struct.unpack_from("<HH", params)
+            step = 1 + length
+            for pos in range(4, len(params) - step + 1, step):
+                servo = listening(params[pos])
+                if servo is not None:
+                    servo.write(address, params[pos + 1:pos + step])
+            self._rekey()
+        elif inst == INST_BULK_READ:
+            for pos in range(0, len(params) - 4, 5):
+                sid, address, length = struct.unpack_from("<BHH", params, pos)
+                servo = listening(sid)
+                if servo is not None:
+                    out.append(self._status(servo, *servo.read(address, length)))
+        elif inst == INST_BULK_WRITE:
+            pos = 0
+            while pos + 5 <= len(params):
+                sid, address, length = struct.unpack_from("<BHH", params, pos)
+                data = params[pos + 5:pos + 5 + length]
+                pos += 5 + length
+                servo = listening(sid)
+                if servo is not None:
+                    servo.write(address, data)
+            self._rekey()
+        elif dxl_id != BROADCAST_ID:
+            servo = listening(dxl_id)
+            if servo is not None:
+                out.append(self._status(servo, ERR_INSTRUCTION))
+        return out
+
+    def _rekey(self) -> None:
+        """Follow ID register writes."""
+        if any(sid != servo.id for sid, servo in self._servos.items()):
+            self._servos = {servo.id: servo for servo in self._servos.values()}
+
+    # --- timing ---
+
+    def _deliver(self, chunks: List[Tuple[float, bytes]]) -> None:
+        """Write each chunk to the pty at its delivery time."""
+        for at, data in chunks:
+            delay = at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            os.write(self._master, data)
+            self._stats["bytes_out"] += len(data)
+
+    def _schedule(self, start: float, replies: List[Tuple[EmulatedServo, bytes]], baud: int) -> List[Tuple[float, bytes]]:
+        """
+        Delivery times for the status packets: each servo waits its return delay after the
+        previous packet, then its packet takes len * 10 / baud on the wire.
+        """
+        byte_s = BITS_PER_BYTE / float(baud)
+        t = start
+        timed: List[Tuple[float, bytes]] = []
+        for servo, packet in replies:
+            t += servo.return_delay_s
+            timed.append((t, packet))
+            t += len(packet) * byte_s
+        self._busy_until = t
+        if not self._latency_timer_s:
+            return [(at + len(packet) * byte_s, packet) for at, packet in timed]
+        # USB-serial adapter: bytes reach the host per full USB packet or when the latency timer expires
+        chunks: List[Tuple[float, bytes]] = []
+        pending = bytearray()
+        last = start
+        for at, packet in timed:
+            for i, b in enumerate(packet):
+                pending.append(b)
+                last = at + (i + 1) * byte_s
+                if len(pending) == USB_PACKET_PAYLOAD:
+                    chunks.append((last, bytes(pending)))
+                    pending.clear()
+        if pending:
+            chunks.append((last + self._latency_timer_s, bytes(pending)))
+        return chunks
+
+    def _handle(self, packet: bytes, received_at: float) -> None:
+        dxl_id, inst = packet[4], packet[7]
+        params = packet[8:]
+        self._stats["packets"] += 1
+        self._by_instruction[inst] = self._by_instruction.get(inst, 0) + 1
+        baud = self.host_baudrate()
+        # Unknown host rate (non-standard termios speed): time the bus at the servos' rate
+        wire_baud = baud or min((s.baudrate for s in self._servos.values()), default=57600)
+        with self._lock:
+            replies = self._dispatch(dxl_id, inst, params, baud)
+        # The instruction itself is on the wire for len * 10 / baud after its first byte
+        inst_bytes = _PREFIX + (packet[5] | (packet[6] << 8))
+        start = max(received_at + inst_bytes * BITS_PER_BYTE / float(wire_baud), time.monotonic())
+        chunks = self._schedule(start, replies, wire_baud)
+        self._wire_s += self._busy_until - received_at
+        self._stats["replies"] += len(replies)
+        self._deliver(chunks)
+
+    def _poll(self, timeout_s: float) -> None:
+        try:
+            ready, _, _ = select.select([self._master], [], [], timeout_s)
+        except (OSError, ValueError):
+            return
+        if not ready:
+            return
+        try:
+            data = os.read(self._master, 4096)
+        except OSError as e:
+            if e.errno in (errno.EIO, errno.EAGAIN):
+                # EIO: no process has the pty open right now
+                time.sleep(timeout_s)
+                return
+            raise
+        now = time.monotonic()
+        if not self._rx:
+            self._rx_start = now
+        self._rx += data
+        self._stats["bytes_in"] += len(data)
+        while True:
+            taken = self._take_packet()
+            if taken is None:
+                break
+            packet, ok = taken
+            if not ok:
+                # Servos drop packets with a bad CRC silently
+                self._stats["crc_errors"] += 1
+            else:
+                self._handle(packet, self._rx_start)
+            self._rx_start = time.monotonic()
+
+    def serve_forever(self) -> None:
+        while not self._stop.is_set():
+            self._poll(0.05)
+
+    def start(self) -> "DynamixelBusEmulator":
+        """Serve in a daemon thread; returns self."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.serve_forever, name="dxl-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if self._link and os.path.islink(self._link):
+            os.unlink(self._link)
+
+    def get_stats(self) -> Dict[str, object]:
+        elapsed = time.monotonic() - self._t0
+        return {
+            "port": self.port,
+            "host_baudrate": self.host_baudrate(),
+            "servos": sorted(self._servos),
+            **self._stats,
+            "by_instruction": {f"0x{k:02x}": v for k, v in sorted(self._by_instruction.items())},
+            "wire_occupancy": self._wire_s / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def parse_ids(spec: str) -> List[int]:
+    """'1-7,9' -> [1, 2, 3, 4, 5, 6, 7, 9]"""
+    ids: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ids.extend(range(int(lo), int(hi) + 1))
+        else:
+            ids.append(int(part))
+    return ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dynamixel Protocol 2.0 bus emulator on a pty")
+    parser.add_argument("--ids", default="1-7", help="servo IDs, e.g. 1-7 or 1-7,8-14")
+    parser.add_argument("--model", default="XL330-M288", choices=sorted(MODELS))
+    parser.add_argument("--baud", type=int, default=57600)
+    parser.add_argument("--return-delay-us", type=int, default=500, help="Return Delay Time (register 9 x 2 us)")
+    parser.add_argument("--latency-timer-ms", type=float, default=0.0, help="USB-serial latency timer (0: off)")
+    parser.add_argument("--wave", type=float, default=0.0, help="oscillation amplitude (ticks) of untorqued servos")
+    parser.add_argument("--link", default=None, help="also expose the pty under this path (symlink)")
+    args = parser.parse_args()
+    servos = [
+        EmulatedServo(i, args.model, args.baud, args.return_delay_us, wave_amplitude=args.wave)
+        for i in parse_ids(args.ids)
+    ]
+    emulator = DynamixelBusEmulator(servos, args.latency_timer_ms / 1000.0, link=args.link)
+    print(f"Emulated Dynamixel bus on {emulator.port} (IDs {sorted(emulator.servos)}, {args.baud} bps)", flush=True)
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(emulator.get_stats())
+        emulator.close()
+
+
+if __name__ == "__main__":
+    main()
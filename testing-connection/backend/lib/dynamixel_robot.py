@@ -1,9 +1,10 @@
 """DynamixelRobot for testing-connection. Standalone, no gello_software."""
-from typing import Dict, Optional, Sequence, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import numpy as np
 
 from .dynamixel_driver import DynamixelDriver, DynamixelDriverProtocol, FakeDynamixelDriver
+from .state_estimator import JointStateEstimator
 
 
 class DynamixelRobot:
@@ -19,6 +20,8 @@ class DynamixelRobot:
         baudrate: int = 57600,
         gripper_config: Optional[Tuple[int, float, float]] = None,
         start_joints: Optional[np.ndarray] = None,
+        read_hz: float = 500.0,
+        velocity_filter: str = "alpha_beta",
     ):
         self.gripper_open_close: Optional[Tuple[float, float]] = None
         if gripper_config is not None:
@@ -40,10 +43,13 @@ class DynamixelRobot:
         self._last_pos = None
 
         assert len(self._joint_ids) == len(self._joint_offsets) == len(self._joint_signs)
+        # Velocities: Present Velocity registers when the driver has them, else position differencing
+        self._velocity_estimator = JointStateEstimator(len(self._joint_ids), method=velocity_filter)
+        self._hw_velocities = np.zeros(len(self._joint_ids))
 
         if real:
             self._driver: DynamixelDriverProtocol = DynamixelDriver(
-                list(self._joint_ids), port=port, baudrate=baudrate
+                list(self._joint_ids), port=port, baudrate=baudrate, read_hz=read_hz
             )
             self._driver.set_torque_mode(False)
         else:
@@ -88,6 +94,19 @@ class DynamixelRobot:
 
         return pos
 
+    def get_hardware_velocities(self) -> Optional[np.ndarray]:
+        """Joint velocities from the servos (same signs and gripper scale as get_joint_state), or None."""
+        get_velocities = getattr(self._driver, "get_velocities", None)
+        if get_velocities is None:
+            return None
+        vel = get_velocities(out=self._hw_velocities)
+        if vel is None:
+            return None
+        vel *= self._joint_signs
+        if self.gripper_open_close is not None:
+            vel[-1] /= self.gripper_open_close[1] - self.gripper_open_close[0]
+        return vel
+
     def command_joint_state(self, joint_state: np.ndarray) -> None:
         arr = np.array(joint_state, dtype=float)
         if self.gripper_open_close is not None and len(arr) == len(self._joint_ids):
@@ -102,12 +121,17 @@ class DynamixelRobot:
             self._driver.set_torque_mode(mode)
             self._torque_on = mode
 
+    def get_bus_stats(self) -> Dict[str, Any]:
+        get_stats = getattr(self._driver, "get_bus_stats", None)
+        return get_stats() if get_stats else {}
+
     def get_observations(self) -> Dict[str, np.ndarray]:
         js = self.get_joint_state()
         n = len(js)
+        vel = self._velocity_estimator.update(js, velocities=self.get_hardware_velocities())
         return {
             "joint_positions": js,
-            "joint_velocities": np.zeros(n),
+            "joint_velocities": vel.copy(),
             "ee_pos_quat": np.zeros(7),
             "gripper_position": js[-1] if n > 0 else np.array(0.0),
         }
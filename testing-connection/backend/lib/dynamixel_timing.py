@@ -0,0 +1,77 @@
+"""Dynamixel Protocol 2.0 wire-time model and bus occupancy accounting."""
+import threading
+import time
+from typing import Dict
+
+# Protocol 2.0 packet sizes (bytes, excluding byte stuffing):
+# header(3)+reserved(1)+id(1)+length(2)+instruction(1) ... crc(2)
+_INST_OVERHEAD = 10
+_STATUS_OVERHEAD = 11  # + error byte
+# Default Return Delay Time register (9) is 250 -> 2 us units = 500 us
+DEFAULT_RETURN_DELAY_S = 500e-6
+BITS_PER_BYTE = 10  # 8N1
+
+
+def sync_read_bytes(n_ids: int, data_len: int) -> int:
+    """Bytes on the wire for one Sync Read: instruction + one status packet per ID."""
+    inst = _INST_OVERHEAD + 4 + n_ids  # addr(2) + len(2) + ids
+    return inst + n_ids * (_STATUS_OVERHEAD + data_len)
+
+
+def sync_write_bytes(n_ids: int, data_len: int) -> int:
+    """Bytes on the wire for one Sync Write (no status packets)."""
+    return _INST_OVERHEAD + 4 + n_ids * (1 + data_len)
+
+
+def single_write_bytes(data_len: int) -> int:
+    """Bytes on the wire for one Write instruction and its status packet."""
+    return _INST_OVERHEAD + 2 + data_len + _STATUS_OVERHEAD
+
+
+def wire_time_s(n_bytes: int, baudrate: int, n_responses: int = 0,
+                return_delay_s: float = DEFAULT_RETURN_DELAY_S) -> float:
+    """Transmission time of n_bytes plus the servos' return delay before each response."""
+    return n_bytes * BITS_PER_BYTE / float(baudrate) + n_responses * return_delay_s
+
+
+class BusUsage:
+    """
+    Accumulates measured bus transaction time and wire bytes.
+    Occupancy = time spent inside bus transactions / wall time since reset.
+    """
+
+    def __init__(self, baudrate: int):
+        self._baudrate = baudrate
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._since = time.perf_counter()
+            self._busy_s = 0.0
+            self._bytes = 0
+            self._transactions = 0
+            self._ticks = 0
+
+    def add(self, busy_s: float, n_bytes: int) -> None:
+        with self._lock:
+            self._busy_s += busy_s
+            self._bytes += n_bytes
+            self._transactions += 1
+
+    def tick(self) -> None:
+        self._ticks += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            elapsed = time.perf_counter() - self._since
+            ticks = self._ticks or 1
+            return {
+                "baudrate": self._baudrate,
+                "occupancy": self._busy_s / elapsed if elapsed > 0 else 0.0,
+                "wire_occupancy": (self._bytes * BITS_PER_BYTE / self._baudrate) / elapsed if elapsed > 0 else 0.0,
+                "busy_ms_per_tick": self._busy_s * 1000.0 / ticks,
+                "bytes_per_tick": self._bytes / ticks,
+                "transactions": self._transactions,
+                "ticks": self._ticks,
+            }
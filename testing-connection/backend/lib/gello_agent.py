@@ -1,6 +1,6 @@
 """GelloAgent for testing-connection. Standalone, no gello_software."""
 from dataclasses import dataclass
-from typing import Dict, Optional, Sequence, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -58,3 +58,6 @@ class GelloAgent:
 
     def act(self, obs: Dict) -> np.ndarray:
         return self._robot.get_joint_state()
+
+    def get_bus_stats(self) -> Dict[str, Any]:
+        return self._robot.get_bus_stats()
@@ -1,9 +1,13 @@
 """PiperRobot for testing-connection. CAN bus connection to Piper robot arm."""
 from typing import Dict, Optional
+import os
 import time
 
 import numpy as np
 
+from .can_budget import get_can_budget
+from .state_estimator import JointStateEstimator
+
 # Conversion factor: radians to Piper internal units
 FACTOR = 57295.7795
 
@@ -11,6 +15,20 @@ FACTOR = 57295.7795
 _robot_instances: Dict[str, "PiperRobot"] = {}
 
 
+def use_sim() -> bool:
+    """PIPER_SDK=sim swaps piper_sdk for the simulated arm in lib/piper_sim.py."""
+    return os.environ.get("PIPER_SDK", "").strip().lower() == "sim"
+
+
+def piper_interface_class():
+    """C_PiperInterface, or SimPiperInterface when PIPER_SDK=sim. Raises ImportError without piper_sdk."""
+    if use_sim():
+        from .piper_sim import SimPiperInterface
+        return SimPiperInterface
+    from piper_sdk import C_PiperInterface
+    return C_PiperInterface
+
+
 def get_piper_robot(channel: str = "can_follower", enable: bool = True) -> "PiperRobot":
     """Get or create a PiperRobot instance (singleton per channel)."""
     global _robot_instances
@@ -22,16 +40,30 @@ def get_piper_robot(channel: str = "can_follower", enable: bool = True) -> "Pipe
 class PiperRobot:
     """Piper robot arm via CAN bus (piper_sdk)."""
 
-    def __init__(self, channel: str = "can_follower", enable: bool = True):
+    # ModeCtrl(ctrl_mode=CAN, move_mode=MOVE_J, speed 30%, position mode)
+    CONTROL_MODE = (0x01, 0x01, 30, 0x00)
+
+    def __init__(
+        self,
+        channel: str = "can_follower",
+        enable: bool = True,
+        gripper_deadband: Optional[float] = None,
+        gripper_max_hz: Optional[float] = None,
+        mode_refresh_s: Optional[float] = None,
+        velocity_filter: str = "alpha_beta",
+    ):
         """
         Initialize Piper robot.
         
         Args:
             channel: CAN bus channel name (e.g., "can_follower", "can_master", "can0")
             enable: Whether to enable robot on init (needed for control)
+            gripper_deadband / gripper_max_hz / mode_refresh_s: CAN frame budget of the channel
+                (None keeps the current setting, see lib/can_budget.py)
+            velocity_filter: "alpha_beta" or "lowpass" velocity estimate from joint feedback
         """
         try:
-            from piper_sdk import C_PiperInterface
+            C_PiperInterface = piper_interface_class()
         except ImportError:
             raise ImportError("piper_sdk 未安装。请运行: pip install piper_sdk")
         
@@ -39,12 +71,19 @@ class PiperRobot:
         self._robot = C_PiperInterface(channel)
         self._robot.ConnectPort()
         self._enabled = False
+        self._budget = get_can_budget(channel)
+        self._budget.configure(gripper_deadband, gripper_max_hz, mode_refresh_s)
+        # New connection: the arm may have been reset since the last one
+        self._budget.invalidate()
         
         if enable:
             self._enable_robot()
         
         self._joint_state = np.zeros(7)
-        self._joint_velocities = np.zeros(7)
+        self._sample_time: Optional[float] = None
+        # The arm reports no velocities: difference the feedback on its own timestamps
+        self._velocity_estimator = JointStateEstimator(7, method=velocity_filter)
+        self._joint_velocities = self._velocity_estimator.velocities
 
     def _enable_robot(self):
         """Enable the robot arm."""
@@ -52,7 +91,9 @@ class PiperRobot:
             return
         max_attempts = 5  # Reduced from 10
         for i in range(max_attempts):
-            if self._robot.EnablePiper():
+            ok = self._robot.EnablePiper()
+            self._budget.sent("EnablePiper")
+            if ok:
                 self._enabled = True
                 break
             print(f"等待 Piper 使能中... ({i+1}/{max_attempts})")
@@ -83,6 +124,9 @@ class PiperRobot:
         joint_state[6] = (1 - joint_state[6]) / 1000 / 1000
 
         self._joint_state = joint_state
+        # Feedback frame time (wall clock); repeated reads of one frame are not new samples
+        stamp = getattr(joint_msg, "time_stamp", None)
+        self._sample_time = float(stamp) if stamp else time.time()
         return self._joint_state
 
     def command_joint_state(self, joint_state: np.ndarray, skip_enable: bool = False) -> None:
@@ -98,11 +142,25 @@ class PiperRobot:
         # Convert: radians to internal units, 0-1 to gripper units
         cmd[:6] = cmd[:6] * FACTOR
         cmd[6] = (1 - cmd[6]) * 1000 * 1000
-        cmd = cmd.astype(int)
+        self._send(cmd.astype(int))
 
-        self._robot.ModeCtrl(0x01, 0x01, 30, 0x00)
+    def _send(self, cmd: np.ndarray) -> None:
+        """Send 6 joint targets + gripper angle (internal units), skipping frames the budget deems redundant."""
+        budget = self._budget
+        mode = self.CONTROL_MODE
+        if budget.want_mode(mode):
+            self._robot.ModeCtrl(*mode)
+            budget.sent("ModeCtrl", mode)
         self._robot.JointCtrl(*cmd[:6])
-        self._robot.GripperCtrl(abs(cmd[6]), 1000, 0x01, 0)
+        budget.sent("JointCtrl")
+        gripper = abs(int(cmd[6]))
+        if budget.want_gripper(gripper):
+            self._robot.GripperCtrl(gripper, 1000, 0x01, 0)
+            budget.sent("GripperCtrl", gripper)
+
+    def get_can_stats(self) -> Dict:
+        """Command frames sent / suppressed, frames per second and estimated bus load of this channel."""
+        return self._budget.get_stats()
 
     def set_torque_mode(self, mode: bool) -> None:
         """Enable/disable torque (Piper handles this internally)."""
@@ -112,6 +170,7 @@ class PiperRobot:
     def get_observations(self) -> Dict[str, np.ndarray]:
         """Get robot observations."""
         self.get_joint_state()
+        self._joint_velocities = self._velocity_estimator.update(self._joint_state, t=self._sample_time)
         return {
             "joint_positions": self._joint_state.tolist(),
             "joint_velocities": self._joint_velocities.tolist(),
@@ -159,18 +218,14 @@ class PiperRobot:
         
         # Convert all joints from radians to internal units (including gripper)
         cmd_int = (cmd * FACTOR).astype(int)
-        
-        self._robot.ModeCtrl(0x01, 0x01, 30, 0x00)
-        self._robot.JointCtrl(*cmd_int[:6])
-        # Gripper: use angle in internal units, with default speed
-        self._robot.GripperCtrl(abs(cmd_int[6]), 1000, 0x01, 0)
+        # Gripper: angle in internal units, with default speed
+        self._send(cmd_int)
 
 
 def test_piper_connection(channel: str = "can_follower") -> Dict:
     """Test Piper CAN connection."""
     try:
-        from piper_sdk import C_PiperInterface
-        robot = C_PiperInterface(channel)
+        robot = piper_interface_class()(channel)
         robot.ConnectPort()
         
         # Try to get joint state
@@ -186,38 +241,40 @@ def test_piper_connection(channel: str = "can_follower") -> Dict:
 
 
 def list_can_channels():
-    """List available CAN channels."""
-    import subprocess
-    try:
-        result = subprocess.run(
-            ["ip", "link", "show"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        lines = result.stdout.split("\n")
-        channels = []
-        for line in lines:
-            if "link/can" in line.lower() or "can" in line.lower():
-                # Extract interface name
-                parts = line.split(":")
-                if len(parts) >= 2:
-                    name = parts[1].strip().split()[0]
-                    if name.startswith("can"):
-                        channels.append(name)
-        # Also check common names
-        for name in ["can_follower", "can_master", "can0", "can1"]:
-            if name not in channels:
-                try:
-                    result = subprocess.run(
-                        ["ip", "link", "show", name],
-                        capture_output=True,
-                        timeout=2
-                    )
-                    if result.returncode == 0:
-                        channels.append(name)
-                except Exception:
-                    pass
-        return list(set(channels))
-    except Exception:
-        return []
+    """List available CAN channels (cached sysfs scan, see lib/can_sysfs.py)."""
+    if use_sim():
+        from .piper_sim import sim_channels
+        return list(sim_channels())
+    from .can_sysfs import get_can_interface_cache
+    return get_can_interface_cache().channels()
+
+
+def can_channel_stats(channel: Optional[str] = None) -> Dict[str, Dict]:
+    """Per-channel TX/RX frame, error and bus-off counters (all CAN channels, or just channel)."""
+    channels = [channel] if channel else list_can_channels()
+    if use_sim():
+        from .piper_sim import get_sim_arm, sim_channels
+        out = {}
+        for name in channels:
+            if name not in sim_channels():
+                continue
+            arm = get_sim_arm(name).get_can_stats()
+            out[name] = {
+                "channel": name,
+                "is_can": True,
+                "operstate": "up",
+                "tx_packets": arm["tx_frames"],
+                "rx_packets": arm["rx_frames"],
+                "tx_errors": 0,
+                "rx_errors": 0,
+                "bus_off": 0,
+            }
+        return out
+    from .can_sysfs import get_can_interface_cache
+    cache = get_can_interface_cache()
+    out = {}
+    for name in channels:
+        stats = cache.stats(name)
+        if stats is not None:
+            out[name] = stats
+    return out
@@ -0,0 +1,216 @@
+"""
+Simulated Piper arm behind the piper_sdk C_PiperInterface API (no CAN hardware).
+
+Selected with PIPER_SDK=sim (see piper_robot.piper_interface_class); options from the environment:
+
+    PIPER_SIM_CHANNELS         channels that "exist" (default can_follower,can_master)
+    PIPER_SIM_LATENCY_MS       added to every SDK call (default 0)
+    PIPER_SIM_ENABLE_FAILURES  EnablePiper() calls that fail before one succeeds; -1 never enables (default 0)
+    PIPER_SIM_TAU_MS           joint/gripper time constant (default 50)
+
+Arm state lives per channel, so every interface opened on a channel sees the same arm (like the
+real bus). Joints move toward the last JointCtrl/GripperCtrl target with first-order dynamics, but
+only while enabled and in CAN control mode. Every command counts the CAN frames the real SDK
+sends. Feedback frames are counted at the arm's report rate (reads are served from that feedback
+and send nothing).
+"""
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from .can_budget import BITS_PER_FRAME, CAN_BITRATE, FEEDBACK_FRAMES_PER_CYCLE, FEEDBACK_HZ, FRAMES_PER_CALL
+
+CTRL_MODE_CAN = 0x01
+DEFAULT_CHANNELS = ("can_follower", "can_master")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def sim_channels() -> Sequence[str]:
+    value = os.environ.get("PIPER_SIM_CHANNELS")
+    if value is None:
+        return DEFAULT_CHANNELS
+    return tuple(c.strip() for c in value.split(",") if c.strip())
+
+
+class _Msg:
+    """Attribute bag standing in for the SDK's message classes."""
+
+    def __init__(self, **fields: Any):
+        self.__dict__.update(fields)
+
+
+class SimPiperArm:
+    """One simulated arm (per CAN channel): dynamics, enable state and CAN frame counters."""
+
+    def __init__(self, channel: str, tau_s: float = 0.05, clock=time.monotonic):
+        if tau_s <= 0:
+            raise ValueError("tau_s must be > 0")
+        self.channel = channel
+        self._tau_s = tau_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Internal units: joints 0.001 deg, gripper 0.001 mm (what the SDK reports)
+        self._q = np.zeros(7)
+        self._target = np.zeros(7)
+        self._t = clock()
+        self.enabled = False
+        self.ctrl_mode = 0
+        self.enable_failures = 0
+        self._since = clock()
+        self._tx: Dict[str, int] = {name: 0 for name in FRAMES_PER_CALL}
+        self._calls: Dict[str, int] = {}
+
+    def _advance(self) -> None:
+        now = self._clock()
+        dt = now - self._t
+        self._t = now
+        if dt > 0 and self.enabled and self.ctrl_mode == CTRL_MODE_CAN:
+            self._q += (self._target - self._q) * (1.0 - math.exp(-dt / self._tau_s))
+
+    def count(self, call: str) -> None:
+        with self._lock:
+            self._calls[call] = self._calls.get(call, 0) + 1
+            if call in self._tx:
+                self._tx[call] += FRAMES_PER_CALL[call]
+
+    def enable(self) -> bool:
+        with self._lock:
+            if self.enable_failures < 0:
+                return False
+            if self.enable_failures > 0:
+                self.enable_failures -= 1
+                return False
+            self._advance()
+            self.enabled = True
+            return True
+
+    def set_mode(self, ctrl_mode: int) -> None:
+        with self._lock:
+            self._advance()
+            self.ctrl_mode = ctrl_mode
+
+    def set_joint_target(self, joints: Sequence[float]) -> None:
+        with self._lock:
+            self._advance()
+            self._target[:6] = joints
+
+    def set_gripper_target(self, angle: float) -> None:
+        with self._lock:
+            self._advance()
+            self._target[6] = angle
+
+    def read(self) -> np.ndarray:
+        with self._lock:
+            self._advance()
+            return self._q.copy()
+
+    def get_can_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(self._clock() - self._since, 1e-9)
+            tx = sum(self._tx.values())
+            rx = int(elapsed * FEEDBACK_HZ) * FEEDBACK_FRAMES_PER_CYCLE
+            return {
+                "channel": self.channel,
+                "enabled": self.enabled,
+                "tx_frames": tx,
+                "tx_frames_by_call": dict(self._tx),
+                "rx_frames": rx,
+                "tx_fps": tx / elapsed,
+                "rx_fps": rx / elapsed,
+                "bus_load": (tx + rx) * BITS_PER_FRAME / (elapsed * CAN_BITRATE),
+                "calls": dict(self._calls),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._since = self._clock()
+            self._tx = {name: 0 for name in FRAMES_PER_CALL}
+            self._calls = {}
+
+
+_arms: Dict[str, SimPiperArm] = {}
+_arms_lock = threading.Lock()
+
+
+def get_sim_arm(channel: str) -> SimPiperArm:
+    """The simulated arm on channel (created on first use with the PIPER_SIM_* settings)."""
+    with _arms_lock:
+        arm = _arms.get(channel)
+        if arm is None:
+            arm = SimPiperArm(channel, tau_s=_env_float("PIPER_SIM_TAU_MS", 50.0) / 1000.0)
+            arm.enable_failures = int(_env_float("PIPER_SIM_ENABLE_FAILURES", 0))
+            _arms[channel] = arm
+        return arm
+
+
+def reset_sim_arms() -> None:
+    with _arms_lock:
+        _arms.clear()
+
+
+class SimPiperInterface:
+    """Drop-in for piper_sdk.C_PiperInterface (the calls this backend uses)."""
+
+    def __init__(self, can_name: str = "can0", *args: Any, latency_s: Optional[float] = None, **kwargs: Any):
+        self._can_name = can_name
+        self._latency_s = _env_float("PIPER_SIM_LATENCY_MS", 0.0) / 1000.0 if latency_s is None else latency_s
+        self._arm: Optional[SimPiperArm] = None
+
+    def _call(self, name: str) -> SimPiperArm:
+        if self._latency_s > 0:
+            time.sleep(self._latency_s)
+        if self._arm is None:
+            raise RuntimeError(f"CAN port {self._can_name} not connected (call ConnectPort first)")
+        self._arm.count(name)
+        return self._arm
+
+    def ConnectPort(self, *args: Any, **kwargs: Any) -> None:
+        if self._latency_s > 0:
+            time.sleep(self._latency_s)
+        if self._can_name not in sim_channels():
+            raise OSError(f"CAN interface {self._can_name} does not exist")
+        self._arm = get_sim_arm(self._can_name)
+
+    def DisconnectPort(self, *args: Any, **kwargs: Any) -> None:
+        self._arm = None
+
+    def EnablePiper(self) -> bool:
+        return self._call("EnablePiper").enable()
+
+    def ModeCtrl(self, ctrl_mode: int = 0x01, move_mode: int = 0x01, move_spd_rate_ctrl: int = 50,
+                 is_mit_mode: int = 0x00, *args: Any) -> None:
+        self._call("ModeCtrl").set_mode(ctrl_mode)
+
+    def JointCtrl(self, joint_1: int, joint_2: int, joint_3: int, joint_4: int, joint_5: int, joint_6: int) -> None:
+        self._call("JointCtrl").set_joint_target((joint_1, joint_2, joint_3, joint_4, joint_5, joint_6))
+
+    def GripperCtrl(self, gripper_angle: int = 0, gripper_effort: int = 0, gripper_code: int = 0,
+                    set_zero: int = 0) -> None:
+        self._call("GripperCtrl").set_gripper_target(gripper_angle)
+
+    def GetArmJointMsgs(self) -> _Msg:
+        q = self._call("GetArmJointMsgs").read()
+        joints = {f"joint_{i + 1}": int(round(q[i])) for i in range(6)}
+        return _Msg(time_stamp=time.time(), Hz=FEEDBACK_HZ, joint_state=_Msg(**joints))
+
+    def GetArmGripperMsgs(self) -> _Msg:
+        q = self._call("GetArmGripperMsgs").read()
+        return _Msg(
+            time_stamp=time.time(),
+            Hz=FEEDBACK_HZ,
+            gripper_state=_Msg(grippers_angle=int(round(q[6])), grippers_effort=0, status_code=0),
+        )
+
+    def get_can_stats(self) -> Dict[str, Any]:
+        """Simulator only: CAN frame counters and estimated bus load of this channel."""
+        return self._arm.get_can_stats() if self._arm is not None else {}
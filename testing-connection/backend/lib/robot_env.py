@@ -4,37 +4,73 @@ from typing import Any, Dict, Optional
 
 import numpy as np
 
+from .state_estimator import JointStateEstimator
+
 
 class Rate:
+    """Fixed-rate sleeper on absolute monotonic deadlines; overruns skip ahead instead of drifting."""
+
     def __init__(self, rate: float):
-        self.last = time.time()
         self.rate = rate
+        self._period = 1.0 / rate
+        self._deadline = time.monotonic() + self._period
 
     def sleep(self):
-        while self.last + 1.0 / self.rate > time.time():
-            time.sleep(0.0001)
-        self.last = time.time()
+        now = time.monotonic()
+        if now < self._deadline:
+            time.sleep(self._deadline - now)
+            self._deadline += self._period
+        else:
+            missed = int((now - self._deadline) / self._period) + 1
+            self._deadline += missed * self._period
 
 
 class RobotEnv:
-    """Environment wrapping a robot (e.g. ZMQClientRobot) with step/get_obs."""
+    """
+    Environment wrapping a robot (e.g. ZMQClientRobot) with step/get_obs.
+    If the robot has step(joints) -> observations (one round trip for ZMQClientRobot), step() uses it;
+    otherwise it commands and then reads. num_dofs is fetched once.
+    """
 
-    def __init__(self, robot, control_rate_hz: float = 100.0):
+    def __init__(self, robot, control_rate_hz: Optional[float] = 100.0):
+        """control_rate_hz=None: step() does not pace; the caller owns loop timing."""
         self._robot = robot
-        self._rate = Rate(control_rate_hz)
+        self._rate = Rate(control_rate_hz) if control_rate_hz else None
+        self._num_dofs: Optional[int] = None
+        self._robot_step = getattr(robot, "step", None)
+        # Used only for robots whose observations carry no joint_velocities
+        self._velocity_estimator = JointStateEstimator()
+
+    def num_dofs(self) -> int:
+        if self._num_dofs is None:
+            self._num_dofs = self._robot.num_dofs()
+        return self._num_dofs
 
     def step(self, joints: np.ndarray) -> Dict[str, Any]:
-        assert len(joints) == self._robot.num_dofs()
+        """Command joints and return observations. With a combined step they are taken before pacing."""
+        assert len(joints) == self.num_dofs()
+        if self._robot_step is not None:
+            obs = self._format_obs(self._robot_step(joints))
+            if self._rate is not None:
+                self._rate.sleep()
+            return obs
         self._robot.command_joint_state(joints)
-        self._rate.sleep()
+        if self._rate is not None:
+            self._rate.sleep()
         return self.get_obs()
 
     def get_obs(self) -> Dict[str, Any]:
-        robot_obs = self._robot.get_observations()
+        return self._format_obs(self._robot.get_observations())
+
+    def _format_obs(self, robot_obs: Dict[str, Any]) -> Dict[str, Any]:
         # Ensure keys expected by teleop
+        positions = robot_obs.get("joint_positions", robot_obs.get("joint_state", np.zeros(7)))
+        velocities = robot_obs.get("joint_velocities")
+        if velocities is None:
+            velocities = self._velocity_estimator.update(positions).copy()
         return {
-            "joint_positions": robot_obs.get("joint_positions", robot_obs.get("joint_state", np.zeros(7))),
-            "joint_velocities": robot_obs.get("joint_velocities", np.zeros(self._robot.num_dofs())),
+            "joint_positions": positions,
+            "joint_velocities": velocities,
             "ee_pos_quat": robot_obs.get("ee_pos_quat", np.zeros(7)),
             "gripper_position": robot_obs.get("gripper_position", np.array(0.0)),
         }
@@ -0,0 +1,248 @@
+"""
+Simulated ZMQ robot server: stands in for a quick_run robot server on localhost, no hardware.
+
+Speaks the same methods (num_dofs, get_joint_state, command_joint_state, get_observations, plus
+step) in pickle and the binary wire format. Joints follow the commanded goal with first-order
+dynamics. Each request can be delayed by a service time plus uniform jitter, or dropped (no reply)
+with a given probability. It uses a ROUTER socket, so REQ and DEALER clients both work.
+
+    python -m lib.sim_robot_server --port 6001 --dofs 7 --service-ms 1 --jitter-ms 0.5 --drop 0.01
+"""
+import argparse
+import math
+import pickle
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import zmq
+
+from .zmq_wire import serve_message
+
+
+class SimRobot:
+    """First-order joint dynamics: q approaches the goal with time constant tau_s."""
+
+    def __init__(self, num_dofs: int = 7, tau_s: float = 0.05, clock=time.monotonic):
+        if tau_s <= 0:
+            raise ValueError("tau_s must be > 0")
+        self._n = num_dofs
+        self._tau_s = tau_s
+        self._clock = clock
+        self._q = np.zeros(num_dofs)
+        self._goal = np.zeros(num_dofs)
+        self._qd = np.zeros(num_dofs)
+        self._t = clock()
+
+    def num_dofs(self) -> int:
+        return self._n
+
+    def _advance(self) -> None:
+        # Integrated lazily, exactly, at request time: no simulation thread
+        now = self._clock()
+        dt = now - self._t
+        self._t = now
+        if dt <= 0:
+            return
+        err = self._goal - self._q
+        self._q += err * (1.0 - math.exp(-dt / self._tau_s))
+        np.divide(self._goal - self._q, self._tau_s, out=self._qd)
+
+    def get_joint_state(self) -> np.ndarray:
+        self._advance()
+        return self._q.copy()
+
+    def command_joint_state(self, joint_state) -> None:
+        goal = np.asarray(joint_state, dtype=np.float64)
+        if goal.shape != (self._n,):
+            raise ValueError(f"Expected {self._n} joints, got {goal.size}")
+        self._advance()
+        self._goal[:] = goal
+
+    def get_observations(self) -> Dict[str, np.ndarray]:
+        self._advance()
+        return {
+            "joint_positions": self._q.copy(),
+            "joint_velocities": self._qd.copy(),
+            "ee_pos_quat": np.zeros(7),
+            "gripper_position": self._q[-1:].copy(),
+        }
+
+    def dispatch(self, method: str, args: Dict[str, Any]) -> Any:
+        if method == "num_dofs":
+            return self.num_dofs()
+        if method == "get_joint_state":
+            return self.get_joint_state()
+        if method == "command_joint_state":
+            return self.command_joint_state(args["joint_state"])
+        if method == "get_observations":
+            return self.get_observations()
+        if method == "step":
+            self.command_joint_state(args["joint_state"])
+            return self.get_observations()
+        raise NotImplementedError(f"Invalid method: {method}")
+
+
+class SimRobotServer:
+    """
+    Serves a SimRobot on tcp://host:port from one thread, one request at a time (like quick_run).
+    wire=False behaves as a legacy pickle-only server: it ignores wire negotiation and has no "step".
+    """
+
+    def __init__(
+        self,
+        port: int = 6001,
+        host: str = "127.0.0.1",
+        robot: Optional[SimRobot] = None,
+        service_time_s: float = 0.0,
+        jitter_s: float = 0.0,
+        drop_rate: float = 0.0,
+        wire: bool = True,
+        seed: Optional[int] = None,
+    ):
+        if service_time_s < 0 or jitter_s < 0 or not 0.0 <= drop_rate < 1.0:
+            raise ValueError("service_time_s/jitter_s must be >= 0 and drop_rate in [0, 1)")
+        self._endpoint = f"tcp://{host}:{port}"
+        self.robot = robot or SimRobot()
+        self._service_time_s = service_time_s
+        self._jitter_s = jitter_s
+        self._drop_rate = drop_rate
+        self._wire = wire
+        self._random = random.Random(seed)
+        self._context = zmq.Context()
+        self._socket: Optional[zmq.Socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._requests = 0
+        self._replies = 0
+        self._dropped = 0
+        self._errors = 0
+        self._by_method: Dict[str, int] = {}
+
+    @property
+    def endpoint(self) -> str:
+        return self._endpoint
+
+    def _dispatch(self, method: str, args: Dict[str, Any]) -> Any:
+        self._by_method[method] = self._by_method.get(method, 0) + 1
+        try:
+            if not self._wire and method == "step":
+                raise NotImplementedError(f"Invalid method: {method}")
+            return self.robot.dispatch(method, args)
+        except Exception:
+            self._errors += 1
+            raise
+
+    def _handle(self, payload) -> bytes:
+        if self._wire:
+            return serve_message(payload, self._dispatch)
+        request = pickle.loads(payload)
+        try:
+            result = self._dispatch(request.get("method"), request.get("args", {}))
+        except Exception as e:
+            result = {"error": str(e)}
+        return pickle.dumps(result)
+
+    def _delay(self) -> None:
+        delay = self._service_time_s
+        if self._jitter_s:
+            delay += self._random.uniform(-self._jitter_s, self._jitter_s)
+        if delay > 0:
+            time.sleep(delay)
+
+    def bind(self) -> None:
+        """Bind the socket now (start() does it too); raises zmq.ZMQError if the port is taken."""
+        if self._socket is None:
+            sock = self._context.socket(zmq.ROUTER)
+            sock.setsockopt(zmq.LINGER, 0)
+            sock.bind(self._endpoint)
+            self._socket = sock
+
+    def serve_forever(self) -> None:
+        self.bind()
+        sock = self._socket
+        poller = zmq.Poller()
+        poller.register(sock, zmq.POLLIN)
+        try:
+            while not self._stop.is_set():
+                if not poller.poll(100):
+                    continue
+                frames = sock.recv_multipart(copy=False)
+                # [client identity, (request id), b"", payload]: everything up to the payload is the envelope
+                envelope, payload = frames[:-1], frames[-1]
+                self._requests += 1
+                self._delay()
+                if self._drop_rate and self._random.random() < self._drop_rate:
+                    self._dropped += 1
+                    continue
+                reply = self._handle(payload.buffer)
+                sock.send_multipart([f.bytes for f in envelope] + [reply])
+                self._replies += 1
+        finally:
+            sock.close()
+            self._socket = None
+
+    def start(self) -> "SimRobotServer":
+        """Serve in a daemon thread; returns self."""
+        self.bind()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.serve_forever, name="sim-robot-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self._context.term()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self._endpoint,
+            "requests": self._requests,
+            "replies": self._replies,
+            "dropped": self._dropped,
+            "errors": self._errors,
+            "by_method": dict(self._by_method),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulated ZMQ robot server (no hardware)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6001)
+    parser.add_argument("--dofs", type=int, default=7)
+    parser.add_argument("--tau-ms", type=float, default=50.0, help="joint time constant")
+    parser.add_argument("--service-ms", type=float, default=0.0, help="per-request service time")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter on the service time")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability of not replying")
+    parser.add_argument("--legacy", action="store_true", help="pickle only, no wire format or step")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    server = SimRobotServer(
+        port=args.port,
+        host=args.host,
+        robot=SimRobot(args.dofs, args.tau_ms / 1000.0),
+        service_time_s=args.service_ms / 1000.0,
+        jitter_s=args.jitter_ms / 1000.0,
+        drop_rate=args.drop,
+        wire=not args.legacy,
+        seed=args.seed,
+    )
+    print(f"Simulated robot on {server.endpoint} ({args.dofs} DOF)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(server.get_stats())
+
+
+if __name__ == "__main__":
+    main()
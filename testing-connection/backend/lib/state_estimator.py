@@ -0,0 +1,119 @@
+"""
+Joint velocity estimation from timestamped positions (or hardware velocity registers).
+
+One JointStateEstimator per robot. update() takes the joint positions of one sample and
+returns the velocity estimate for every joint, computed in place in preallocated arrays
+(no allocation per update unless the joint count changes):
+- "alpha_beta": alpha-beta tracker; position residual corrects position (alpha) and velocity (beta)
+- "lowpass": finite difference through a first-order low-pass filter at cutoff_hz
+When the caller has measured velocities (e.g. Dynamixel Present Velocity) it passes them
+and they are used as-is.
+A sample with the same timestamp as the previous one is not a new sample (velocity held);
+a gap longer than max_dt restarts the estimate from zero velocity.
+"""
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+METHODS = ("alpha_beta", "lowpass")
+
+
+class JointStateEstimator:
+    """Vectorized per-joint velocity estimate. The returned array is reused by the next update()."""
+
+    def __init__(
+        self,
+        n_joints: int = 0,
+        method: str = "alpha_beta",
+        alpha: float = 0.5,
+        beta: float = 0.15,
+        cutoff_hz: float = 15.0,
+        max_dt: float = 0.25,
+        clock=time.monotonic,
+    ):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}")
+        if not 0.0 < alpha <= 1.0 or not 0.0 < beta < 2.0:
+            raise ValueError("alpha must be in (0, 1] and beta in (0, 2)")
+        if cutoff_hz <= 0 or max_dt <= 0:
+            raise ValueError("cutoff_hz and max_dt must be > 0")
+        self._method = method
+        self._alpha = alpha
+        self._beta = beta
+        self._omega = 2.0 * math.pi * cutoff_hz
+        self._max_dt = max_dt
+        self._clock = clock
+        self._allocate(n_joints)
+
+    def _allocate(self, n: int) -> None:
+        self._n = n
+        self._x = np.zeros(n)     # position estimate (alpha-beta) / previous sample (low-pass)
+        self._v = np.zeros(n)     # velocity estimate
+        self._z = np.zeros(n)     # current sample
+        self._tmp = np.zeros(n)
+        self._t: Optional[float] = None
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """Latest estimate (a view; copy it to keep it past the next update)."""
+        return self._v
+
+    def reset(self) -> None:
+        """Forget the history: the next sample starts from zero velocity."""
+        self._t = None
+        self._v[:] = 0.0
+
+    def update(self, positions, t: Optional[float] = None, velocities=None) -> np.ndarray:
+        """
+        positions: joint positions of one sample; t: its time (default: now, monotonic);
+        velocities: measured velocities for the same joints, used instead of the estimate.
+        """
+        now = self._clock() if t is None else t
+        n = len(positions)
+        if n != self._n:
+            self._allocate(n)
+        z = self._z
+        z[:] = positions
+        v = self._v
+        if velocities is not None:
+            v[:] = velocities
+            self._x[:] = z
+            self._t = now
+            return v
+        prev_t = self._t
+        if prev_t is None or now - prev_t > self._max_dt:
+            self._x[:] = z
+            v[:] = 0.0
+            self._t = now
+            return v
+        dt = now - prev_t
+        if dt <= 0:
+            return v
+        self._t = now
+        x = self._x
+        tmp = self._tmp
+        if self._method == "alpha_beta":
+            # predict: x += v * dt; residual r = z - x
+            np.multiply(v, dt, out=tmp)
+            x += tmp
+            np.subtract(z, x, out=tmp)
+            # correct: v += beta / dt * r; x += alpha * r
+            v += np.multiply(tmp, self._beta / dt, out=self._z)
+            tmp *= self._alpha
+            x += tmp
+        else:
+            # raw = (z - prev) / dt; v += a * (raw - v)
+            a = 1.0 - math.exp(-self._omega * dt)
+            np.subtract(z, x, out=tmp)
+            tmp *= 1.0 / dt
+            tmp -= v
+            tmp *= a
+            v += tmp
+            x[:] = z
+        return v
@@ -0,0 +1,270 @@
+"""
+AsyncZMQClientRobot: pipelined ZMQ robot client on a DEALER socket.
+
+Every request goes out as [request_id, b"", payload]. A REP server treats the frames before
+the empty delimiter as the envelope and echoes them in its reply, so replies are matched to
+requests by ID with several requests in flight, and existing servers need no change.
+Each request has a deadline: waiting never blocks longer than that, and a reply that shows up
+after its request expired is discarded as stale.
+"""
+import itertools
+import pickle
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import zmq
+
+from .zmq_client_robot import observations_from_reply
+from .zmq_wire import FORMAT_PICKLE, FORMAT_WIRE, decode_reply, encode_request, negotiation_request
+
+_REQUEST_ID = struct.Struct("<I")
+
+
+class RequestTimeout(zmq.Again):
+    """No reply before the request's deadline (zmq.Again, like the REQ client's RCVTIMEO)."""
+
+    def __init__(self, message: str):
+        super().__init__()
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class _Pending:
+    __slots__ = ("method", "sent_at", "deadline", "waited")
+
+    def __init__(self, method: str, sent_at: float, deadline: float, waited: bool):
+        self.method = method
+        self.sent_at = sent_at
+        self.deadline = deadline
+        self.waited = waited
+
+
+class AsyncZMQClientRobot:
+    """
+    Same interface as ZMQClientRobot (RobotProtocol + step), without the REQ lockstep:
+    - command_joint_state() sends and returns; its reply is collected later (an error reply is
+      raised from the next command). While an earlier command is unanswered (even past its
+      deadline, as the server may still have it queued) the goal is held instead of sent;
+      a newer goal replaces the held one, which goes out once that reply arrives.
+    - step() sends the command and an observation request back to back and waits for the
+      observation only: one round trip, on any server, since REP answers in order.
+    - get_observations() / get_joint_state() / num_dofs() wait at most timeout_s and raise
+      RequestTimeout (a zmq.Again) on expiry; the socket stays usable (no REQ state to reset).
+    At most max_in_flight requests are outstanding; sending more expires the oldest.
+    """
+
+    def __init__(
+        self,
+        port: int = 6001,
+        host: str = "127.0.0.1",
+        wire: str = "auto",
+        timeout_s: float = 0.1,
+        connect_timeout_s: float = 3.0,
+        max_in_flight: int = 8,
+    ):
+        if wire not in ("auto", FORMAT_WIRE, FORMAT_PICKLE):
+            raise ValueError(f"wire must be 'auto', '{FORMAT_WIRE}' or '{FORMAT_PICKLE}'")
+        if timeout_s <= 0 or max_in_flight < 1:
+            raise ValueError("timeout_s must be > 0 and max_in_flight >= 1")
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.DEALER)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        # Only queue to a live connection, and only a few messages: no backlog of old goals
+        self._socket.setsockopt(zmq.IMMEDIATE, 1)
+        self._socket.setsockopt(zmq.SNDHWM, max_in_flight)
+        self._socket.connect(f"tcp://{host}:{port}")
+        self._poller = zmq.Poller()
+        self._poller.register(self._socket, zmq.POLLIN)
+        self._format: Optional[str] = None if wire == "auto" else wire
+        self._timeout_s = timeout_s
+        self._connect_timeout_s = connect_timeout_s
+        self._max_in_flight = max_in_flight
+        self._ids = itertools.count(1)
+        self._pending: "OrderedDict[int, _Pending]" = OrderedDict()
+        self._replies: Dict[int, Any] = {}
+        self._command_error: Optional[str] = None
+        # Latest-goal holding: at most one command queued at the server
+        self._command_rid: Optional[int] = None
+        self._command_sent_at = 0.0
+        self._held_goal: Optional[dict] = None
+        self._coalesced = 0
+        self._num_dofs: Optional[int] = None
+        self._connected = False
+        self._sent = 0
+        self._received = 0
+        self._timeouts = 0
+        self._stale = 0
+        self._dropped = 0
+        self._rtt_last = 0.0
+        self._rtt_max = 0.0
+
+    @property
+    def wire_format(self) -> Optional[str]:
+        return self._format
+
+    # --- transport ---
+
+    def _encode(self, method: str, args: Optional[dict]) -> bytes:
+        if self._format == FORMAT_WIRE:
+            return encode_request(method, args)
+        if self._format == FORMAT_PICKLE:
+            return pickle.dumps({"method": method, "args": args or {}})
+        return negotiation_request(method, args)
+
+    def _send(self, method: str, args: Optional[dict] = None, waited: bool = True) -> int:
+        now = time.monotonic()
+        self._expire(now)
+        while len(self._pending) >= self._max_in_flight:
+            self._pending.popitem(last=False)
+            self._dropped += 1
+        if not self._connected:
+            if not self._socket.poll(int(self._connect_timeout_s * 1000), zmq.POLLOUT):
+                raise RequestTimeout("robot server not connected")
+            self._connected = True
+        rid = next(self._ids) & 0xFFFFFFFF
+        try:
+            # IMMEDIATE: fails instead of queueing when the connection is down or the HWM is reached
+            self._socket.send_multipart([_REQUEST_ID.pack(rid), b"", self._encode(method, args)], zmq.NOBLOCK)
+        except zmq.Again:
+            raise RequestTimeout("robot server not connected or not reading requests")
+        timeout = self._timeout_s if self._format is not None else self._connect_timeout_s
+        self._pending[rid] = _Pending(method, now, now + timeout, waited)
+        self._sent += 1
+        return rid
+
+    def _expire(self, now: float) -> None:
+        while self._pending:
+            rid, pending = next(iter(self._pending.items()))
+            if pending.deadline > now:
+                break
+            del self._pending[rid]
+            self._timeouts += 1
+
+    def _drain(self, timeout_ms: int) -> None:
+        """Receive every reply that is ready, waiting up to timeout_ms for the first one."""
+        while self._poller.poll(timeout_ms):
+            timeout_ms = 0
+            frames = self._socket.recv_multipart(copy=False)
+            if len(frames) != 3:
+                self._stale += 1
+                continue
+            rid = _REQUEST_ID.unpack(frames[0].bytes)[0]
+            if rid == self._command_rid:
+                self._command_rid = None
+            now = time.monotonic()
+            pending = self._pending.pop(rid, None)
+            if pending is None or now > pending.deadline:
+                if pending is not None:
+                    self._timeouts += 1
+                self._stale += 1
+                continue
+            self._received += 1
+            self._rtt_last = now - pending.sent_at
+            self._rtt_max = max(self._rtt_max, self._rtt_last)
+            # Zero-copy: wire arrays are views into the received frame
+            result, fmt = decode_reply(frames[2].buffer, allow_pickle=self._format != FORMAT_WIRE)
+            self._format = fmt
+            error = result["error"] if isinstance(result, dict) and "error" in result else None
+            if pending.waited:
+                self._replies[rid] = result
+            elif error is not None:
+                self._command_error = str(error)
+
+    def _wait(self, rid: int) -> Any:
+        while rid not in self._replies:
+            pending = self._pending.get(rid)
+            if pending is None:
+                raise RequestTimeout("request expired")
+            remaining = pending.deadline - time.monotonic()
+            if remaining <= 0:
+                del self._pending[rid]
+                self._timeouts += 1
+                raise RequestTimeout(f"no reply to {pending.method} within {self._timeout_s * 1000:.0f} ms")
+            self._drain(max(1, int(remaining * 1000)))
+        result = self._replies.pop(rid)
+        if isinstance(result, dict) and "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+
+    def _request(self, method: str, args: Optional[dict] = None) -> Any:
+        return self._wait(self._send(method, args))
+
+    def _raise_command_error(self) -> None:
+        if self._command_error is not None:
+            err, self._command_error = self._command_error, None
+            raise RuntimeError(err)
+
+    # --- RobotProtocol ---
+
+    def num_dofs(self) -> int:
+        if self._num_dofs is None:
+            # First request: also negotiates the wire format, before anything is pipelined
+            self._num_dofs = int(self._request("num_dofs"))
+        return self._num_dofs
+
+    def get_joint_state(self) -> np.ndarray:
+        result = self._request("get_joint_state")
+        return np.array(result) if not isinstance(result, np.ndarray) else result
+
+    def _joint_args(self, joint_state) -> dict:
+        if self._format == FORMAT_WIRE:
+            return {"joint_state": np.asarray(joint_state, dtype=np.float64)}
+        return {"joint_state": joint_state.tolist() if hasattr(joint_state, "tolist") else list(joint_state)}
+
+    def _flush_goal(self) -> None:
+        """Send the held goal unless the previous command is still unanswered (up to connect_timeout_s)."""
+        if self._held_goal is None:
+            return
+        if self._command_rid is not None and time.monotonic() - self._command_sent_at < self._connect_timeout_s:
+            return
+        self._command_rid = self._send("command_joint_state", self._held_goal, waited=False)
+        self._command_sent_at = time.monotonic()
+        self._held_goal = None
+
+    def command_joint_state(self, joint_state) -> None:
+        self.num_dofs()
+        # Error replies of earlier commands are collected while waiting for other replies
+        self._raise_command_error()
+        if self._held_goal is not None:
+            self._coalesced += 1
+        self._held_goal = self._joint_args(joint_state)
+        self._drain(0)
+        self._flush_goal()
+
+    def get_observations(self) -> Dict[str, np.ndarray]:
+        self.num_dofs()
+        return observations_from_reply(self._request("get_observations"))
+
+    def step(self, joint_state) -> Dict[str, np.ndarray]:
+        """Command joint_state and return the observations taken right after it (one round trip)."""
+        self.command_joint_state(joint_state)
+        obs = observations_from_reply(self._request("get_observations"))
+        # The command's reply came before the observation's (REP answers in order)
+        self._raise_command_error()
+        self._flush_goal()
+        return obs
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "wire_format": self._format,
+            "timeout_ms": self._timeout_s * 1000.0,
+            "in_flight": len(self._pending),
+            "sent": self._sent,
+            "received": self._received,
+            "timeouts": self._timeouts,
+            "stale_discarded": self._stale,
+            "dropped": self._dropped,
+            "goals_coalesced": self._coalesced,
+            "goal_held": self._held_goal is not None,
+            "rtt_last_ms": self._rtt_last * 1000.0,
+            "rtt_max_ms": self._rtt_max * 1000.0,
+        }
+
+    def close(self):
+        self._socket.close()
+        self._context.term()
@@ -1,51 +1,140 @@
 """ZMQClientRobot for testing-connection. Connects to quick_run-style ZMQ robot server."""
 import pickle
-from typing import Dict
+from typing import Dict, Optional
 
 import numpy as np
 import zmq
 
+from .zmq_wire import (
+    FORMAT_PICKLE,
+    FORMAT_WIRE,
+    decode_reply,
+    encode_request,
+    negotiation_request,
+)
+
+
+def _is_unknown_method(message: str) -> bool:
+    """Error text of a server that does not implement a method ("Invalid method: x" from quick_run-style
+    dispatch, "unknown method id n" from a wire decoder that predates the method)."""
+    message = message.lower()
+    return "invalid method" in message or "unknown method" in message
+
+
+def observations_from_reply(result: dict) -> Dict[str, np.ndarray]:
+    """get_observations reply (either format) -> dict of numpy arrays."""
+    out = {}
+    for k, v in result.items():
+        if isinstance(v, np.ndarray):
+            out[k] = v
+        elif hasattr(v, "tolist") or isinstance(v, (list, tuple)):
+            out[k] = np.array(v)
+        else:
+            out[k] = np.array([v])
+    return out
+
 
 class ZMQClientRobot:
-    """ZMQ client for robot server (e.g. quick_run)."""
+    """
+    ZMQ client for robot server (e.g. quick_run).
+    wire: "auto" negotiates the binary format on the first request and falls back to pickle
+    for legacy servers; "wire" or "pickle" force one format ("wire" never unpickles replies,
+    and must only be used with servers that speak it: a pickle-only server cannot parse it).
+    num_dofs is static and fetched once. step() commands and observes in one round trip when
+    the server supports it (only tried over the wire format, since quick_run-style pickle servers
+    stop serving on an unknown method), otherwise it falls back to two requests.
+    endpoint/context connect elsewhere than tcp://host:port (e.g. an inproc server, which
+    must share the client's context).
+    """
 
-    def __init__(self, port: int = 6001, host: str = "127.0.0.1"):
-        self._context = zmq.Context()
+    def __init__(
+        self,
+        port: int = 6001,
+        host: str = "127.0.0.1",
+        wire: str = "auto",
+        use_step: bool = True,
+        endpoint: Optional[str] = None,
+        context: Optional[zmq.Context] = None,
+    ):
+        if wire not in ("auto", FORMAT_WIRE, FORMAT_PICKLE):
+            raise ValueError(f"wire must be 'auto', '{FORMAT_WIRE}' or '{FORMAT_PICKLE}'")
+        self._own_context = context is None
+        self._context = context or zmq.Context()
         self._socket = self._context.socket(zmq.REQ)
         self._socket.setsockopt(zmq.RCVTIMEO, 3000)
-        self._socket.connect(f"tcp://{host}:{port}")
+        self._socket.connect(endpoint or f"tcp://{host}:{port}")
+        self._format: Optional[str] = None if wire == "auto" else wire
+        self._num_dofs: Optional[int] = None
+        # None: not tried yet; False: server lacks "step", use command + observe
+        self._step_supported: Optional[bool] = None if use_step else False
+
+    @property
+    def wire_format(self) -> Optional[str]:
+        """Format in use ("wire" / "pickle"), None until the first reply in auto mode."""
+        return self._format
+
+    @property
+    def step_supported(self) -> Optional[bool]:
+        """Whether the server answers "step"; None until the first step()."""
+        return self._step_supported
 
     def _request(self, method: str, args: dict = None):
-        req = {"method": method, "args": args or {}}
-        self._socket.send(pickle.dumps(req))
-        result = pickle.loads(self._socket.recv())
+        if self._format == FORMAT_WIRE:
+            self._socket.send(encode_request(method, args))
+        elif self._format == FORMAT_PICKLE:
+            self._socket.send(pickle.dumps({"method": method, "args": args or {}}))
+        else:
+            self._socket.send(negotiation_request(method, args))
+        # Zero-copy: wire arrays are views into the received frame
+        frame = self._socket.recv(copy=False)
+        result, fmt = decode_reply(frame.buffer, allow_pickle=self._format != FORMAT_WIRE)
+        self._format = fmt
         if isinstance(result, dict) and "error" in result:
             raise RuntimeError(result["error"])
         return result
 
     def num_dofs(self) -> int:
-        return self._request("num_dofs")
+        if self._num_dofs is None:
+            self._num_dofs = int(self._request("num_dofs"))
+        return self._num_dofs
 
     def get_joint_state(self) -> np.ndarray:
         result = self._request("get_joint_state")
         return np.array(result) if not isinstance(result, np.ndarray) else result
 
+    def _joint_args(self, joint_state) -> dict:
+        if self._format == FORMAT_WIRE:
+            # Arrays go on the wire as raw float64; no list conversion
+            return {"joint_state": np.asarray(joint_state, dtype=np.float64)}
+        return {"joint_state": joint_state.tolist() if hasattr(joint_state, "tolist") else list(joint_state)}
+
     def command_joint_state(self, joint_state) -> None:
-        self._request(
-            "command_joint_state",
-            {"joint_state": joint_state.tolist() if hasattr(joint_state, "tolist") else list(joint_state)},
-        )
+        self._request("command_joint_state", self._joint_args(joint_state))
 
     def get_observations(self) -> Dict[str, np.ndarray]:
-        result = self._request("get_observations")
-        out = {}
-        for k, v in result.items():
-            if hasattr(v, "tolist"):
-                out[k] = np.array(v)
-            else:
-                out[k] = np.array(v) if isinstance(v, (list, tuple)) else np.array([v])
-        return out
+        return observations_from_reply(self._request("get_observations"))
+
+    def step(self, joint_state) -> Dict[str, np.ndarray]:
+        """Command joint_state and return the observations taken right after it."""
+        if self._format is None and self._step_supported is None:
+            self.num_dofs()  # negotiates the format
+        if self._step_supported is None and self._format != FORMAT_WIRE:
+            self._step_supported = False
+        if self._step_supported is False:
+            self.command_joint_state(joint_state)
+            return self.get_observations()
+        try:
+            result = self._request("step", self._joint_args(joint_state))
+        except RuntimeError as e:
+            if self._step_supported or not _is_unknown_method(str(e)):
+                raise
+            # Server lacks "step": fall back for good (re-sending the same goal is harmless)
+            self._step_supported = False
+            return self.step(joint_state)
+        self._step_supported = True
+        return observations_from_reply(result)
 
     def close(self):
         self._socket.close()
-        self._context.term()
+        if self._own_context:
+            self._context.term()
@@ -0,0 +1,270 @@
+"""
+Compact binary wire format for the ZMQ robot protocol (replaces pickle on the hot path).
+
+One ZMQ frame per message:
+    header   <2sBBBBHI magic b"GW", version, kind, method, nfields, flags, data_offset
+    fields   <BBHII    name_len, dtype, field_flags, count, offset  + name (ascii)
+    payload  raw little-endian arrays, each 8-byte aligned at its offset
+
+decode() returns numpy arrays that are read-only views into the received buffer
+(zero-copy with recv(copy=False)); call .copy() before mutating.
+
+Negotiation: a client that does not yet know the server sends a normal pickle request
+with an extra "wire": WIRE_VERSION key. Legacy servers ignore the key and reply with
+pickle; servers that speak this format reply in it. The first two bytes tell them apart
+(pickle protocol 2+ starts with 0x80), and the client then sticks to the detected format.
+"""
+import pickle
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"GW"
+WIRE_VERSION = 1
+
+FORMAT_WIRE = "wire"
+FORMAT_PICKLE = "pickle"
+
+KIND_REQUEST = 1
+KIND_REPLY = 2
+KIND_ERROR = 3
+
+# header flags
+FLAG_DICT = 0x1  # fields are a dict; otherwise a single value (or None when nfields == 0)
+# field flags
+FIELD_SCALAR = 0x1  # count == 1, decode to a Python scalar
+
+HEADER = struct.Struct("<2sBBBBHI")
+FIELD = struct.Struct("<BBHII")
+_ALIGN = 8
+_LAYOUT_CACHE_MAX = 256
+
+# Append only: the index is the method id on the wire.
+# "step" = command_joint_state + get_observations in one round trip (args {"joint_state"}, reply: observations)
+METHODS = ("hello", "num_dofs", "get_joint_state", "command_joint_state", "get_observations", "step")
+METHOD_IDS = {name: i for i, name in enumerate(METHODS)}
+
+DTYPES = (np.dtype("<f8"), np.dtype("<f4"), np.dtype("<i8"), np.dtype("<i4"), np.dtype("u1"), np.dtype("?"))
+_DTYPE_CODES = {dt: i for i, dt in enumerate(DTYPES)}
+_ERROR_DTYPE = 4  # utf-8 bytes as u1
+
+# Messages of one method have the same layout every tick, so the header/field table is
+# built (encode) or parsed (decode) once per layout and reused.
+_encode_layouts: Dict[tuple, Tuple[bytes, Tuple[int, ...]]] = {}
+_decode_layouts: Dict[bytes, tuple] = {}
+
+
+class WireError(ValueError):
+    """Malformed or unsupported wire message."""
+
+
+def is_wire(buf) -> bool:
+    return len(buf) >= HEADER.size and bytes(buf[:2]) == MAGIC
+
+
+def _as_array(value: Any) -> Tuple[np.ndarray, int]:
+    """Value -> (contiguous 1-D little-endian array, field_flags)."""
+    if type(value) is np.ndarray and value.ndim == 1 and value.dtype in _DTYPE_CODES and value.flags.c_contiguous:
+        return value, 0
+    if isinstance(value, (bool, np.bool_)):
+        return np.array([value], dtype=DTYPES[5]), FIELD_SCALAR
+    if isinstance(value, (int, np.integer)):
+        return np.array([value], dtype=DTYPES[2]), FIELD_SCALAR
+    if isinstance(value, (float, np.floating)):
+        return np.array([value], dtype=DTYPES[0]), FIELD_SCALAR
+    arr = np.asarray(value)
+    flags = FIELD_SCALAR if arr.ndim == 0 else 0
+    dt = arr.dtype.newbyteorder("<")
+    if dt not in _DTYPE_CODES:
+        # Lists of Python numbers, object arrays etc. travel as float64
+        dt = DTYPES[2] if np.issubdtype(arr.dtype, np.integer) else DTYPES[0]
+    return np.ascontiguousarray(arr.reshape(-1), dtype=dt), flags
+
+
+def _build_layout(key: tuple) -> Tuple[bytes, Tuple[int, ...]]:
+    """Header + field table for a layout key, and the zero padding after each field."""
+    kind, method_id, flags, fields = key
+    names = [name.encode("ascii") for name, _, _, _ in fields]
+    table_size = HEADER.size + sum(FIELD.size + len(n) for n in names)
+    data_offset = -(-table_size // _ALIGN) * _ALIGN
+    offset = data_offset
+    table = []
+    pads = []
+    for name, (_, code, fflags, size) in zip(names, fields):
+        table.append(FIELD.pack(len(name), code, fflags, size, offset))
+        table.append(name)
+        nbytes = size * DTYPES[code].itemsize
+        pads.append(-nbytes % _ALIGN)
+        offset += nbytes + pads[-1]
+    head = HEADER.pack(MAGIC, WIRE_VERSION, kind, method_id, len(fields), flags, data_offset) + b"".join(table)
+    head += b"\0" * (data_offset - len(head))
+    return head, tuple(pads)
+
+
+def _pack(kind: int, method: str, fields: List[Tuple[str, np.ndarray, int]], flags: int) -> bytes:
+    method_id = METHOD_IDS.get(method)
+    if method_id is None:
+        raise WireError(f"unknown method: {method}")
+    key = (kind, method_id, flags, tuple((name, _DTYPE_CODES[arr.dtype], ff, arr.size) for name, arr, ff in fields))
+    layout = _encode_layouts.get(key)
+    if layout is None:
+        layout = _build_layout(key)
+        if len(_encode_layouts) < _LAYOUT_CACHE_MAX:
+            _encode_layouts[key] = layout
+    head, pads = layout
+    parts = [head]
+    for (_, arr, _), pad in zip(fields, pads):
+        parts.append(arr.tobytes())
+        if pad:
+            parts.append(b"\0" * pad)
+    return b"".join(parts)
+
+
+def _encode_value(kind: int, method: str, value: Any) -> bytes:
+    if value is None:
+        return _pack(kind, method, [], 0)
+    if isinstance(value, dict):
+        fields = [(str(k),) + _as_array(v) for k, v in value.items()]
+        return _pack(kind, method, fields, FLAG_DICT)
+    arr, fflags = _as_array(value)
+    return _pack(kind, method, [("", arr, fflags)], 0)
+
+
+def encode_request(method: str, args: Optional[Dict[str, Any]] = None) -> bytes:
+    return _encode_value(KIND_REQUEST, method, args or {})
+
+
+def encode_reply(method: str, result: Any) -> bytes:
+    return _encode_value(KIND_REPLY, method, result)
+
+
+def encode_error(method: str, message: str) -> bytes:
+    msg = np.frombuffer(message.encode("utf-8"), dtype=DTYPES[_ERROR_DTYPE])
+    if method not in METHOD_IDS:
+        method = "hello"
+    return _pack(KIND_ERROR, method, [("error", msg, 0)], FLAG_DICT)
+
+
+def _parse_layout(mv: memoryview, data_offset: int) -> tuple:
+    magic, version, kind, method_id, nfields, flags, _ = HEADER.unpack_from(mv, 0)
+    if version != WIRE_VERSION:
+        raise WireError(f"unsupported wire version {version}")
+    if method_id >= len(METHODS):
+        raise WireError(f"unknown method id {method_id}")
+    pos = HEADER.size
+    fields = []
+    for _ in range(nfields):
+        name_len, code, fflags, count, offset = FIELD.unpack_from(mv, pos)
+        pos += FIELD.size
+        name = bytes(mv[pos:pos + name_len]).decode("ascii")
+        pos += name_len
+        if pos > data_offset or code >= len(DTYPES):
+            raise WireError("malformed field table")
+        fields.append((name, DTYPES[code], count, offset, bool(fflags & FIELD_SCALAR)))
+    # Common case (every field float64): one frombuffer over the payload, fields are slices of it
+    uniform = None
+    if fields and all(f[1] == DTYPES[0] for f in fields):
+        end = max(f[3] + f[2] * 8 for f in fields)
+        uniform = (
+            (end - data_offset) // 8,
+            tuple((name, (off - data_offset) // 8, (off - data_offset) // 8 + count, scalar)
+                  for name, _, count, off, scalar in fields),
+        )
+    return kind, METHODS[method_id], bool(flags & FLAG_DICT), tuple(fields), uniform
+
+
+def decode(buf) -> Tuple[int, str, Any]:
+    """buf: bytes, memoryview or zmq.Frame.buffer. Returns (kind, method, value)."""
+    mv = memoryview(buf)
+    if len(mv) < HEADER.size:
+        raise WireError("message too short")
+    header = HEADER.unpack_from(mv, 0)
+    if header[0] != MAGIC:
+        raise WireError("not a wire message")
+    data_offset = header[-1]
+    if data_offset > len(mv):
+        raise WireError("message too short")
+    table = bytes(mv[:data_offset])
+    layout = _decode_layouts.get(table)
+    try:
+        if layout is None:
+            layout = _parse_layout(mv, data_offset)
+            if len(_decode_layouts) < _LAYOUT_CACHE_MAX:
+                _decode_layouts[table] = layout
+        kind, method, is_dict, fields, uniform = layout
+        out: Dict[str, Any] = {}
+        value: Any = None
+        if uniform is not None:
+            base = np.frombuffer(mv, dtype=DTYPES[0], count=uniform[0], offset=data_offset)
+            for name, lo, hi, scalar in uniform[1]:
+                value = base[lo].item() if scalar else base[lo:hi]
+                out[name] = value
+        else:
+            for name, dtype, count, offset, scalar in fields:
+                arr = np.frombuffer(mv, dtype=dtype, count=count, offset=offset)
+                value = arr[0].item() if scalar else arr
+                out[name] = value
+    except (struct.error, ValueError) as e:
+        if isinstance(e, WireError):
+            raise
+        raise WireError(f"malformed message: {e}")
+    if kind == KIND_ERROR:
+        err = out.get("error")
+        return kind, method, {"error": err.tobytes().decode("utf-8", "replace") if err is not None else ""}
+    if is_dict:
+        return kind, method, out
+    return kind, method, value
+
+
+def negotiation_request(method: str, args: Optional[Dict[str, Any]] = None) -> bytes:
+    """Pickle request a legacy server accepts; a wire-capable server answers in wire format."""
+    return pickle.dumps({"method": method, "args": args or {}, "wire": WIRE_VERSION})
+
+
+def decode_reply(buf, allow_pickle: bool = True) -> Tuple[Any, str]:
+    """Reply from either format -> (result, format). Errors come back as {"error": msg} like the pickle protocol."""
+    if is_wire(buf):
+        kind, _, value = decode(buf)
+        if kind not in (KIND_REPLY, KIND_ERROR):
+            raise WireError(f"unexpected message kind {kind}")
+        return value, FORMAT_WIRE
+    if not allow_pickle:
+        raise WireError("server replied with pickle but the wire format was negotiated")
+    return pickle.loads(buf), FORMAT_PICKLE
+
+
+def serve_message(
+    message,
+    dispatch: Callable[[str, Dict[str, Any]], Any],
+    allow_pickle: bool = True,
+) -> bytes:
+    """
+    Server side: answer one request in whichever format it came in (negotiation requests
+    are answered in wire format). dispatch(method, args) returns the result or raises.
+    """
+    if is_wire(message):
+        try:
+            kind, method, args = decode(message)
+        except WireError as e:
+            return encode_error("hello", str(e))
+        if kind != KIND_REQUEST:
+            return encode_error(method, f"unexpected message kind {kind}")
+        try:
+            return encode_reply(method, dispatch(method, args or {}))
+        except Exception as e:
+            return encode_error(method, str(e))
+    if not allow_pickle:
+        return encode_error("hello", "pickle requests are disabled")
+    request = pickle.loads(message)
+    method = request.get("method")
+    args = request.get("args", {})
+    try:
+        result = dispatch(method, args)
+    except Exception as e:
+        result = {"error": str(e)}
+    if request.get("wire") == WIRE_VERSION and method in METHOD_IDS:
+        if isinstance(result, dict) and "error" in result:
+            return encode_error(method, str(result["error"]))
+        return encode_reply(method, result)
+    return pickle.dumps(result)
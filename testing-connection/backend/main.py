@@ -6,24 +6,47 @@ Testing connection backend. High decoupling via design patterns.
 - Command: StartTeleopCommand
 - Dependency Injection: services injected into API layer
 """
+import os
 from typing import Optional
 
 import zmq
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from core.events import get_event_bus
+from core.device_registry import get_device_registry
+from core.events import DispatchMode, get_event_bus
 from core.services.robot_service import RobotService
 from core.services.gello_service import GelloService
-from core.services.gello_state_service import read_gello_joints, scan_gello_ids, parse_ids_param
+from core.services.device_profiles import get_device_profiles
+from core.services.gello_state_service import AUTO_BAUDRATES, read_gello_state, scan_gello_ids, parse_ids_param
+from core.services.port_sessions import get_port_sessions
+from core.services.recording_service import RecordingService
+from core.services.stream_service import TeleopStreamService
 from core.services.teleop_service import TeleopService
 
 # --- Dependency Injection ---
 _event_bus = get_event_bus()
+# Observers run on their own workers so they never stall the teleop control thread
+_event_bus.configure(dispatch=DispatchMode.ASYNC)
+_port_sessions = get_port_sessions()
+_device_profiles = get_device_profiles()
+_device_registry = get_device_registry()
 _robot_service = RobotService(event_bus=_event_bus)
-_gello_service = GelloService(event_bus=_event_bus)
-_teleop_service = TeleopService(event_bus=_event_bus)
+_gello_service = GelloService(
+    event_bus=_event_bus,
+    port_sessions=_port_sessions,
+    device_registry=_device_registry,
+    device_profiles=_device_profiles,
+)
+_teleop_service = TeleopService(event_bus=_event_bus, port_sessions=_port_sessions, device_registry=_device_registry)
+_stream_service = TeleopStreamService(_teleop_service, event_bus=_event_bus)
+_recording_service = RecordingService(
+    _teleop_service,
+    base_dir=os.environ.get("RECORDINGS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")),
+    event_bus=_event_bus,
+)
 
 app = FastAPI(title="Testing Connection API")
 app.add_middleware(
@@ -54,12 +77,27 @@ class RobotCanTestRequest(BaseModel):
     channel: str = "can_follower"
 
 
+class RecordStartRequest(BaseModel):
+    name: Optional[str] = None
+
+
+class ReplayStartRequest(BaseModel):
+    name: str
+    speed: float = 1.0  # 1.0 real time, 0.5 half speed, 0 = as fast as the bus allows
+    robot_host: str = "127.0.0.1"
+    robot_port: int = 6001
+    robot_usb_port: Optional[str] = None
+    robot_can_channel: Optional[str] = None
+
+
 class TeleopStartRequest(BaseModel):
     gello_port: str
     robot_host: str = "127.0.0.1"
     robot_port: int = 6001
     robot_usb_port: Optional[str] = None
     robot_can_channel: Optional[str] = None
+    follower_read_every: int = 1  # shared bus: read follower feedback every N ticks
+    zmq_client: str = "sync"  # ZMQ: "sync" (REQ) or "async" (pipelined DEALER, per-request deadlines)
 
 
 # --- API: Robot ---
@@ -68,6 +106,12 @@ def test_robot(req: RobotTestRequest):
     return _robot_service.test_zmq_connection(req.host, req.port)
 
 
+@app.get("/api/test/robot/pool")
+def robot_zmq_pool_stats():
+    """Pooled ZMQ sockets: hit/miss, timeouts, recreated sockets, RTT percentiles (ms)."""
+    return _robot_service.get_pool_stats()
+
+
 @app.get("/api/test/robot/state")
 def get_robot_state(host: str = "127.0.0.1", port: int = 6001):
     try:
@@ -82,6 +126,7 @@ def get_robot_state(host: str = "127.0.0.1", port: int = 6001):
 
 @app.post("/api/test/robot/usb")
 def test_robot_usb(req: RobotUsbTestRequest):
+    _port_sessions.release(req.port)
     try:
         import serial
         s = serial.Serial(port=req.port, baudrate=req.baudrate, timeout=0.5)
@@ -103,6 +148,19 @@ def list_can_channels():
         return {"ok": False, "channels": [], "error": str(e)}
 
 
+@app.get("/api/test/robot/can/stats")
+def get_robot_can_stats(channel: Optional[str] = None):
+    """Per-channel CAN TX/RX frames, errors and bus-off count (sysfs interface statistics)."""
+    try:
+        from lib.piper_robot import can_channel_stats
+        stats = can_channel_stats(channel)
+        if channel and channel not in stats:
+            return {"ok": False, "channels": {}, "error": f"CAN 通道 '{channel}' 不存在"}
+        return {"ok": True, "channels": stats}
+    except Exception as e:
+        return {"ok": False, "channels": {}, "error": str(e)}
+
+
 @app.post("/api/test/robot/can")
 def test_robot_can(req: RobotCanTestRequest):
     """Test Piper robot CAN connection."""
@@ -125,6 +183,13 @@ def get_robot_can_state(channel: str = "can_follower"):
         return {"ok": False, "error": str(e)}
 
 
+@app.get("/api/test/robot/can/budget")
+def get_robot_can_budget():
+    """CAN command frames sent/suppressed, frames per second and estimated bus load per channel."""
+    from lib.can_budget import all_can_budgets
+    return {"ok": True, "channels": {name: b.get_stats() for name, b in all_can_budgets().items()}}
+
+
 class RobotResetRequest(BaseModel):
     channel: str = "can_follower"
     home_position: Optional[list] = None  # 7 joints: [j1, j2, j3, j4, j5, j6, gripper(0-1)]
@@ -158,8 +223,14 @@ def list_usb_ports_detail():
 
 
 @app.get("/api/test/usb/identify")
-def identify_usb_ports():
-    return _gello_service.identify_ports()
+def identify_usb_ports(timeout_s: float = 3.0, refresh: bool = False):
+    return _gello_service.identify_ports(timeout_s=timeout_s, refresh=refresh)
+
+
+@app.get("/api/test/usb/registry")
+def usb_registry_stats():
+    """Device registry: cached port count, classified ports, enumeration count, last error."""
+    return _device_registry.get_stats()
 
 
 @app.post("/api/test/gello")
@@ -168,21 +239,42 @@ def test_gello(req: GelloTestRequest):
 
 
 @app.get("/api/test/gello/scan")
-def scan_gello_ids_endpoint(port: str = "COM3", baudrate: int = 57600):
-    return scan_gello_ids(port, baudrate)
+def scan_gello_ids_endpoint(port: str = "COM3", baudrate: int = 57600, max_id: int = 12):
+    """Broadcast-ping IDs 1..max_id; baudrate=0 sweeps 57600 and 1000000."""
+    baudrates = (baudrate,) if baudrate else AUTO_BAUDRATES
+    return scan_gello_ids(port, baudrates[0], sessions=_port_sessions, baudrates=baudrates, max_id=max_id)
+
+
+@app.get("/api/test/gello/sessions")
+def gello_port_sessions():
+    """Open serial port sessions: uses, idle time, opened/reused/evicted counters."""
+    return _port_sessions.get_stats()
 
 
 @app.get("/api/test/gello/state")
-def get_gello_state(port: str = "COM3", baudrate: int = 0, ids: str = "auto"):
-    joint_ids = parse_ids_param(ids) or (1, 2, 3, 4, 5, 6, 7)
-    err = None
-    for b in (baudrate,) if baudrate else (57600, 1000000):
-        joints, err = read_gello_joints(port, baudrate=b, joint_ids=joint_ids)
-        if err is None:
-            return {"ok": True, "joints": joints}
-        if baudrate:
-            break
-    return {"ok": False, "joints": [], "error": err}
+def get_gello_state(port: str = "COM3", baudrate: int = 0, ids: str = "auto", refresh: bool = False):
+    if refresh:
+        _device_profiles.invalidate(port)
+    return read_gello_state(
+        port,
+        baudrate=baudrate,
+        joint_ids=parse_ids_param(ids),
+        sessions=_port_sessions,
+        profiles=_device_profiles,
+    )
+
+
+@app.get("/api/test/gello/profiles")
+def gello_device_profiles():
+    """Cached per-port baud rate / IDs / read method, hit and invalidation counters."""
+    return _device_profiles.get_stats()
+
+
+# --- API: Events ---
+@app.get("/api/test/events/stats")
+def api_event_stats():
+    """EventBus dispatch stats: queue depth, drops and callback latency per subscriber."""
+    return _event_bus.get_stats()
 
 
 # --- API: Teleop ---
@@ -194,6 +286,8 @@ def api_teleop_start(req: TeleopStartRequest):
         req.robot_port,
         req.robot_usb_port,
         req.robot_can_channel,
+        follower_read_every=req.follower_read_every,
+        zmq_client=req.zmq_client,
     )
     if not ok:
         raise HTTPException(status_code=400, detail=err or "启动失败")
@@ -211,6 +305,75 @@ def api_teleop_state():
     return _teleop_service.get_state()
 
 
+@app.get("/api/test/teleop/stream")
+async def api_teleop_stream(request: Request, max_hz: float = 30.0, backlog: int = 256):
+    """SSE push of teleop state; each message batches all samples since the previous one."""
+    return StreamingResponse(
+        _stream_service.stream(max_hz=max_hz, backlog=backlog, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/test/teleop/metrics")
+def api_teleop_metrics():
+    """Per-phase latency percentiles (ms) and loop rate/overruns of the running teleop."""
+    return _teleop_service.get_metrics()
+
+
+
+# --- API: Recording ---
+@app.post("/api/test/record/start")
+def api_record_start(req: RecordStartRequest):
+    ok, err = _recording_service.start(req.name)
+    if not ok:
+        raise HTTPException(status_code=400, detail=err or "启动录制失败")
+    return {"ok": True, **_recording_service.get_status()}
+
+
+@app.post("/api/test/record/stop")
+def api_record_stop():
+    return {"ok": True, **_recording_service.stop()}
+
+
+@app.get("/api/test/record/status")
+def api_record_status():
+    return _recording_service.get_status()
+
+
+@app.get("/api/test/record/episodes")
+def api_record_episodes():
+    return {"ok": True, "episodes": _recording_service.list_episodes()}
+
+
+# --- API: Replay ---
+@app.post("/api/test/replay/start")
+def api_replay_start(req: ReplayStartRequest):
+    """Replay a recorded episode on the follower; progress via /api/test/teleop/state and /metrics."""
+    episode_dir = _recording_service.episode_dir(req.name)
+    if episode_dir is None or not os.path.isdir(episode_dir):
+        raise HTTPException(status_code=404, detail=f"录制 '{req.name}' 不存在")
+    ok, err = _teleop_service.start_replay(
+        episode_dir,
+        speed=req.speed,
+        robot_host=req.robot_host,
+        robot_port=req.robot_port,
+        robot_usb_port=req.robot_usb_port,
+        robot_can_channel=req.robot_can_channel,
+    )
+    if not ok:
+        raise HTTPException(status_code=400, detail=err or "启动回放失败")
+    return {"ok": True}
+
+
+@app.post("/api/test/replay/stop")
+def api_replay_stop():
+    """Stop the replay; returns its final progress and timing stats."""
+    _teleop_service.stop()
+    last = _teleop_service.get_metrics().get("last_run") or {}
+    return {"ok": True, "replay": last.get("replay")}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
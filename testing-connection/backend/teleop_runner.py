@@ -46,15 +46,19 @@ def _to_json_serializable(obj: Any) -> Any:
     return obj
 
 
-def _obs_from_joint_state(joint_state) -> Dict[str, Any]:
-    """Build follower_obs dict for frontend from Dynamixel joint_state."""
+def _obs_from_joint_state(joint_state, velocities=None) -> Dict[str, Any]:
+    """Build follower_obs dict for frontend from Dynamixel joint_state (and its velocity estimate)."""
     arr = joint_state.tolist() if hasattr(joint_state, "tolist") else list(joint_state)
     n = len(arr)
     jp = arr
     gp = arr[-1] if n > 0 else 0.0
+    if velocities is None:
+        jv = [0.0] * n
+    else:
+        jv = velocities.tolist() if hasattr(velocities, "tolist") else list(velocities)
     return {
         "joint_positions": jp,
-        "joint_velocities": [0.0] * n,
+        "joint_velocities": jv,
         "ee_pos_quat": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
         "gripper_position": gp,
     }
@@ -84,36 +88,25 @@ def _teleop_loop_zmq(gello_port: str, robot_host: str, robot_port: int, hz: floa
         _teleop_error = str(e)
         return
     dt = 1.0 / hz
+    obs = None
     while _teleop_running and agent is not None and env is not None:
         try:
-            obs = env.get_obs()
+            if obs is None:
+                obs = env.get_obs()
             action = agent.act(obs)
-            env.step(action)
+            obs = env.step(action)
             _last_leader_joints = action.tolist() if hasattr(action, "tolist") else list(action)
             _last_follower_obs = _to_json_serializable(obs)
         except Exception as e:
+            obs = None
             _teleop_error = str(e)
         time.sleep(dt)
 
 
 def _list_available_ports() -> List[str]:
     """List available COM/serial ports."""
-    try:
-        from serial.tools import list_ports
-        return [p.device for p in list_ports.comports()]
-    except Exception:
-        return []
-
-
-def _raw_to_rad(raw: int) -> float:
-    if raw > 0x7FFFFFFF:
-        raw -= 0x100000000
-    return raw / 2048.0 * 3.141592653589793
-
-
-def _rad_to_param(rad: float) -> list:
-    v = int(rad * 2048 / 3.141592653589793)
-    return [v & 0xFF, (v >> 8) & 0xFF, (v >> 16) & 0xFF, (v >> 24) & 0xFF]
+    from core.device_registry import get_device_registry
+    return get_device_registry().devices()
 
 
 def _teleop_loop_usb_shared_bus(port: str, hz: float = 50):
@@ -122,6 +115,8 @@ def _teleop_loop_usb_shared_bus(port: str, hz: float = 50):
     try:
         from dynamixel_sdk import PortHandler, PacketHandler, GroupSyncRead, GroupSyncWrite
         import numpy as np
+        from lib.dynamixel_codec import SyncReadDecoder, SyncWriteEncoder
+        from lib.state_estimator import JointStateEstimator
     except ImportError as e:
         _teleop_error = f"dynamixel_sdk 未安装: {e}"
         return
@@ -149,6 +144,8 @@ def _teleop_loop_usb_shared_bus(port: str, hz: float = 50):
         group_write = GroupSyncWrite(ph, pk, ADDR_GOAL, LEN)
         for dxl_id in list(LEADER_IDS) + list(FOLLOWER_IDS):
             group_read.addParam(dxl_id)
+        read_codec = SyncReadDecoder(group_read, list(LEADER_IDS) + list(FOLLOWER_IDS), ADDR_PRESENT, LEN)
+        goal_codec = SyncWriteEncoder(group_write, FOLLOWER_IDS)
         _teleop_error = None
     except Exception as e:
         _teleop_error = str(e)
@@ -158,37 +155,24 @@ def _teleop_loop_usb_shared_bus(port: str, hz: float = 50):
             pass
         return
     dt = 1.0 / hz
+    n_leader = len(LEADER_IDS)
+    rad = np.zeros(n_leader + len(FOLLOWER_IDS))
+    follower_velocity = JointStateEstimator(len(FOLLOWER_IDS))
     try:
         while _teleop_running:
             try:
                 group_read.txRxPacket()
-                leader_rad = []
-                for dxl_id in LEADER_IDS:
-                    if group_read.isAvailable(dxl_id, ADDR_PRESENT, LEN):
-                        raw = group_read.getData(dxl_id, ADDR_PRESENT, LEN)
-                        leader_rad.append(_raw_to_rad(raw))
-                    else:
-                        leader_rad.append(0.0)
-                while len(leader_rad) < 7:
-                    leader_rad.append(0.0)
-                _last_leader_joints = leader_rad[:7]
-                group_write.clearParam()
-                for i, dxl_id in enumerate(FOLLOWER_IDS):
-                    r = leader_rad[i] if i < len(leader_rad) else 0.0
-                    group_write.addParam(dxl_id, _rad_to_param(r))
+                read_codec.decode()
+                read_codec.to_rad(ADDR_PRESENT, rad)
+                _last_leader_joints = rad[:n_leader].tolist()
+                goal_codec.encode(rad[:n_leader])
                 group_write.txPacket()
                 group_read.txRxPacket()
-                follower_rad = []
-                for dxl_id in FOLLOWER_IDS:
-                    if group_read.isAvailable(dxl_id, ADDR_PRESENT, LEN):
-                        raw = group_read.getData(dxl_id, ADDR_PRESENT, LEN)
-                        follower_rad.append(_raw_to_rad(raw))
-                    else:
-                        follower_rad.append(0.0)
-                while len(follower_rad) < 7:
-                    follower_rad.append(0.0)
+                read_codec.decode()
+                read_codec.to_rad(ADDR_PRESENT, rad)
+                follower = rad[n_leader:]
                 _last_follower_obs = _to_json_serializable(
-                    _obs_from_joint_state(np.array(follower_rad))
+                    _obs_from_joint_state(follower, follower_velocity.update(follower))
                 )
             except Exception as e:
                 _teleop_error = str(e)
@@ -257,9 +241,11 @@ def _teleop_loop_usb(gello_port: str, robot_usb_port: str, hz: float = 50):
                 if hasattr(action, "tolist"):
                     action = np.array(action)
                 robot_follower.command_joint_state(action)
-                follower_state = robot_follower.get_joint_state()
+                follower_obs = robot_follower.get_observations()
                 _last_leader_joints = action.tolist() if hasattr(action, "tolist") else list(action)
-                _last_follower_obs = _to_json_serializable(_obs_from_joint_state(follower_state))
+                _last_follower_obs = _to_json_serializable(
+                    _obs_from_joint_state(follower_obs["joint_positions"], follower_obs["joint_velocities"])
+                )
             except Exception as e:
                 _teleop_error = str(e)
             time.sleep(dt)
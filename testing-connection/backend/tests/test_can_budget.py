@@ -0,0 +1,81 @@
+import pytest
+
+from lib.can_budget import FRAMES_PER_CALL, CanCommandBudget
+
+MODE = (0x01, 0x01, 30, 0x00)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _budget(**kwargs):
+    clock = Clock()
+    return CanCommandBudget("can_test", clock=clock, **kwargs), clock
+
+
+def test_mode_sent_once_then_refreshed():
+    budget, clock = _budget(mode_refresh_s=1.0)
+    assert budget.want_mode(MODE)
+    budget.sent("ModeCtrl", MODE)
+    clock.now = 0.5
+    assert not budget.want_mode(MODE)
+    assert budget.want_mode((0x01, 0x01, 50, 0x00))
+    clock.now = 1.0
+    assert budget.want_mode(MODE)
+    assert budget.get_stats()["suppressed"]["ModeCtrl"] == 1
+
+
+def test_enable_forces_mode_resend():
+    budget, _ = _budget()
+    budget.sent("ModeCtrl", MODE)
+    budget.sent("EnablePiper")
+    assert budget.want_mode(MODE)
+
+
+def test_gripper_deadband_and_rate_limit():
+    budget, clock = _budget(gripper_deadband=500, gripper_max_hz=10)
+    assert budget.want_gripper(1000)
+    budget.sent("GripperCtrl", 1000)
+    clock.now = 0.5
+    assert not budget.want_gripper(1400)  # inside the deadband
+    clock.now = 0.55
+    budget.sent("GripperCtrl", 2000)
+    clock.now = 0.6
+    assert not budget.want_gripper(5000)  # rate limited (0.05 s < 0.1 s)
+    clock.now = 0.7
+    assert budget.want_gripper(5000)
+    assert budget.get_stats()["suppressed"]["GripperCtrl"] == 2
+
+
+def test_invalidate_forgets_last_commands():
+    budget, _ = _budget()
+    budget.sent("ModeCtrl", MODE)
+    budget.sent("GripperCtrl", 1000)
+    budget.invalidate()
+    assert budget.want_mode(MODE)
+    assert budget.want_gripper(1000)
+
+
+def test_frame_counts_and_rate():
+    budget, clock = _budget()
+    for k in range(100):
+        clock.now = k * 0.02
+        budget.sent("JointCtrl")
+    clock.now = 2.0
+    stats = budget.get_stats()
+    assert stats["tx_frames"] == 100 * FRAMES_PER_CALL["JointCtrl"]
+    assert stats["tx_fps"] == pytest.approx(150.0, rel=0.05)
+    assert 0 < stats["tx_bus_load"] < stats["bus_load"]
+
+
+def test_configure_validates():
+    budget, _ = _budget()
+    with pytest.raises(ValueError):
+        budget.configure(gripper_deadband=-1)
+    with pytest.raises(ValueError):
+        budget.configure(mode_refresh_s=0)
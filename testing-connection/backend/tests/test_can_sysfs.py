@@ -0,0 +1,68 @@
+import os
+
+from lib.can_sysfs import ARPHRD_CAN, CanInterfaceCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _add(root, name, typ=ARPHRD_CAN, operstate="up", **files):
+    base = root / name
+    (base / "statistics").mkdir(parents=True)
+    (base / "type").write_text(f"{typ}\n")
+    (base / "operstate").write_text(f"{operstate}\n")
+    for key, value in files.items():
+        path = base / "statistics" / key if key.endswith(("_packets", "_errors")) else base / key
+        path.write_text(f"{value}\n")
+
+
+def _set_mtime(root, ns):
+    os.utime(root, ns=(ns, ns))
+
+
+def test_stats_link_state_and_bus_off(tmp_path):
+    _add(tmp_path, "can0", operstate="down", carrier_down_count=3, carrier_changes=6, rx_packets=42)
+    cache = CanInterfaceCache(root=str(tmp_path))
+    stats = cache.stats("can0")
+    assert stats["is_can"] and stats["operstate"] == "down"
+    assert stats["bus_off"] == 3 and stats["carrier_changes"] == 6
+    assert stats["rx_packets"] == 42 and stats["tx_packets"] is None
+    assert "can_stats" not in stats
+    assert cache.stats("can9") is None
+
+
+def test_only_can_interfaces_are_listed(tmp_path):
+    _add(tmp_path, "can1")
+    _add(tmp_path, "can0")
+    _add(tmp_path, "eth0", typ=1)
+    assert CanInterfaceCache(root=str(tmp_path)).channels() == ["can0", "can1"]
+
+
+def test_rescans_on_mtime_change_or_ttl(tmp_path):
+    clock = Clock()
+    cache = CanInterfaceCache(root=str(tmp_path), ttl_s=2.0, clock=clock)
+    _add(tmp_path, "can0")
+    _set_mtime(tmp_path, 1_000_000_000)
+    assert cache.channels() == ["can0"]
+    assert cache.channels() == ["can0"]
+    assert cache.get_stats()["scans"] == 1
+
+    # Directory mtime changes: rescanned right away
+    _add(tmp_path, "can1")
+    _set_mtime(tmp_path, 2_000_000_000)
+    assert cache.channels() == ["can0", "can1"]
+    assert cache.get_stats()["scans"] == 2
+
+    # Change without an mtime bump: only seen once the TTL expires
+    _add(tmp_path, "can2")
+    _set_mtime(tmp_path, 2_000_000_000)
+    clock.now = 1.0
+    assert cache.channels() == ["can0", "can1"]
+    clock.now = 2.5
+    assert cache.channels() == ["can0", "can1", "can2"]
+    assert cache.get_stats()["scans"] == 3
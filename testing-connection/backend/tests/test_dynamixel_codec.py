@@ -0,0 +1,77 @@
+import struct
+
+import numpy as np
+import pytest
+
+from lib.dynamixel_codec import RAD_PER_TICK, SyncReadDecoder, SyncWriteEncoder, raw_to_rad
+
+
+class FakeGroupSyncRead:
+    def __init__(self):
+        self.data_dict = {}
+        self.last_result = True
+
+
+class FakeGroupSyncWrite:
+    def __init__(self):
+        self.params = {}
+
+    def addParam(self, dxl_id, data):
+        if dxl_id in self.params:
+            return False
+        self.params[dxl_id] = data
+        return True
+
+    def changeParam(self, dxl_id, data):
+        self.params[dxl_id] = data
+        return True
+
+
+def _words(*values):
+    return list(struct.pack("<" + "i" * len(values), *values))
+
+
+def test_raw_to_rad_sign():
+    assert raw_to_rad(2048) == pytest.approx(np.pi)
+    assert raw_to_rad(0xFFFFFFFF) == pytest.approx(-RAD_PER_TICK)
+
+
+def test_decode_position_and_velocity():
+    group = FakeGroupSyncRead()
+    # Start address 128: velocity (128) then position (132)
+    group.data_dict = {1: _words(-5, 2048), 2: _words(7, -1024)}
+    codec = SyncReadDecoder(group, (1, 2), 128, 8)
+    assert codec.decode()
+    np.testing.assert_array_equal(codec.ticks(128), [-5, 7])
+    out = np.zeros(2)
+    codec.to_rad(132, out)
+    np.testing.assert_allclose(out, [np.pi, -np.pi / 2])
+    assert codec.valid.all()
+
+
+def test_decode_missing_id_is_zero_and_invalid():
+    group = FakeGroupSyncRead()
+    group.data_dict = {1: _words(100), 2: []}
+    codec = SyncReadDecoder(group, (1, 2), 132, 4)
+    codec.decode()
+    np.testing.assert_array_equal(codec.ticks(132), [100, 0])
+    np.testing.assert_array_equal(codec.valid, [True, False])
+    group.last_result = False
+    assert not codec.decode()
+    assert not codec.valid.any()
+
+
+def test_decoder_rejects_unaligned_length():
+    with pytest.raises(ValueError):
+        SyncReadDecoder(FakeGroupSyncRead(), (1,), 132, 3)
+
+
+def test_encode_goal_params():
+    group = FakeGroupSyncWrite()
+    encoder = SyncWriteEncoder(group, (1, 2, 3))
+    encoder.encode([np.pi, -np.pi / 2])
+    np.testing.assert_array_equal(encoder.ticks, [2048, -1024, 0])
+    assert bytes(group.params[2]) == struct.pack("<i", -1024)
+    # Params are views: a new encode shows up without re-adding
+    encoder.encode([0.0, 0.0, np.pi])
+    assert bytes(group.params[3]) == struct.pack("<i", 2048)
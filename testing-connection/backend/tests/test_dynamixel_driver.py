@@ -0,0 +1,49 @@
+import pytest
+
+from bench import fakes
+from lib import dynamixel_driver
+from lib.dynamixel_driver import DynamixelDriver
+
+COMM_RX_TIMEOUT = -3001
+
+
+class SilentGroupSyncRead(fakes.FakeGroupSyncRead):
+    """No servo answers."""
+
+    def txRxPacket(self) -> int:
+        return COMM_RX_TIMEOUT
+
+
+class PacketHandler(fakes.FakePacketHandler):
+    def getTxRxResult(self, result: int) -> str:
+        return "[TxRxResult] There is no status packet!"
+
+
+@pytest.fixture
+def sdk(monkeypatch):
+    monkeypatch.setattr(dynamixel_driver, "PortHandler", fakes.FakePortHandler)
+    monkeypatch.setattr(dynamixel_driver, "PacketHandler", PacketHandler)
+    monkeypatch.setattr(dynamixel_driver, "GroupSyncRead", fakes.FakeGroupSyncRead)
+    monkeypatch.setattr(dynamixel_driver, "GroupSyncWrite", fakes.FakeGroupSyncWrite)
+    monkeypatch.setattr(DynamixelDriver, "FIRST_STATE_TIMEOUT_S", 0.2)
+    return monkeypatch
+
+
+def test_get_joints_reads_state(sdk):
+    driver = DynamixelDriver([1, 2], port="/dev/test-dxl", use_fake_fallback=False)
+    try:
+        assert driver.get_joints().shape == (2,)
+        assert driver.get_bus_stats()["last_read_error"] is None
+    finally:
+        driver.close()
+
+
+def test_get_joints_times_out_with_last_read_error(sdk):
+    sdk.setattr(dynamixel_driver, "GroupSyncRead", SilentGroupSyncRead)
+    driver = DynamixelDriver([1, 2], port="/dev/test-dxl", use_fake_fallback=False)
+    try:
+        with pytest.raises(RuntimeError, match="no status packet"):
+            driver.get_joints()
+        assert driver.get_bus_stats()["read_errors"] > 0
+    finally:
+        driver.close()
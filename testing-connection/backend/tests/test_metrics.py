@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from core.metrics import _MIDPOINTS_US, _NUM_BUCKETS, LatencyHistogram, _bucket_index
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_buckets_exact_below_32us_and_monotonic():
+    for us in range(32):
+        assert _bucket_index(us) == us
+    indices = [_bucket_index(us) for us in range(0, 200_000, 7)]
+    assert indices == sorted(indices)
+    assert _bucket_index(1 << 40) == _NUM_BUCKETS - 1
+
+
+def test_bucket_relative_precision():
+    for us in (33, 100, 1000, 12_345, 999_999):
+        mid = _MIDPOINTS_US[_bucket_index(us)]
+        assert abs(mid - us) / us < 0.07
+
+
+def test_percentiles_ms():
+    hist = LatencyHistogram(clock=Clock())
+    for us in range(1, 1001):
+        hist.record(us * 1e-6)
+    stats = hist.percentiles()
+    assert stats["count"] == 1000
+    assert stats["p50"] == pytest.approx(0.5, rel=0.07)
+    assert stats["p99"] == pytest.approx(0.99, rel=0.07)
+    assert stats["max"] == pytest.approx(1.0)
+
+
+def test_windows_rotate_out():
+    clock = Clock()
+    hist = LatencyHistogram(window_s=1.0, clock=clock)
+    hist.record(0.010)
+    clock.now = 1.5  # previous window still counted
+    assert hist.percentiles()["count"] == 1
+    clock.now = 3.5  # both windows expired
+    stats = hist.percentiles()
+    assert stats["count"] == 0
+    assert stats["total_count"] == 1
+    assert stats["max_all_time"] == pytest.approx(10.0)
+
+
+def test_empty_histogram():
+    stats = LatencyHistogram().percentiles()
+    assert stats["count"] == 0 and stats["p50"] == 0.0 and not np.isnan(stats["mean"])
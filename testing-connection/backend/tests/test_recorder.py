@@ -0,0 +1,50 @@
+import numpy as np
+
+from core.episode_store import EpisodeReader
+from core.recorder import EpisodeRecorder
+from core.state_buffer import TeleopStateBuffer
+
+
+def _record(tmp_path, ticks):
+    buf = TeleopStateBuffer()
+    recorder = EpisodeRecorder(str(tmp_path / "ep"), capacity=64, chunk_rows=8)
+    for leader, follower, error in ticks:
+        buf.write(leader, follower, error)
+        recorder.push(buf.read())
+    status = recorder.close()
+    return status, EpisodeReader(str(tmp_path / "ep"))
+
+
+def test_round_trip(tmp_path):
+    ticks = [(np.arange(7) + k, {"joint_positions": np.arange(7) * 2.0 + k}, None) for k in range(20)]
+    status, reader = _record(tmp_path, ticks)
+    assert status["rows_written"] == 20
+    assert (reader.n_leader, reader.n_follower) == (7, 7)
+    np.testing.assert_array_equal(reader.column("leader")[5], np.arange(7) + 5)
+    np.testing.assert_array_equal(reader.column("follower")[19], np.arange(7) * 2.0 + 19)
+    assert np.all(np.diff(reader.column("t")) >= 0)
+    reader.close()
+
+
+def test_recording_started_before_teleop(tmp_path):
+    # The strategy publishes an empty setup tick (and possibly a connection error) first
+    ticks = [([], {}, None), ([], {}, "连接失败")]
+    ticks += [(np.ones(7) * k, {"joint_positions": np.ones(7) * -k}, None) for k in range(10)]
+    status, reader = _record(tmp_path, ticks)
+    assert (reader.n_leader, reader.n_follower) == (7, 7)
+    assert reader.num_rows == 10
+    np.testing.assert_array_equal(reader.column("leader")[0], np.zeros(7))
+    np.testing.assert_array_equal(reader.column("follower")[9], np.ones(7) * -9)
+    assert status["skipped"] == 2
+    assert status["skipped_errors"] == 1
+    assert status["last_skipped_error"] == "连接失败"
+    reader.close()
+
+
+def test_error_rows_with_joints_are_recorded(tmp_path):
+    ticks = [(np.zeros(3), np.zeros(3), None), (np.zeros(3), np.zeros(3), "timeout")]
+    _, reader = _record(tmp_path, ticks)
+    assert reader.num_rows == 2
+    np.testing.assert_array_equal(reader.column("error"), [0, 1])
+    assert [(e["row"], e["error"]) for e in reader.errors()] == [(1, "timeout")]
+    reader.close()
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from lib.state_estimator import JointStateEstimator
+
+
+@pytest.mark.parametrize("method", ["alpha_beta", "lowpass"])
+def test_constant_velocity_converges(method):
+    est = JointStateEstimator(3, method=method)
+    rates = np.array([1.0, -2.0, 0.0])
+    for k in range(200):
+        t = k * 0.005
+        v = est.update(rates * t, t=t)
+    np.testing.assert_allclose(v, rates, atol=1e-3)
+
+
+def test_first_sample_gap_and_repeat():
+    est = JointStateEstimator(2)
+    np.testing.assert_array_equal(est.update([0.0, 0.0], t=0.0), [0.0, 0.0])
+    v = est.update([0.01, 0.0], t=0.01).copy()
+    assert v[0] > 0
+    # Same timestamp: not a new sample, velocity held
+    np.testing.assert_array_equal(est.update([0.5, 0.0], t=0.01), v)
+    # Gap longer than max_dt: restart from zero velocity
+    np.testing.assert_array_equal(est.update([1.0, 1.0], t=5.0), [0.0, 0.0])
+
+
+def test_measured_velocities_pass_through():
+    est = JointStateEstimator(2)
+    np.testing.assert_array_equal(est.update([0.0, 0.0], t=0.0, velocities=[0.3, -0.1]), [0.3, -0.1])
+
+
+def test_output_array_is_reused():
+    est = JointStateEstimator(4)
+    first = est.update(np.zeros(4), t=0.0)
+    assert est.update(np.ones(4), t=0.01) is first
+
+
+def test_resizes_and_validates():
+    est = JointStateEstimator()
+    assert est.update([1.0, 2.0, 3.0], t=0.0).shape == (3,)
+    with pytest.raises(ValueError):
+        JointStateEstimator(method="kalman")
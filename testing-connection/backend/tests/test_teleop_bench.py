@@ -0,0 +1,12 @@
+from bench import teleop_bench
+from lib.piper_robot import PiperRobot
+
+
+def test_loop_errors_are_counted(monkeypatch):
+    def fail(self, joint_state, skip_enable=False):
+        raise RuntimeError("follower offline")
+
+    monkeypatch.setattr(PiperRobot, "command_joint_state", fail)
+    result = teleop_bench.run(["can"], hz=100, duration_s=0.2, warmup_s=0.2)["results"]["can"]
+    assert result["errors"] > 0
+    assert result["last_error"] == "follower offline"
@@ -0,0 +1,54 @@
+import pickle
+import threading
+
+import numpy as np
+import zmq
+
+from lib.zmq_async_client import AsyncZMQClientRobot
+
+
+def _request(server):
+    """ROUTER frames: [identity, request_id, b"", payload]."""
+    if not server.poll(500):
+        return None, None
+    frames = server.recv_multipart()
+    return frames, pickle.loads(frames[3])
+
+
+def _reply(server, frames, value):
+    server.send_multipart(frames[:3] + [pickle.dumps(value)])
+
+
+def test_goal_is_held_while_a_command_is_unanswered():
+    server = zmq.Context.instance().socket(zmq.ROUTER)
+    server.setsockopt(zmq.LINGER, 0)
+    port = server.bind_to_random_port("tcp://127.0.0.1")
+    client = AsyncZMQClientRobot(port=port, wire="pickle", timeout_s=0.02)
+    try:
+        thread = threading.Thread(target=client.num_dofs)
+        thread.start()
+        frames, msg = _request(server)
+        assert msg["method"] == "num_dofs"
+        _reply(server, frames, 3)
+        thread.join(timeout=1.0)
+
+        client.command_joint_state(np.zeros(3))
+        first, msg = _request(server)
+        assert msg["args"]["joint_state"] == [0.0, 0.0, 0.0]
+        # First command unanswered (and past its deadline): newer goals are held, not queued
+        for k in (1.0, 2.0):
+            client.command_joint_state(np.full(3, k))
+        assert not server.poll(50)
+        stats = client.get_stats()
+        assert stats["goal_held"] and stats["goals_coalesced"] == 1
+
+        # Once the reply arrives, only the latest goal goes out
+        _reply(server, first, None)
+        assert client._socket.poll(500)
+        client.command_joint_state(np.full(3, 3.0))
+        _, msg = _request(server)
+        assert msg["args"]["joint_state"] == [3.0, 3.0, 3.0]
+        assert not server.poll(50)
+    finally:
+        client.close()
+        server.close()
@@ -0,0 +1,80 @@
+import threading
+
+import numpy as np
+import pytest
+import zmq
+
+from lib.zmq_client_robot import ZMQClientRobot
+from lib.zmq_wire import serve_message
+
+ENDPOINT = "inproc://test-zmq-client-robot"
+
+
+class Server:
+    """REP server on its own thread; step_error is what dispatching "step" raises."""
+
+    def __init__(self, ctx, step_error):
+        self.step_error = step_error
+        self.steps = 0
+        self._socket = ctx.socket(zmq.REP)
+        self._socket.bind(ENDPOINT)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _dispatch(self, method, args):
+        if method == "num_dofs":
+            return 2
+        if method == "command_joint_state":
+            return None
+        if method == "get_observations":
+            return {"joint_positions": np.zeros(2)}
+        self.steps += 1
+        raise self.step_error
+
+    def _serve(self):
+        while not self._stop.is_set():
+            if self._socket.poll(10):
+                self._socket.send(serve_message(self._socket.recv(), self._dispatch))
+        self._socket.close()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+@pytest.fixture
+def connect():
+    ctx = zmq.Context()
+    opened = []
+
+    def _connect(step_error):
+        server = Server(ctx, step_error)
+        client = ZMQClientRobot(wire="wire", endpoint=ENDPOINT, context=ctx)
+        opened.append((server, client))
+        return server, client
+
+    yield _connect
+    for server, client in opened:
+        client.close()
+        server.close()
+    ctx.term()
+
+
+def test_step_falls_back_on_unknown_method(connect):
+    server, client = connect(NotImplementedError("Invalid method: step"))
+    obs = client.step(np.zeros(2))
+    assert client.step_supported is False
+    np.testing.assert_array_equal(obs["joint_positions"], [0.0, 0.0])
+    client.step(np.zeros(2))
+    assert server.steps == 1
+
+
+def test_step_other_errors_do_not_disable_it(connect):
+    server, client = connect(ValueError("Expected 2 joints, got 3"))
+    with pytest.raises(RuntimeError, match="Expected 2 joints"):
+        client.step(np.zeros(3))
+    assert client.step_supported is None
+    with pytest.raises(RuntimeError):
+        client.step(np.zeros(2))
+    assert server.steps == 2
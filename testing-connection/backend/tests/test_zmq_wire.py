@@ -0,0 +1,84 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from lib.zmq_wire import (
+    FORMAT_PICKLE,
+    FORMAT_WIRE,
+    KIND_REPLY,
+    KIND_REQUEST,
+    WireError,
+    decode,
+    decode_reply,
+    encode_error,
+    encode_reply,
+    encode_request,
+    negotiation_request,
+    serve_message,
+)
+
+
+def test_request_round_trip():
+    q = np.linspace(-1.0, 1.0, 7)
+    kind, method, args = decode(encode_request("command_joint_state", {"joint_state": q}))
+    assert (kind, method) == (KIND_REQUEST, "command_joint_state")
+    np.testing.assert_array_equal(args["joint_state"], q)
+
+
+def test_reply_dict_mixed_dtypes_and_scalars():
+    obs = {
+        "joint_positions": np.arange(7, dtype=np.float64),
+        "ids": np.arange(3, dtype=np.int32),
+        "gripper_position": 0.25,
+    }
+    kind, method, value = decode(encode_reply("get_observations", obs))
+    assert (kind, method) == (KIND_REPLY, "get_observations")
+    np.testing.assert_array_equal(value["joint_positions"], obs["joint_positions"])
+    np.testing.assert_array_equal(value["ids"], [0, 1, 2])
+    assert value["gripper_position"] == 0.25
+
+
+def test_single_value_and_none_replies():
+    assert decode(encode_reply("num_dofs", 7))[2] == 7
+    assert decode(encode_reply("command_joint_state", None))[2] is None
+
+
+def test_decoded_arrays_are_read_only_views():
+    _, _, value = decode(encode_reply("get_joint_state", np.ones(3)))
+    with pytest.raises(ValueError):
+        value[0] = 2.0
+
+
+def test_error_reply():
+    value, fmt = decode_reply(encode_error("step", "超时"))
+    assert (value, fmt) == ({"error": "超时"}, FORMAT_WIRE)
+
+
+def test_malformed_messages():
+    with pytest.raises(WireError):
+        decode(b"GW")
+    with pytest.raises(WireError):
+        decode(b"XX" + bytes(20))
+    with pytest.raises(WireError):
+        decode_reply(pickle.dumps({"a": 1}), allow_pickle=False)
+
+
+def _dispatch(method, args):
+    if method == "num_dofs":
+        return 7
+    if method == "command_joint_state":
+        return None
+    raise NotImplementedError(method)
+
+
+def test_serve_negotiation_and_legacy_pickle():
+    # Negotiation request is answered in the wire format
+    value, fmt = decode_reply(serve_message(negotiation_request("num_dofs"), _dispatch))
+    assert (value, fmt) == (7, FORMAT_WIRE)
+    # Plain pickle request stays pickle
+    legacy = pickle.dumps({"method": "num_dofs", "args": {}})
+    assert decode_reply(serve_message(legacy, _dispatch)) == (7, FORMAT_PICKLE)
+    # Dispatch errors come back as {"error": ...}
+    value, _ = decode_reply(serve_message(encode_request("get_joint_state"), _dispatch))
+    assert "get_joint_state" in value["error"]